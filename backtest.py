@@ -0,0 +1,124 @@
+"""
+Backtest a candidate criteria file against every stored listing.
+
+Scores the whole stored catalog (active and archived, every source) under the
+current criteria.yml and under a candidate file, then prints how the buckets
+would shift: a transition matrix and the listings that change bucket, largest
+score moves first. Batches are scored in a process pool, so iterating on
+thresholds and keyword lists takes seconds.
+
+Usage:
+    cp criteria.yml /tmp/candidate.yml   # edit thresholds, weights, keywords...
+    python3 backtest.py /tmp/candidate.yml
+    python3 backtest.py /tmp/candidate.yml --source calhoun --top 100
+    python3 backtest.py /tmp/candidate.yml --csv output/backtest.csv
+"""
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from scout import score
+from scout.finance import derive_financials_batch, financial_rows
+from scout.storage import load_rows
+
+_BASE = Path(__file__).resolve().parent
+_CHUNK = 2000
+BUCKETS = ["SHORTLIST", "REVIEW", "SKIP", "AUTO-REJECT"]
+
+_active_criteria = None     # criteria file this worker process is scoring with
+
+
+def _float(val):
+    return float(val) if val not in (None, "") else None
+
+
+def _score_chunk(criteria_path, rows):
+    """[(score, bucket)] for a batch of stored rows under `criteria_path`. Runs in a worker process."""
+    global _active_criteria
+    if _active_criteria != criteria_path:
+        score.use_criteria(criteria_path)
+        _active_criteria = criteria_path
+    financials = financial_rows(derive_financials_batch(
+        [_float(r["asking_price"]) for r in rows],
+        [_float(r["annual_cash_flow"]) for r in rows],
+    ))
+    scored = score.score_many([{**r, **fin} for r, fin in zip(rows, financials)], reasons=False)
+    return list(zip(scored["score"].tolist(), scored["bucket"].tolist()))
+
+
+def _score_all(pool, criteria_path, chunks):
+    results = []
+    for part in pool.map(_score_chunk, [criteria_path] * len(chunks), chunks):
+        results.extend(part)
+    return results
+
+
+def _print_matrix(pairs):
+    labels = BUCKETS + sorted({b for pair in pairs for b in pair} - set(BUCKETS))
+    counts = {}
+    for pair in pairs:
+        counts[pair] = counts.get(pair, 0) + 1
+    width = max(len(b) for b in labels) + 2
+    print(f"\n  {'current → candidate':<{width}}" + "".join(f"{b:>{width}}" for b in labels) + f"{'total':>{width}}")
+    for old in labels:
+        row = [counts.get((old, new), 0) for new in labels]
+        print(f"  {old:<{width}}" + "".join(f"{n:>{width}}" for n in row) + f"{sum(row):>{width}}")
+    totals = [sum(counts.get((old, new), 0) for old in labels) for new in labels]
+    print(f"  {'total':<{width}}" + "".join(f"{n:>{width}}" for n in totals) + f"{len(pairs):>{width}}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest a candidate criteria file against stored listings")
+    parser.add_argument("candidate", help="Candidate criteria YAML")
+    parser.add_argument("--baseline", default=str(_BASE / "criteria.yml"), help="Criteria to compare against")
+    parser.add_argument("--source", help="Only listings from this source (sunbelt, calhoun)")
+    parser.add_argument("--top", type=int, default=50, help="Flipped listings to print")
+    parser.add_argument("--csv", help="Write every flipped listing to this CSV")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rows = load_rows(args.source)
+    if not rows:
+        print("No stored listings found.")
+        return
+
+    start = time.perf_counter()
+    chunks = [rows[i:i + _CHUNK] for i in range(0, len(rows), _CHUNK)]
+    baseline_path = str(Path(args.baseline).resolve())
+    candidate_path = str(Path(args.candidate).resolve())
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        before = _score_all(pool, baseline_path, chunks)
+        after = _score_all(pool, candidate_path, chunks)
+    elapsed = time.perf_counter() - start
+
+    print(f"Backtested {len(rows)} listings under {Path(args.baseline).name} and {Path(args.candidate).name} "
+          f"in {elapsed:.2f}s ({2 * len(rows) / elapsed:,.0f} scorings/s)")
+    _print_matrix([(b[1], a[1]) for b, a in zip(before, after)])
+
+    flips = [
+        {"id": r["id"], "source": r["source"], "title": r["title"],
+         "score_before": b[0], "bucket_before": b[1], "score_after": a[0], "bucket_after": a[1]}
+        for r, b, a in zip(rows, before, after) if b[1] != a[1]
+    ]
+    flips.sort(key=lambda f: abs(f["score_after"] - f["score_before"]), reverse=True)
+    moved = sum(1 for b, a in zip(before, after) if b[0] != a[0])
+    print(f"\n{len(flips)} listings change bucket; {moved} change score.")
+    for f in flips[:args.top]:
+        print(f"  {f['id']:<28} {f['bucket_before']:>11} {f['score_before']:>3} → "
+              f"{f['bucket_after']:<11} {f['score_after']:>3}  {f['title'][:60]}")
+    if len(flips) > args.top:
+        print(f"  ... {len(flips) - args.top} more (--top / --csv)")
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=list(flips[0]) if flips else ["id"])
+            writer.writeheader()
+            writer.writerows(flips)
+        print(f"Flipped listings written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Micro-benchmarks for the scout pipeline.
+
+Usage:
+    python3 bench.py parse                 # detail-page parser throughput (regex baseline vs current parsers) over the HTML archive
+    python3 bench.py parse --repeat 5
+    python3 bench.py finance --rows 100000   # vectorized SBA model over a synthetic catalog
+    python3 bench.py keywords                # compiled keyword matcher vs per-list substring scans
+    python3 bench.py memory --rows 10000     # retained size of processed listings per container
+    python3 bench.py score --rows 100000     # score_many parity with score_listing, then throughput
+"""
+import argparse
+import gc
+import random
+import re
+import string
+import time
+import tracemalloc
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+from scout.archive import ReplayArchive
+from scout.fetch import DETAIL_FIELDS as SUNBELT_FIELDS, _dl_fields, _parse_detail_page
+from scout.fetch_calhoun import DETAIL_FIELDS as CALHOUN_FIELDS, _parse_detail
+from scout import categories, keywords, score  # noqa: F401  (categories registers its keyword sets)
+from scout.finance import derive_financials_batch, financial_rows
+from scout.narrative import generate_narrative
+from scout.parse import parse_listing
+from scout.records import ListingBatch
+from scout.storage import load_rows
+
+
+def _archived_detail_pages():
+    """(broker, key, html) for the latest archived copy of every detail page."""
+    replay = ReplayArchive()
+    pages = []
+    for url in sorted(replay.latest):
+        parsed = urlparse(url)
+        if "complete-search-listing" in parsed.path:
+            id_number = parse_qs(parsed.query).get("id_number", [""])[0]
+            pages.append(("sunbelt", id_number, replay.response(url).text))
+        elif parsed.path.startswith("/business/"):
+            pages.append(("calhoun", parsed.path, replay.response(url).text))
+    return pages
+
+
+# The per-field regex parsers the current extractors replaced, kept as the benchmark baseline
+def _regex_sunbelt(html, id_number):
+    result = {"id_number": id_number}
+    listing_section = re.search(r'<dl[^>]*>.*?Listing ID:.*?</dl>', html, re.DOTALL)
+    if listing_section:
+        text = re.sub(r'<[^>]+>', '\n', listing_section.group())
+        lines = [l.strip() for l in text.split('\n') if l.strip()]
+        field_map = _dl_fields(lines)
+        for label, key in SUNBELT_FIELDS.items():
+            result[key] = field_map.get(label, "")
+    for h3 in re.findall(r'<h3[^>]*>(.*?)</h3>', html, re.DOTALL):
+        clean = re.sub(r'<[^>]+>', '', h3).strip()
+        if clean and len(clean) > 10 and "contact" not in clean.lower() and "sunbelt" not in clean.lower():
+            result["title"] = clean
+            break
+    if "title" not in result:
+        h4_match = re.search(r'<h4[^>]*class="[^"]*sunbelt-red[^"]*"[^>]*>(.*?)</h4>', html, re.DOTALL)
+        if h4_match:
+            result["title"] = re.sub(r'<[^>]+>', '', h4_match.group(1)).strip()
+    desc_match = re.search(r'<div[^>]*class="[^"]*web-desc[^"]*"[^>]*>(.*?)</div>', html, re.DOTALL)
+    if desc_match:
+        desc = re.sub(r'<[^>]+>', ' ', desc_match.group(1))
+        result["description"] = re.sub(r'\s+', ' ', desc).strip()[:2000]
+    else:
+        texts = []
+        for p in re.findall(r'<p[^>]*>(.*?)</p>', html, re.DOTALL):
+            clean = re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', ' ', p)).strip()
+            if len(clean) > 50:
+                texts.append(clean)
+        if texts:
+            result["description"] = " ".join(texts)[:2000]
+    return result
+
+
+def _regex_calhoun(html, slug):
+    def clean(text):
+        return re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', '', text)).strip()
+
+    def field(label):
+        m = re.search(rf'{re.escape(label)}\s*[:\-]?\s*</[^>]*>\s*<[^>]*>\s*([^<]+)', html, re.IGNORECASE)
+        if m:
+            return clean(m.group(1))
+        m = re.search(rf'{re.escape(label)}\s*:\s*([^\n<]+)', html, re.IGNORECASE)
+        return clean(m.group(1)) if m else ""
+
+    result = {"id_number": slug}
+    h1 = re.search(r'<h1[^>]*>(.*?)</h1>', html, re.DOTALL)
+    if h1:
+        result["title"] = clean(h1.group(1))
+    if not result.get("title"):
+        h3 = re.search(r'<h3[^>]*>(.*?)</h3>', html, re.DOTALL)
+        if h3:
+            result["title"] = clean(h3.group(1))
+    for key, labels in CALHOUN_FIELDS.items():
+        result[key] = next((v for v in map(field, labels) if v), "")
+    for pattern in [
+        r'<div[^>]*class="[^"]*field--name-body[^"]*"[^>]*>(.*?)</div>\s*</div>',
+        r'<div[^>]*class="[^"]*body[^"]*"[^>]*>(.*?)</div>',
+        r'<div[^>]*class="[^"]*description[^"]*"[^>]*>(.*?)</div>',
+    ]:
+        m = re.search(pattern, html, re.DOTALL | re.IGNORECASE)
+        if m and len(clean(m.group(1))) > 50:
+            result["description"] = clean(m.group(1))[:2000]
+            break
+    if "description" not in result:
+        texts = [clean(p) for p in re.findall(r'<p[^>]*>(.*?)</p>', html, re.DOTALL) if len(clean(p)) > 50]
+        if texts:
+            result["description"] = " ".join(texts[:5])[:2000]
+    return result
+
+
+def bench_parse(args):
+    parsers = {
+        "sunbelt": [("regex", _regex_sunbelt), ("scan", _parse_detail_page)],
+        "calhoun": [("regex", _regex_calhoun), ("lxml", _parse_detail)],
+    }
+    pages = _archived_detail_pages()
+    if not pages:
+        print("No archived detail pages — run `python3 run.py` first to populate data/archive/.")
+        return
+
+    for broker, candidates in parsers.items():
+        subset = [(key, html) for b, key, html in pages if b == broker]
+        if not subset:
+            continue
+        mb = sum(len(html) for _, html in subset) / 1_000_000
+        print(f"  {broker}: {len(subset)} pages ({mb:.1f} MB)")
+        for name, parse in candidates:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                for key, html in subset:
+                    parse(html, key)
+            elapsed = time.perf_counter() - start
+            n = len(subset) * args.repeat
+            print(f"    {name:6s} {n / elapsed:8.1f} pages/s  {elapsed / n * 1000:.2f} ms/page")
+
+
+def bench_finance(args):
+    rng = random.Random(0)
+    asking = [rng.choice([None, rng.uniform(5e4, 2e7)]) for _ in range(args.rows)]
+    cash_flow = [rng.choice([None, rng.uniform(-1e5, 3e6)]) for _ in range(args.rows)]
+
+    start = time.perf_counter()
+    derive_financials_batch(asking, cash_flow)
+    elapsed = time.perf_counter() - start
+    print(f"  {args.rows:8d} rows  {elapsed * 1000:8.1f} ms  {args.rows / elapsed:12.0f} rows/s")
+
+
+def bench_keywords(args):
+    score._load_criteria()    # registers the criteria.yml sets
+    sets = dict(keywords._sets)
+    texts = [
+        f"{r['title']} {r['description']} {r['industry']}".lower()
+        for r in load_rows()
+    ] or ["hvac service company with recurring maintenance agreements in eagan"] * 200
+    rng = random.Random(0)
+
+    base_count = sum(len(v) for v in sets.values())
+    print(f"  {len(texts)} listings, {len(sets)} keyword sets")
+    for scale in (1, 4, 16):
+        # Pad with random keywords that never occur, to grow the automaton
+        padded = dict(sets)
+        for i in range(scale - 1):
+            padded[f"synthetic.{i}"] = [
+                "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 14))) for _ in range(base_count)
+            ]
+        total = sum(len(v) for v in padded.values())
+        m = keywords.KeywordMatcher(padded)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for text in texts:
+                {name for name, kws in padded.items() if any(kw in text for kw in kws)}
+        naive = (time.perf_counter() - start) / (args.repeat * len(texts))
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for text in texts:
+                m.scan(text)
+        compiled = (time.perf_counter() - start) / (args.repeat * len(texts))
+
+        print(f"  {total:6d} keywords  any() scans {naive * 1e6:8.1f} us/listing   "
+              f"compiled {compiled * 1e6:8.1f} us/listing")
+
+
+def _synthetic_items(n):
+    """Raw parse_listing() input for `n` listings drawn from small pools, like a real catalog."""
+    rng = random.Random(0)
+    industries = ["HVAC", "Plumbing", "Landscaping", "Janitorial", "Dental Practice", "Restaurant",
+                  "Trucking", "Manufacturing", "Insurance Agency", "Pest Control", "Retail", "Software"]
+    cities = ["Minneapolis, MN", "Eagan, MN", "St. Paul, MN", "Edina, MN", "Rochester, MN",
+              "Duluth, MN", "Fargo, ND", "Sioux Falls, SD"]
+    agents = [f"Agent {i}" for i in range(40)]
+    words = ("recurring service contract customers owner manager staff route based residential commercial "
+             "growth equipment trucks employees established profitable turnkey absentee training").split()
+    items = []
+    for i in range(n):
+        industry = rng.choice(industries)
+        items.append({
+            "id_number": str(100000 + i),
+            "title": f"Established {industry} Business #{i}",
+            "detail_url": f"https://example.com/listing/{100000 + i}",
+            "industry": industry,
+            "location": rng.choice(cities),
+            "asking_price_text": f"${rng.randint(100, 5000) * 1000:,}",
+            "cash_flow_text": f"${rng.randint(30, 900) * 1000:,}",
+            "revenue_text": f"${rng.randint(200, 9000) * 1000:,}",
+            "employees_ft": str(rng.randint(1, 40)),
+            "employees_pt": str(rng.randint(0, 10)),
+            "description": " ".join(rng.choices(words, k=rng.randint(60, 300))),
+            "years_in_business": str(rng.randint(2, 40)),
+            "is_franchise": rng.choice(["Yes", "No"]),
+            "reason_for_selling": "Retirement",
+            "sba_available": rng.choice(["Yes", "No", ""]),
+            "real_estate": rng.choice(["Leased", "Owned", ""]),
+            "listing_agent": rng.choice(agents),
+        })
+    return items
+
+
+def _processed(items):
+    """parse → score → profile → narrative, as run.py does, without the feature records."""
+    for item in items:
+        l = parse_listing(item)
+        l.update(score.score_listing(l))
+        l.update(score.profile_score(l))
+        l["narrative"] = generate_narrative(l)
+        l["source"] = "sunbelt"
+        yield l
+
+
+def _retained(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def bench_memory(args):
+    items = _synthetic_items(args.rows)
+    score._load_criteria()
+
+    def as_dicts(keep_features):
+        out = []
+        for l in _processed(items):
+            row = dict(l)
+            if not keep_features:
+                row.pop("features", None)
+            out.append(row)
+        return out
+
+    def as_listings():
+        out = []
+        for l in _processed(items):
+            del l["features"]
+            out.append(l)
+        return out
+
+    containers = [
+        ("list[dict] + features", lambda: as_dicts(True)),
+        ("list[dict]", lambda: as_dicts(False)),
+        ("list[Listing]", as_listings),
+        ("ListingBatch", lambda: ListingBatch(_processed(items))),
+    ]
+    per = 10_000 / args.rows
+    baseline = None
+    for name, build in containers:
+        size = _retained(build)
+        baseline = baseline or size
+        print(f"  {name:22s} {size / 1e6 * per:8.1f} MB per 10k listings  ({size / baseline:.0%})")
+
+
+def _stored_listings():
+    """Stored rows with numeric fields and recomputed financials, as score_listing sees them."""
+    rows = load_rows()
+    numeric = ("asking_price", "annual_cash_flow", "annual_revenue", "employees")
+    listings = [{**r, **{k: float(r[k]) if r[k] else None for k in numeric}} for r in rows]
+    financials = financial_rows(derive_financials_batch(
+        [l["asking_price"] for l in listings], [l["annual_cash_flow"] for l in listings]))
+    return [{**l, **fin} for l, fin in zip(listings, financials)]
+
+
+def bench_score(args):
+    listings = _stored_listings()
+    if listings:
+        expected = [score.score_listing(l) for l in listings]
+        got = score.score_many(listings)
+        mismatches = 0
+        for i, exp in enumerate(expected):
+            row = {k: got[k][i] for k in exp}
+            row.update({k: int(row[k]) for k in ("score", *score.SCORE_COMPONENTS)})
+            if row != exp:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"  MISMATCH {listings[i]['id']}: {exp} != {row}")
+        print(f"  parity: {len(listings) - mismatches}/{len(listings)} stored listings identical")
+    else:
+        print("  No stored listings — parity check skipped.")
+
+    # Throughput over a synthetic catalog, keyword flags drawn at random
+    rng = np.random.default_rng(0)
+    n = args.rows
+    asking = rng.uniform(2e4, 6e6, n)
+    cash_flow = np.where(rng.random(n) < 0.1, np.nan, rng.uniform(-5e4, 1.2e6, n))
+    fin = derive_financials_batch(asking, cash_flow)
+    frame = {
+        "asking": asking, "cash_flow": cash_flow,
+        "employees": np.where(rng.random(n) < 0.3, np.nan, rng.integers(1, 80, n).astype(float)),
+        "dscr_20": fin["dscr_20pct"], "cf_after_20": fin["cf_after_debt_20pct"], "coc_20": fin["coc_return_20pct"],
+        "location": ["Eagan, Minnesota"] * n,
+        "regulated": np.where(rng.random(n) < 0.02, "pawn", "").astype(object),
+        "digital": np.where(rng.random(n) < 0.02, "saas", "").astype(object),
+        "tech": rng.integers(0, 4, n), "recurring": rng.integers(0, 3, n),
+    }
+    for flag in ("absentee_yes", "absentee_likely", "absentee_possible", "heavy", "simple", "durable", "twin_cities"):
+        frame[flag] = rng.random(n) < 0.2
+    frame["has_location"] = np.ones(n, dtype=bool)
+    frame["in_mn"] = rng.random(n) < 0.9
+
+    for with_reasons in (False, True):
+        start = time.perf_counter()
+        score.score_many(frame, reasons=with_reasons)
+        elapsed = time.perf_counter() - start
+        label = "scores + reasons" if with_reasons else "scores only"
+        print(f"  {n:8d} rows  {label:16s} {elapsed * 1000:8.1f} ms  {n / elapsed:12.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scout micro-benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("parse", help="Detail-page parser throughput over the HTML archive")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_parse)
+
+    p = sub.add_parser("finance", help="Vectorized financial model throughput")
+    p.add_argument("--rows", type=int, default=100_000)
+    p.set_defaults(func=bench_finance)
+
+    p = sub.add_parser("keywords", help="Per-listing keyword classification cost vs keyword count")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_keywords)
+
+    p = sub.add_parser("memory", help="Retained memory of processed listings: dicts vs Listing vs ListingBatch")
+    p.add_argument("--rows", type=int, default=10_000)
+    p.set_defaults(func=bench_memory)
+
+    p = sub.add_parser("score", help="score_many: parity with score_listing on stored rows, then throughput")
+    p.add_argument("--rows", type=int, default=100_000)
+    p.set_defaults(func=bench_score)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
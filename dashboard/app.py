@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import sys
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from pathlib import Path
@@ -9,6 +11,24 @@ import anthropic
 import json
 import io
 
+_ROOT = Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+from scout.categories import (
+    TRADES_KEYWORDS, LAWN_SNOW_KEYWORDS, HEALTHCARE_KEYWORDS, CONSTRUCTION_KEYWORDS,
+    AUTOMOTIVE_KEYWORDS, RESTAURANT_KEYWORDS, RETAIL_KEYWORDS, MANUFACTURING_KEYWORDS,
+    DISTRIBUTION_KEYWORDS, FINANCIAL_KEYWORDS, HOSPITALITY_KEYWORDS, TECHNOLOGY_KEYWORDS,
+    EDUCATION_KEYWORDS, BEAUTY_KEYWORDS, category_mask, flags_from_masks,
+)
+from scout.finance import (
+    FINANCIAL_FIELDS, RATIO_FIELDS, SCENARIO_FIELDS,
+    derive_financials_batch, derive_ratios_batch, evaluate_scenarios, scenario_grid,
+)
+from scout.records import FIELDNAMES
+from scout.score import SCORE_COMPONENTS, reweight, score_weights
+from scout.snapshot import read_snapshot, snapshot_path
+from dashboard.query import BaseFilters, FilterIndex, SearchIndex
+
 try:
     from pdfminer.high_level import extract_text as _pdfminer_extract
     _PDFMINER_OK = True
@@ -260,122 +280,6 @@ def _extract_pdf_fields(pdf_text: str) -> dict:
 
 # ── Category config ────────────────────────────────────────────────────────────
 
-TRADES_KEYWORDS = [
-    "plumb", "electrician", "electrical", "electric",
-    "hvac", "heating", "cooling", "air condition",
-    "roofing", "roofer",
-    "landscaping", "landscape", "lawn care", "lawn service",
-    "excavat", "concrete", "masonry", "mason",
-    "flooring", "carpet", "tile install",
-    "siding", "insulation", "gutter",
-    "pest control", "exterminator",
-    "septic", "drain service", "drain clean",
-    "welding", "welder",
-    "mechanical contractor", "mechanical service",
-    "snow removal", "irrigation",
-    "painting contractor", "painting company", "commercial painting",
-    "handyman", "restoration contractor", "fire restoration", "water restoration",
-    "refrigeration contractor",
-]
-LAWN_SNOW_KEYWORDS = [
-    "lawn care", "lawn service", "lawn mowing", "lawn maintenance", "lawn cutting",
-    "landscaping", "landscape", "landscape maintenance",
-    "snow removal", "snow plowing", "snow plow", "snow management",
-    "grounds maintenance", "grounds care", "groundskeeping",
-    "turf", "mowing", "mow", "irrigation", "sprinkler",
-    "fertiliz", "weed control", "tree service", "tree trimming", "tree removal",
-    "arborist", "leaf removal", "mulch",
-]
-HEALTHCARE_KEYWORDS = [
-    "home health", "home care", "home healthcare",
-    "senior care", "elder care", "assisted living", "memory care",
-    "medical", "dental", "optometry", "optometrist", "ophthalmol",
-    "veterinary", "veterinarian", "vet clinic", "animal hospital",
-    "physical therapy", "occupational therapy", "speech therapy",
-    "chiropractic", "chiropractor", "pharmacy", "pharmacist",
-    "mental health", "behavioral health", "counseling practice",
-    "nursing", "nurse staffing", "healthcare staffing",
-    "urgent care", "clinic", "medical practice",
-    "hospice", "palliative", "medical billing", "medical coding",
-    "radiology", "laboratory", "lab service", "health care", "healthcare",
-]
-CONSTRUCTION_KEYWORDS = [
-    "general contractor", "general construction", "commercial construction",
-    "commercial contractor", "residential construction", "home builder",
-    "remodel", "remodeling", "renovation", "framing", "drywall",
-    "finish carpenter", "finish carpentry", "foundation", "earthwork",
-    "site work", "construction company", "construction firm",
-    "civil contractor", "civil construction",
-]
-AUTOMOTIVE_KEYWORDS = [
-    "auto repair", "auto service", "automotive repair", "automotive service",
-    "car repair", "vehicle repair", "mechanic", "auto mechanic",
-    "body shop", "collision", "auto body", "oil change", "lube",
-    "car wash", "auto detailing", "vehicle detailing",
-    "auto parts", "used car", "car dealership", "auto dealer",
-    "tire shop", "tire service", "wheel alignment",
-    "transmission", "brake shop", "towing", "roadside assistance",
-    "fleet service", "fleet maintenance",
-]
-RESTAURANT_KEYWORDS = [
-    "restaurant", "bar ", "tavern", "pub ", "brewery", "brewpub",
-    "cafe", "coffee shop", "diner", "fast food", "quick service", "qsr",
-    "catering", "food service", "food truck", "pizza", "sandwich shop",
-    "deli", "bakery", "pastry", "donut", "food and beverage", "f&b",
-    "dining", "eatery", "breakfast", "brunch", "sushi", "steakhouse", "grill",
-]
-RETAIL_KEYWORDS = [
-    "retail", "retail store", "retail shop", "gift shop", "specialty store",
-    "boutique", "clothing store", "apparel", "furniture store", "home goods",
-    "sporting goods", "outdoor gear", "hardware store", "pet store", "pet supply",
-    "toy store", "hobby shop", "book store", "convenience store", "c-store",
-    "jewelry store", "florist", "flower shop",
-]
-MANUFACTURING_KEYWORDS = [
-    "manufacturing", "manufacturer", "fabrication", "fabricator",
-    "machining", "machine shop", "cnc", "production", "assembly",
-    "metal fabrication", "sheet metal", "plastic injection", "injection molding",
-    "food manufacturing", "food processing", "food production",
-    "packaging", "printing", "print shop", "woodworking", "cabinet making",
-    "millwork", "industrial", "factory", "contract manufacturing",
-]
-DISTRIBUTION_KEYWORDS = [
-    "distribution", "distributor", "logistics", "supply chain",
-    "trucking", "trucking company", "freight", "warehouse", "warehousing",
-    "delivery service", "delivery company", "courier", "last mile",
-    "wholesale", "wholesaler", "import", "export", "fulfillment", "cold storage",
-]
-FINANCIAL_KEYWORDS = [
-    "accounting", "accountant", "cpa", "bookkeeping", "bookkeeper",
-    "tax preparation", "tax service", "tax firm",
-    "financial planning", "financial advisor", "financial services",
-    "insurance agency", "insurance broker", "payroll service", "payroll processing",
-    "wealth management", "mortgage", "lending",
-]
-HOSPITALITY_KEYWORDS = [
-    "hotel", "motel", "inn ", "bed and breakfast", "b&b",
-    "lodge", "lodging", "resort", "vacation rental", "extended stay",
-]
-TECHNOLOGY_KEYWORDS = [
-    "managed service", "msp", "it service", "it support", "it consulting",
-    "computer repair", "tech repair", "software", "technology company",
-    "web development", "web design", "cybersecurity", "cyber security",
-    "data", "cloud services", "telecom", "telecommunications",
-]
-EDUCATION_KEYWORDS = [
-    "daycare", "day care", "childcare", "child care", "preschool",
-    "tutoring", "tutor", "learning center", "after school", "early childhood",
-    "montessori", "dance studio", "music school", "music lesson",
-    "martial arts", "karate", "driving school", "vocational",
-]
-BEAUTY_KEYWORDS = [
-    "salon", "hair salon", "beauty salon", "barber", "barbershop",
-    "nail salon", "nail spa", "spa", "day spa", "med spa",
-    "massage", "massage therapy", "skincare", "skin care",
-    "tanning salon", "gym", "fitness", "fitness center",
-    "yoga", "pilates", "crossfit", "personal training", "wellness center",
-]
-
 CATEGORY_CONFIG = {
     "Healthcare":            {"keywords": HEALTHCARE_KEYWORDS,   "emoji": "🩺", "col": "is_healthcare",   "color": "#15803D", "bg": "#F0FDF4"},
     "Lawn / Snow":           {"keywords": LAWN_SNOW_KEYWORDS,    "emoji": "🌿", "col": "is_lawn_snow",    "color": "#166534", "bg": "#ECFDF5"},
@@ -418,9 +322,15 @@ BUCKET_DISPLAY = {
     "AUTO-REJECT": "Skip",
 }
 
-_OUTPUT = Path(__file__).resolve().parents[1] / "output"
+# Every bucket is a category up front, so re-weighting can assign any of them
+_BUCKET_DTYPE = pd.CategoricalDtype(list(BUCKET_COLOR))
+
+_OUTPUT = _ROOT / "output"
 SUNBELT_CSV = _OUTPUT / "sunbelt.csv"
 CALHOUN_CSV = _OUTPUT / "calhoun.csv"
+SCENARIOS_CSV = _OUTPUT / "scenarios.csv"
+PROFILE_SCORES_CSV = _OUTPUT / "profile_scores.csv"
+_SOURCES = [("sunbelt", SUNBELT_CSV), ("calhoun", CALHOUN_CSV)]
 
 st.set_page_config(page_title="Sunbelt Scout", layout="wide", page_icon="🏢")
 
@@ -715,16 +625,58 @@ hr { border-color: #EBEBEB !important; margin: 16px 0 !important; }
 
 
 # ── Data loading ───────────────────────────────────────────────────────────────
-@st.cache_data(ttl=300)
-def load_data():
-    frames = []
-    for source_name, path in [("sunbelt", SUNBELT_CSV), ("calhoun", CALHOUN_CSV)]:
-        if not path.exists():
-            continue
+# Caches are keyed on the files' versions rather than a TTL: a run's new
+# output is picked up on the next rerun, and unchanged files are never re-read
+def _file_version(path):
+    """(mtime_ns, size) of `path`, or None if it doesn't exist."""
+    try:
+        info = path.stat()
+    except FileNotFoundError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+@st.cache_data(max_entries=4)
+def _load_source(source_name, path, version):
+    """One source's listings; `version` (CSV + snapshot file versions) is only the cache key."""
+    # Typed snapshot when it matches the CSV; otherwise parse the CSV
+    part = read_snapshot(path)
+    if part is None:
         part = pd.read_csv(path)
-        if "source" not in part.columns or part["source"].isna().all():
-            part["source"] = source_name
-        frames.append(part)
+    if "source" not in part.columns or part["source"].isna().all():
+        part["source"] = source_name
+    return part
+
+
+def _source_version(path):
+    csv_version = _file_version(path)
+    return csv_version and (csv_version, _file_version(snapshot_path(path)))
+
+
+def _data_sources():
+    return tuple((name, path, _source_version(path)) for name, path in _SOURCES)
+
+
+def load_data():
+    """Both sources' listings, rebuilt only when a source's files change; only that source is re-read."""
+    return _build_data(_data_sources())
+
+
+def _derive_missing(df, derive, fields, *inputs):
+    """Set `fields` from derive(*inputs) on the rows where any stored value is missing."""
+    stored = df.reindex(columns=fields).apply(pd.to_numeric, errors="coerce")
+    missing = stored.isna().any(axis=1).to_numpy()
+    if missing.any():
+        derived = derive(*(df[col].to_numpy(dtype=float)[missing] for col in inputs))
+        for f in fields:
+            stored.loc[missing, f] = derived[f]
+    for f in fields:
+        df[f] = stored[f].to_numpy(dtype=float)
+
+
+@st.cache_data(max_entries=2)
+def _build_data(sources):
+    frames = [_load_source(name, path, version) for name, path, version in sources if version]
     if not frames:
         return pd.DataFrame()
     df = pd.concat(frames, ignore_index=True)
@@ -732,47 +684,71 @@ def load_data():
 
     numeric_cols = [
         "asking_price", "annual_cash_flow", "annual_revenue", "employees",
-        "down_10", "down_20", "sba_monthly_10pct", "sba_monthly_20pct",
-        "annual_debt_service_10pct", "annual_debt_service_20pct",
-        "cf_after_debt_10pct", "cf_after_debt_20pct",
-        "coc_return_10pct", "coc_return_20pct",
-        "dscr_10pct", "dscr_20pct",
-        "payoff_years_10pct", "payoff_years_20pct",
-        "seller_note_amount", "seller_note_monthly", "seller_note_annual",
-        "cf_during_standby", "cf_after_seller_financing", "dscr_seller_financed",
         "dim_ai_proof", "dim_fun", "dim_weather", "dim_labor",
         "dim_recurring", "dim_absentee", "dim_capital_light", "dim_scalable",
+        *SCORE_COMPONENTS,
     ]
     for col in numeric_cols:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
-    def _detect(row, keywords):
-        ctx = f"{row.get('title', '')} {row.get('industry', '')} {row.get('description', '')}".lower()
-        return any(kw in ctx for kw in keywords)
+    # SBA / seller-financing columns and valuation ratios are stored at ingest
+    # (and kept current by rescore_profiles); only rows missing some of them,
+    # such as rows stored before a column existed, are derived here
+    _derive_missing(df, derive_financials_batch, [f for f in FINANCIAL_FIELDS if f in FIELDNAMES],
+                    "asking_price", "annual_cash_flow")
+    _derive_missing(df, derive_ratios_batch, RATIO_FIELDS,
+                    "asking_price", "annual_cash_flow", "annual_revenue", "employees")
+
+    # Category flags are stored packed in category_mask at ingest; only rows
+    # stored before that column existed need a keyword scan here
+    masks = pd.to_numeric(df.reindex(columns=["category_mask"])["category_mask"], errors="coerce")
+    missing = masks.isna()
+    if missing.any():
+        text_cols = df.loc[missing].reindex(columns=["title", "industry", "description"]).fillna("")
+        masks[missing] = [category_mask(r) for r in text_cols.to_dict("records")]
+    df["category_mask"] = masks.astype(np.int64)
+    for col, values in flags_from_masks(df["category_mask"].to_numpy()).items():
+        df[col] = values
+    return df.astype({c: _BUCKET_DTYPE if c == "bucket" else "category"
+                      for c in ("bucket", "source", "absentee", "industry") if c in df.columns})
+
+
+@st.cache_data(max_entries=4)
+def _read_csv(path, version):
+    return pd.read_csv(path, dtype={"id": str})
+
+
+def load_scenarios():
+    """Long-format financing scenario grid (one row per listing x scenario) written by run.py."""
+    version = _file_version(SCENARIOS_CSV)
+    return _read_csv(SCENARIOS_CSV, version) if version else pd.DataFrame()
+
+
+def _listing_scenarios(row) -> pd.DataFrame:
+    """One listing's scenario grid, evaluated here where output/scenarios.csv isn't present (it isn't committed)."""
+    asking = pd.to_numeric(row.get("asking_price"), errors="coerce")
+    if not asking > 0:
+        return pd.DataFrame()
+    scenarios = scenario_grid()
+    results = evaluate_scenarios([asking], [pd.to_numeric(row.get("annual_cash_flow"), errors="coerce")], scenarios)
+    grid = pd.DataFrame(scenarios)
+    for f in SCENARIO_FIELDS:
+        grid[f] = results[f][:, 0]
+    return grid
 
-    for cfg in CATEGORY_CONFIG.values():
-        df[cfg["col"]] = df.apply(lambda r, k=cfg["keywords"]: _detect(r, k), axis=1)
 
-    df["revenue_multiple"] = df.apply(
-        lambda r: round(r["asking_price"] / r["annual_revenue"], 2)
-        if pd.notna(r.get("asking_price")) and pd.notna(r.get("annual_revenue")) and r["annual_revenue"] > 0
-        else None, axis=1
-    )
-    df["sde_margin"] = df.apply(
-        lambda r: round(r["annual_cash_flow"] / r["annual_revenue"], 4)
-        if pd.notna(r.get("annual_cash_flow")) and pd.notna(r.get("annual_revenue")) and r["annual_revenue"] > 0
-        else None, axis=1
-    )
-    df["revenue_per_employee"] = df.apply(
-        lambda r: round(r["annual_revenue"] / r["employees"], 0)
-        if pd.notna(r.get("annual_revenue")) and pd.notna(r.get("employees")) and r["employees"] > 0
-        else None, axis=1
-    )
-    return df
+def load_profile_scores():
+    """Long-format score / bucket per listing x criteria profile (profiles/*.yml) written by run.py."""
+    version = _file_version(PROFILE_SCORES_CSV)
+    if not version:
+        return pd.DataFrame(columns=["id", "profile", "score", "bucket"])
+    return _read_csv(PROFILE_SCORES_CSV, version)
 
 
 df = load_data()
+scenarios_df = load_scenarios()
+profile_scores_df = load_profile_scores()
 if df.empty:
     st.warning("No candidates.csv found. Run the scout first: `python3 run.py`")
     st.stop()
@@ -862,6 +838,40 @@ with st.sidebar.expander("More filters"):
         buckets   = None
         min_score = 0
 
+_WEIGHT_LABELS = {
+    "financial_strength":     "Financial strength",
+    "operational_simplicity": "Operational simplicity",
+    "tech_deficiency":        "Tech opportunity",
+    "recurring_revenue":      "Recurring revenue",
+    "industry_durability":    "Industry durability",
+    "geographic_fit":         "Geographic fit",
+}
+
+_DEFAULT_PROFILE = "criteria.yml (default)"
+_profiles = sorted(profile_scores_df["profile"].dropna().unique().tolist())
+profile = st.sidebar.selectbox("Buyer profile", [_DEFAULT_PROFILE] + _profiles,
+    help="Score and bucket under another criteria profile in profiles/")
+
+with st.sidebar.expander("Score weights"):
+    custom_weights = st.checkbox("Re-weight score", value=False, disabled=profile != _DEFAULT_PROFILE,
+        help="Re-rank from the stored per-category points; no rescoring pass")
+    if custom_weights:
+        _base_weights = score_weights()
+        weights = {key: st.slider(label, 0, 60, int(_base_weights[key]), key=f"w_{key}")
+                   for key, label in _WEIGHT_LABELS.items()}
+
+if profile != _DEFAULT_PROFILE:
+    _ps = profile_scores_df[profile_scores_df["profile"] == profile].set_index("id")
+    df["score"] = df["id"].map(_ps["score"])
+    df["bucket"] = df["id"].map(_ps["bucket"])
+
+# Rows scored before the component columns existed keep their stored score
+if custom_weights and profile == _DEFAULT_PROFILE and set(SCORE_COMPONENTS) <= set(df.columns):
+    _has_points = df[list(SCORE_COMPONENTS)].notna().all(axis=1)
+    _score, _bucket = reweight(df[list(SCORE_COMPONENTS)], weights, df["bucket"] == "AUTO-REJECT")
+    df.loc[_has_points, "score"] = _score[_has_points.to_numpy()]
+    df.loc[_has_points, "bucket"] = _bucket[_has_points.to_numpy()]
+
 min_coc_decimal = min_coc / 100.0
 if not apply_scoring:
     buckets   = None
@@ -869,37 +879,30 @@ if not apply_scoring:
 
 
 # ── Base filters ───────────────────────────────────────────────────────────────
-mask = pd.Series([True] * len(df))
-if "is_active" in df.columns:
-    mask &= df["is_active"].fillna("True").astype(str).str.lower() != "false"
-if source_filter != "All":
-    mask &= df["source"].fillna("").str.lower() == source_filter.lower()
-if apply_scoring and buckets:
-    mask &= df["bucket"].isin(buckets)
-if apply_scoring:
-    mask &= df["score"] >= min_score
-mask &= (df["asking_price"].isna()) | (df["asking_price"] <= max_price)
-mask &= (df["asking_price"].isna()) | (df["asking_price"] >= min_price)
-mask &= (df["annual_cash_flow"].isna()) | (df["annual_cash_flow"] >= min_cf)
-if min_coc_decimal > 0:
-    mask &= (df["coc_return_20pct"].isna()) | (df["coc_return_20pct"] >= min_coc_decimal)
-if absentee_only:
-    mask &= df["absentee"].isin(["Likely", "Possible"])
-if twin_cities_only:
-    tc_pat = "|".join(["minneapolis","saint paul","st\\.paul","bloomington","plymouth",
-                        "eden prairie","burnsville","minnetonka","eagan","edina",
-                        "maple grove","woodbury","coon rapids","brooklyn park","twin cities","metro"])
-    mask &= df["location"].str.contains(tc_pat, case=False, na=False)
-
-base_filtered = df[mask].copy()
+@st.cache_resource(max_entries=4)
+def _filter_index(_df, key):
+    """FilterIndex for the current frame; `key` (data versions, profile, weights) identifies it."""
+    return FilterIndex(_df, [cfg["col"] for cfg in CATEGORY_CONFIG.values()])
+
+
+_index = _filter_index(df, (_data_sources(), profile,
+                            tuple(sorted(weights.items())) if custom_weights and profile == _DEFAULT_PROFILE else None))
+base_filters = BaseFilters(
+    source=source_filter,
+    buckets=tuple(buckets) if apply_scoring and buckets else None,
+    min_score=min_score if apply_scoring else None,
+    min_price=min_price, max_price=max_price, min_cf=min_cf, min_coc=min_coc_decimal,
+    absentee_only=absentee_only, twin_cities_only=twin_cities_only,
+)
+base_mask = _index.base(base_filters)
 
 
 # ── Top bar ─────────────────────────────────────────────────────────────────────
 n_total     = len(df)
-n_filtered  = len(base_filtered)
-n_shortlist = len(df[df["bucket"] == "SHORTLIST"])
-n_review    = len(df[df["bucket"] == "REVIEW"])
-n_rejected  = len(df[df["bucket"] == "AUTO-REJECT"])
+n_filtered  = _index.count(base_mask)
+n_shortlist = _index.count(_index.bucket("SHORTLIST"))
+n_review    = _index.count(_index.bucket("REVIEW"))
+n_rejected  = _index.count(_index.bucket("AUTO-REJECT"))
 n_watchlist = len(st.session_state.watchlist)
 
 st.markdown(f"""
@@ -926,23 +929,20 @@ st.markdown(f"""
 search_col, _ = st.columns([2, 1])
 with search_col:
     search_query = st.text_input(
-        "", placeholder="🔍  Search business name, industry, or location...",
+        "", placeholder="🔍  Search name, industry, location, description or broker docs...",
         label_visibility="collapsed",
     )
 
 p1, p2, p3, p4, p5, p6 = st.columns(6)
 active = st.session_state.active_preset
 
-_n_coc          = len(base_filtered[base_filtered["coc_return_20pct"].notna() & (base_filtered["coc_return_20pct"] >= 0.20)])
+_n_coc          = _index.count(base_mask & _index.top_pick)
 _pdf_ids = set(st.session_state.get("pdf_data", {}).keys())
-if "has_pdf" in df.columns:
-    _csv_pdf = set(df[df["has_pdf"].fillna("False").astype(str).str.lower() == "true"]["id"].astype(str))
-else:
-    _csv_pdf = set()
+_csv_pdf = set(_index.ids[_index.has_pdf])
 _n_opportunities = len(_csv_pdf | _pdf_ids)
 _n_wl           = len(st.session_state.watchlist)
-_n_rejected     = len(df[df["bucket"] == "AUTO-REJECT"])
-_n_archived     = len(df[df["is_active"].fillna("True").astype(str).str.lower() == "false"]) if "is_active" in df.columns else 0
+_n_rejected     = n_rejected
+_n_archived     = _index.count(~_index.active)
 
 def _preset(col, label, key):
     with col:
@@ -953,7 +953,7 @@ def _preset(col, label, key):
             st.session_state.active_preset = None if is_active else key
             st.rerun()
 
-_preset(p1, f"All  ({len(base_filtered)})",           "all")
+_preset(p1, f"All  ({n_filtered})",                  "all")
 _preset(p2, f"Top Picks  ({_n_coc})",               "best_returns")
 _preset(p3, f"Opportunities  ({_n_opportunities})",  "opportunities")
 _preset(p4, f"Saved  ({_n_wl})",                    "watchlist")
@@ -969,49 +969,24 @@ selected_categories = st.multiselect(
 
 
 # ── Apply search + preset + category filters ───────────────────────────────────
-filtered = base_filtered.copy()
-
-if search_query:
-    q = search_query.lower()
-    def _search_col(df, col):
-        return df[col].fillna("").astype(str).str.lower().str.contains(q, na=False)
-
-    smask = (
-        _search_col(filtered, "id")
-        | _search_col(filtered, "title")
-        | _search_col(filtered, "industry")
-        | _search_col(filtered, "location")
-        | _search_col(filtered, "description")
-    )
-    filtered = filtered[smask]
-
-if selected_categories:
-    cat_mask = pd.Series([False] * len(filtered), index=filtered.index)
-    for cat_name in selected_categories:
-        col = CATEGORY_CONFIG[cat_name]["col"]
-        cat_mask |= filtered[col].fillna(False).astype(bool)
-    filtered = filtered[cat_mask]
-
-ap = st.session_state.active_preset
-if ap == "best_returns":
-    filtered = filtered[filtered["coc_return_20pct"].notna() & (filtered["coc_return_20pct"] >= 0.20)]
-    filtered = filtered.sort_values("coc_return_20pct", ascending=False)
-elif ap == "opportunities":
-    all_pdf_ids = _csv_pdf | _pdf_ids
-    filtered = df[df["id"].astype(str).isin(all_pdf_ids)].copy()
-elif ap == "watchlist":
-    wl = st.session_state.watchlist
-    filtered = filtered[filtered["id"].astype(str).isin(wl)]
-elif ap == "rejected":
-    filtered = df[df["bucket"] == "AUTO-REJECT"].copy()
-elif ap == "archived":
-    if "is_active" in df.columns:
-        filtered = df[df["is_active"].fillna("True").astype(str).str.lower() == "false"].copy()
-    else:
-        filtered = df.iloc[0:0].copy()  # empty
-
-if ap != "best_returns":
-    filtered = filtered.sort_values("score", ascending=False)
+@st.cache_resource(max_entries=4)
+def _search_index(_df, _pdf_data, key):
+    """SearchIndex over the listing text plus broker PDF text; `key` (data versions, PDF texts) identifies it."""
+    pdf_text = {listing_id: rec.get("pdf_text", "") for listing_id, rec in _pdf_data.items()}
+    return SearchIndex(_df.assign(pdf_text=_df["id"].astype(str).map(pdf_text)), key)
+
+
+_pdf_data = st.session_state.get("pdf_data", {})
+_pdf_version = tuple(sorted((listing_id, hash(rec.get("pdf_text", ""))) for listing_id, rec in _pdf_data.items()))
+filtered = df.iloc[_index.select(
+    base_filters,
+    search=search_query,
+    categories=[CATEGORY_CONFIG[name]["col"] for name in selected_categories],
+    preset=st.session_state.active_preset,
+    watchlist=st.session_state.watchlist,
+    pdf_ids=_csv_pdf | _pdf_ids,
+    search_index=_search_index(df, _pdf_data, (_data_sources(), _pdf_version)) if search_query else None,
+)]
 
 # Clear selection if no longer visible
 if st.session_state.selected_id is not None:
@@ -1245,7 +1220,7 @@ def render_detail_panel(row):
 
     # SBA financing tabs
     st.markdown('<div class="dp-section">SBA Financing</div>', unsafe_allow_html=True)
-    tab_10, tab_20, tab_sf = st.tabs(["10% Down", "20% Down", "Seller Financed"])
+    tab_10, tab_20, tab_sf, tab_grid = st.tabs(["10% Down", "20% Down", "Seller Financed", "Scenario Grid"])
 
     def _sba_tab(down_key, monthly_key, cf_key, coc_key, dscr_key):
         down    = row.get(down_key)
@@ -1275,6 +1250,28 @@ def render_detail_panel(row):
         s5.metric("CF Yr 3+",   _fmt(row.get("cf_after_seller_financing")))
         s6.metric("DSCR Yr 3+", _fmt(row.get("dscr_seller_financed"), "x") if row.get("dscr_seller_financed") else "—")
         st.caption("⚠️ SBA requires seller note on full standby for 24 months.")
+    with tab_grid:
+        grid = scenarios_df[scenarios_df["id"] == str(row.get("id"))] if not scenarios_df.empty \
+            else _listing_scenarios(row)
+        if grid.empty:
+            st.caption("No scenarios — listing has no asking price.")
+        else:
+            st.dataframe(
+                pd.DataFrame({
+                    "Down":        grid["down_payment_pct"].map(lambda v: f"{v*100:.0f}%"),
+                    "Rate":        grid["interest_rate"].map(lambda v: f"{v*100:.2f}%"),
+                    "Term":        grid["loan_term_years"].map(lambda v: f"{v:.0f} yrs"),
+                    "Seller Note": grid["seller_note_pct"].map(lambda v: f"{v*100:.0f}%"),
+                    "Monthly":     grid["sba_monthly"].map(_fmt),
+                    "CF After Debt": grid["cf_after_debt"].map(_fmt),
+                    "DSCR":        grid["dscr"].map(lambda v: _fmt(v, "x")),
+                    "CoC":         grid["coc_return"].map(lambda v: _fmt(v, "%")),
+                    "Payoff (yrs)": grid["payoff_years"].map(lambda v: _fmt(v, "")),
+                }),
+                hide_index=True, use_container_width=True,
+            )
+            st.caption("Grid from the `sba.scenario_grid` block in criteria.yml; seller notes assume "
+                       f"{grid['standby_months'].iloc[0]:.0f} months of standby.")
 
     # Business details
     st.markdown('<div class="dp-section">Business Details</div>', unsafe_allow_html=True)
@@ -0,0 +1,253 @@
+"""
+Filter index for the dashboard's sidebar, preset and category filters.
+
+FilterIndex is built once per listings frame (app.py keeps it in
+st.cache_resource, keyed on the data files' versions, the buyer profile and
+the score weights). It precomputes a boolean bitmap per categorical filter
+(source, bucket, absentee, Twin Cities, category flags, active/archived) and
+the row order by score and by CoC return. A query is answered by AND-ing
+bitmaps with the numeric range tests and is returned as row positions in
+display order; results are cached per filter tuple, so a rerun with the
+same filters (e.g. clicking a listing) is a dictionary lookup. Callers take
+df.iloc[positions] once at the end instead of copying the frame per step.
+
+SearchIndex is an inverted index over the listing text (id, title, industry,
+location, description, narrative and broker PDF text). Each query word
+matches every indexed word it is a prefix of; a listing must match all query
+words and is ranked by the field-weighted, idf-scaled count of its matches.
+Lookups touch only the postings of the matched words, so latency depends on
+the query rather than the catalog size.
+"""
+import bisect
+import math
+import re
+from itertools import chain
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+TWIN_CITIES_PATTERN = "|".join([
+    "minneapolis", "saint paul", "st\\.paul", "bloomington", "plymouth",
+    "eden prairie", "burnsville", "minnetonka", "eagan", "edina",
+    "maple grove", "woodbury", "coon rapids", "brooklyn park", "twin cities", "metro",
+])
+TOP_PICK_COC = 0.20
+# Indexed text fields and how much a match in each counts towards the rank
+SEARCH_WEIGHTS = {
+    "id": 4.0, "title": 3.0, "industry": 2.0, "location": 1.5,
+    "description": 1.0, "narrative": 0.5, "pdf_text": 0.5,
+}
+_WORD = re.compile(r"[a-z0-9]+")
+_MAX_CACHED = 256
+
+
+class BaseFilters(NamedTuple):
+    """Sidebar filters; every field is hashable so the tuple is a cache key."""
+    source: str = "All"
+    buckets: tuple | None = None
+    min_score: int | None = None
+    min_price: float = 0
+    max_price: float = float("inf")
+    min_cf: float = 0
+    min_coc: float = 0
+    absentee_only: bool = False
+    twin_cities_only: bool = False
+
+
+def _lower(df, col, default):
+    """Column as lowercase strings, `default` where missing."""
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype="string")
+    return df[col].astype("string").fillna(default).str.lower()
+
+
+def _numbers(df, col):
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) if col in df.columns \
+        else np.full(len(df), np.nan)
+
+
+def _descending(values):
+    """Row positions by `values` descending (NaN last), ties kept in frame order."""
+    return np.argsort(-np.nan_to_num(values, nan=-np.inf), kind="stable")
+
+
+class FilterIndex:
+    def __init__(self, df: pd.DataFrame, category_columns=()):
+        self.size = len(df)
+        self.ids = df["id"].astype(str).to_numpy()
+        self.asking = _numbers(df, "asking_price")
+        self.cash_flow = _numbers(df, "annual_cash_flow")
+        self.coc = _numbers(df, "coc_return_20pct")
+        self.score = _numbers(df, "score")
+
+        self.active = (_lower(df, "is_active", "true") != "false").to_numpy()
+        self.has_pdf = (_lower(df, "has_pdf", "false") == "true").to_numpy()
+        source = _lower(df, "source", "")
+        self.sources = {s: (source == s).to_numpy() for s in source.unique()}
+        bucket = df["bucket"].astype("string")
+        self.buckets = {b: (bucket == b).fillna(False).to_numpy() for b in bucket.dropna().unique()}
+        self.absentee = df["absentee"].isin(["Likely", "Possible"]).to_numpy()
+        self.twin_cities = df["location"].astype("string").str.contains(
+            TWIN_CITIES_PATTERN, case=False, na=False).to_numpy()
+        self.categories = {col: df[col].fillna(False).astype(bool).to_numpy()
+                           for col in category_columns if col in df.columns}
+        self.top_pick = self.coc >= TOP_PICK_COC
+
+        self.by_score = _descending(self.score)
+        self.by_coc = _descending(self.coc)
+        self._cache = {}
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            if len(self._cache) >= _MAX_CACHED:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _none(self):
+        return np.zeros(self.size, dtype=bool)
+
+    def bucket(self, name) -> np.ndarray:
+        return self.buckets.get(name, self._none())
+
+    def count(self, bitmap) -> int:
+        return int(np.count_nonzero(bitmap))
+
+    def base(self, f: BaseFilters) -> np.ndarray:
+        """Bitmap of active rows passing the sidebar filters."""
+        def compute():
+            m = self.active.copy()
+            if f.source != "All":
+                m &= self.sources.get(f.source.lower(), self._none())
+            if f.buckets:
+                m &= np.logical_or.reduce([self.bucket(b) for b in f.buckets])
+            if f.min_score is not None:
+                m &= self.score >= f.min_score
+            no_price = np.isnan(self.asking)
+            m &= no_price | (self.asking <= f.max_price)
+            m &= no_price | (self.asking >= f.min_price)
+            m &= np.isnan(self.cash_flow) | (self.cash_flow >= f.min_cf)
+            if f.min_coc > 0:
+                m &= np.isnan(self.coc) | (self.coc >= f.min_coc)
+            if f.absentee_only:
+                m &= self.absentee
+            if f.twin_cities_only:
+                m &= self.twin_cities
+            return m
+        return self._cached(("base", f), compute)
+
+    def in_categories(self, columns) -> np.ndarray:
+        return np.logical_or.reduce([self.categories[c] for c in columns] + [self._none()])
+
+    def with_ids(self, ids) -> np.ndarray:
+        return np.isin(self.ids, list(ids))
+
+    def select(self, f: BaseFilters, search="", categories=(), preset=None,
+               watchlist=frozenset(), pdf_ids=frozenset(), search_index=None) -> np.ndarray:
+        """
+        Row positions to show, in display order: search relevance while
+        searching (via `search_index`), else CoC for top picks, else score.
+        """
+        relevance = search_index.search(search) if search and search_index is not None else None
+        searching = relevance is not None
+        key = ("select", f, search if searching else "", search_index.key if searching else None,
+               tuple(categories), preset,
+               frozenset(watchlist) if preset == "watchlist" else None,
+               frozenset(pdf_ids) if preset == "opportunities" else None)
+
+        def compute():
+            # These presets list their rows regardless of the other filters
+            if preset == "opportunities":
+                m = self.with_ids(pdf_ids)
+            elif preset == "rejected":
+                m = self.bucket("AUTO-REJECT")
+            elif preset == "archived":
+                m = ~self.active
+            else:
+                m = self.base(f).copy()
+                if searching:
+                    m &= relevance > 0
+                if categories:
+                    m &= self.in_categories(categories)
+                if preset == "best_returns":
+                    m &= self.top_pick
+                elif preset == "watchlist":
+                    m &= self.with_ids(watchlist)
+            order = self.by_coc if preset == "best_returns" else self.by_score
+            rows = order[m[order]]
+            if searching and preset not in ("best_returns", "opportunities", "rejected", "archived"):
+                rows = rows[np.argsort(-relevance[rows], kind="stable")]
+            return rows
+        return self._cached(key, compute)
+
+
+class SearchIndex:
+    """Prefix-matching, ranked inverted index over the SEARCH_WEIGHTS fields of a listings frame."""
+
+    def __init__(self, df: pd.DataFrame, key=None):
+        self.key = key
+        self.size = len(df)
+        # (row, word, weight) for every word occurrence, tokenized column-wise
+        rows, words, weights = [], [], []
+        for field, weight in SEARCH_WEIGHTS.items():
+            if field not in df.columns:
+                continue
+            texts = [t.lower() if isinstance(t, str) else "" for t in df[field].tolist()]
+            tokens = [_WORD.findall(t) for t in texts]
+            if field == "id":
+                tokens = [found + [t] if t else found for found, t in zip(tokens, texts)]   # whole ids too
+            rows.append(np.repeat(np.arange(len(tokens)), [len(found) for found in tokens]))
+            words.append(list(chain.from_iterable(tokens)))
+            weights.append(np.full(len(words[-1]), weight))
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        weights = np.concatenate(weights) if weights else np.empty(0)
+        codes, vocab = pd.factorize(np.array(list(chain.from_iterable(words)), dtype=object))
+
+        # Renumber words alphabetically so a prefix is a contiguous code range
+        vocab = vocab.astype(str)
+        order = np.argsort(vocab)
+        self.words = vocab[order].tolist()
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+
+        # One posting per (word, row) with its summed field weight, grouped by word
+        stride = max(self.size, 1)
+        keys, inverse = np.unique(rank[codes] * stride + rows, return_inverse=True)
+        totals = np.bincount(inverse, weights=weights, minlength=len(keys))
+        bounds = np.searchsorted(keys // stride, np.arange(len(self.words) + 1))
+        self._rows = []
+        self._weights = []
+        for lo, hi in zip(bounds, bounds[1:]):
+            idf = math.log(1 + self.size / (hi - lo))
+            self._rows.append(keys[lo:hi] % stride)
+            self._weights.append(totals[lo:hi] * idf)
+        self._cache = {}
+
+    def _prefixed(self, prefix) -> range:
+        """Positions in self.words of every indexed word starting with `prefix`."""
+        lo = bisect.bisect_left(self.words, prefix)
+        hi = bisect.bisect_left(self.words, prefix + "\uffff", lo)
+        return range(lo, hi)
+
+    def search(self, query: str) -> np.ndarray | None:
+        """
+        Relevance per row (0 = no match); a row must match every word of
+        `query`. None when the query has no searchable words (e.g. "-").
+        """
+        terms = tuple(dict.fromkeys(_WORD.findall(query.lower())))
+        if not terms:
+            return None
+        if terms not in self._cache:
+            if len(self._cache) >= _MAX_CACHED:
+                self._cache.pop(next(iter(self._cache)))
+            total = np.zeros(self.size)
+            matched = np.ones(self.size, dtype=bool)
+            for term in terms:
+                score = np.zeros(self.size)
+                for i in self._prefixed(term):
+                    score[self._rows[i]] += self._weights[i]
+                matched &= score > 0
+                total += score
+            self._cache[terms] = np.where(matched, total, 0.0)
+        return self._cache[terms]
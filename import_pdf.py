@@ -11,12 +11,16 @@ Requires:
     SUPABASE_URL + SUPABASE_KEY environment variables (for PDF storage)
 """
 import argparse
-import csv
 import json
 import os
 import sys
 from pathlib import Path
 
+from scout.memo import MemoCache
+from scout.storage import (
+    CSV_PATHS, load_rows, update_listing, refresh_scenarios, store_profile_scores, with_stored_inputs,
+)
+
 try:
     from pdfminer.high_level import extract_text
 except ImportError:
@@ -34,9 +38,6 @@ try:
 except ImportError:
     create_client = None
 
-SUNBELT_CSV = Path(__file__).parent / "output" / "sunbelt.csv"
-CALHOUN_CSV = Path(__file__).parent / "output" / "calhoun.csv"
-
 EXTRACT_PROMPT = """You are extracting structured business listing data from a broker PDF.
 
 Return ONLY a valid JSON object with these fields (use null for anything not found):
@@ -91,13 +92,9 @@ def call_claude(pdf_text: str) -> dict:
 
 
 def load_all_rows() -> list[dict]:
-    rows = []
-    for path in [SUNBELT_CSV, CALHOUN_CSV]:
-        if path.exists():
-            with path.open("r", newline="", encoding="utf-8") as f:
-                for r in csv.DictReader(f):
-                    r["_csv_path"] = str(path)
-                    rows.append(r)
+    rows = load_rows()
+    for r in rows:
+        r["_csv_path"] = str(CSV_PATHS.get(r.get("source"), ""))
     return rows
 
 
@@ -196,30 +193,17 @@ def upload_pdf_to_supabase(pdf_path: str, listing_id: str) -> bool:
         return False
 
 
-def apply_updates(row: dict, updates: dict, csv_path: str):
-    path = Path(csv_path)
-    all_rows = []
-    fieldnames = []
-    with path.open("r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        for r in reader:
-            all_rows.append(r)
-
-    for r in all_rows:
-        if r["id"] == row["id"]:
-            for field, change in updates.items():
-                if field in r:
-                    r[field] = change["new"]
-            if "has_pdf" in r:
-                r["has_pdf"] = "True"
-            break
-
-    with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in all_rows:
-            writer.writerow(r)
+def apply_updates(row: dict, updates: dict):
+    """Write the PDF fields plus the financials, score, profile and narrative they imply."""
+    fields = {field: change["new"] for field, change in updates.items()}
+    fields["has_pdf"] = "True"
+    memo = MemoCache()
+    derived = memo.derive({**with_stored_inputs([row])[0], **fields})
+    memo.save()
+    fields.update(derived, reasons="; ".join(derived["reasons"]))
+    update_listing(row["id"], fields)
+    refresh_scenarios([row["id"]])
+    store_profile_scores({row["id"]: derived["profile_scores"]})
 
 
 def main():
@@ -280,7 +264,7 @@ def main():
         print("Cancelled.")
         sys.exit(0)
 
-    apply_updates(match, updates, match["_csv_path"])
+    apply_updates(match, updates)
     print(f"\nUpdated {match['id']} in {Path(match['_csv_path']).name}")
     upload_pdf_to_supabase(str(pdf_path), match["id"])
 
@@ -1,37 +1,151 @@
 """
-Retroactively adds 8 operator-fit dimension scores to all existing
-listings in candidates.csv without re-scraping or re-scoring financials.
+Retroactively recomputes the SBA financials and valuation ratios, the 0-100
+score / bucket with its per-category points, the 8 operator-fit dimension
+scores, the category flags and the score under each criteria profile
+(profiles/*.yml) for every stored listing without re-scraping. Financials and
+scores for each batch come from one vectorized pass (scout.finance,
+scout.score.score_many).
+
+Incremental: a listing is only rescored when its parsed inputs or the scoring
+rules (scout.score.scorer_version) changed since its last rescore, and only
+rows whose results actually differ are written back. Listings stored before
+all their parsed inputs had columns (storage.partial_input_ids) are rescored
+with their stored absentee verdict standing in for the missing owner field.
+Results already in the memo (scout.memo) are reused; the rest are computed in
+batches in a process pool.
+
+Usage:
+    python3 rescore_profiles.py              # rescore what changed
+    python3 rescore_profiles.py --full       # rescore every stored listing
+    python3 rescore_profiles.py --workers 1  # no process pool
 """
-import csv
-from pathlib import Path
-from datetime import datetime
-from scout.score import profile_score
-from scout.storage import FIELDNAMES
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from scout.categories import category_mask
+from scout.features import features_of
+from scout.finance import derive_financials_batch, derive_ratios_batch, financial_rows
+from scout.memo import MemoCache
+from scout.narrative import generate_narrative
+from scout.parse import input_hash
+from scout.score import SCORE_COMPONENTS, profile_score, score_many, score_profiles
+from scout.storage import (
+    load_rows, update_listings, refresh_scenarios, store_profile_scores, rescore_state, record_rescore,
+    as_stored, with_stored_inputs,
+)
+
+_CHUNK = 2000
+
+
+def _float(val):
+    return float(val) if val not in (None, "") else None
 
-CSV_PATH = Path(__file__).parent / "output" / "sunbelt.csv"
+
+def _rescore(rows):
+    """{id: derived fields} for a batch of stored rows, as scout.memo stores them. Runs in a worker process."""
+    asking = [_float(r["asking_price"]) for r in rows]
+    cf = [_float(r["annual_cash_flow"]) for r in rows]
+    financials = financial_rows(derive_financials_batch(asking, cf))
+    ratios = financial_rows(derive_ratios_batch(
+        asking, cf, [_float(r["annual_revenue"]) for r in rows], [_float(r["employees"]) for r in rows]))
+    for fin, ratio in zip(financials, ratios):
+        fin.update(ratio)
+    # One keyword scan per row, shared by scoring, profiling and the category flags
+    listings = [{**row, **fin, "features": features_of(row)} for row, fin in zip(rows, financials)]
+    scores = score_many(listings)
+    by_profile = score_profiles(listings)
+
+    results = {}
+    for i, l in enumerate(listings):
+        scored = {k: int(scores[k][i]) for k in ("score", *SCORE_COMPONENTS)}
+        scored.update(
+            bucket=scores["bucket"][i],
+            reasons=scores["reasons"][i],
+            absentee=scores["absentee"][i],
+        )
+        l.update(scored)
+        profile = profile_score(l)
+        l.update(profile)
+        profiles = {name: {"score": int(cols["score"][i]), "bucket": str(cols["bucket"][i])}
+                    for name, cols in by_profile.items()}
+        results[l["id"]] = {**financials[i], **scored, **profile, "profile_scores": profiles,
+                            "category_mask": category_mask(l), "narrative": generate_narrative(l)}
+    return results
 
 
 def main():
-    if not CSV_PATH.exists():
-        print("No candidates.csv found.")
+    parser = argparse.ArgumentParser(description="Rescore stored listings")
+    parser.add_argument("--full", action="store_true", help="Rescore every listing, not just changed ones")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rows = load_rows()
+    if not rows:
+        print("No stored listings found.")
+        return
+    # Listings stored without the absentee owner field keep the absentee signal they were scored with
+    rows = with_stored_inputs(rows)
+
+    start = time.perf_counter()
+    memo = MemoCache()
+    version = memo.version
+    state = {} if args.full else rescore_state()
+    hashes = {r["id"]: input_hash(r) for r in rows}
+    stale = [r for r in rows if state.get(r["id"]) != (hashes[r["id"]], version)]
+    if not stale:
+        print(f"All {len(rows)} listings are up to date (scorer {version}).")
         return
 
-    with CSV_PATH.open("r", newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
+    keys = {r["id"]: memo.key(r) for r in stale}
+    cached = memo.get_many(keys.values())
+    results = {i: cached[k] for i, k in keys.items() if k in cached}
+    todo = [r for r in stale if r["id"] not in results]
 
-    print(f"Scoring {len(rows)} listings...")
+    by_source = {}
+    for r in todo:
+        by_source.setdefault(r["source"], []).append(r)
+    chunks = [rs[i:i + _CHUNK] for rs in by_source.values() for i in range(0, len(rs), _CHUNK)]
+    print(f"Rescoring {len(stale)} of {len(rows)} listings: {len(results)} from the memo, "
+          f"{len(todo)} computed ({', '.join(f'{len(v)} {k}' for k, v in by_source.items()) or 'none'}) "
+          f"in {len(chunks)} batch{'es' if len(chunks) != 1 else ''}...")
 
-    for i, row in enumerate(rows):
-        scores = profile_score(row)
-        row.update({k: str(v) for k, v in scores.items()})
+    computed = {}
+    if args.workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(chunks))) as pool:
+            for part in pool.map(_rescore, chunks):
+                computed.update(part)
+    else:
+        for chunk in chunks:
+            computed.update(_rescore(chunk))
+    memo.put_many({keys[i]: fields for i, fields in computed.items()})
+    results.update(computed)
+    elapsed = time.perf_counter() - start
 
-    with CSV_PATH.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction="ignore")
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
+    # Write back only the fields whose stored value actually changes
+    stored = {r["id"]: r for r in stale}
+    changes = {}
+    for listing_id, fields in results.items():
+        row = stored[listing_id]
+        fields = {**fields, "reasons": "; ".join(fields["reasons"])}
+        diff = {k: v for k, v in fields.items() if k in row and as_stored(k, v) != row[k]}
+        if diff:
+            changes[listing_id] = diff
+    if changes:
+        update_listings(changes)
+    record_rescore((listing_id, hashes[listing_id], version) for listing_id in results)
+    memo.save()
+    # Scenarios follow the written fields (refresh_scenarios also catches a new grid); profile
+    # scores follow them and profiles/*.yml, which a new scorer version may have changed
+    refresh_scenarios(changes)
+    profiled = [r["id"] for r in stale if r["id"] in changes or state.get(r["id"], (None, None))[1] != version]
+    if profiled:
+        store_profile_scores({i: results[i]["profile_scores"] for i in profiled})
 
-    print(f"Done. Profile scores written to {CSV_PATH}")
+    print(f"Done. {len(stale)} rescored in {elapsed:.2f}s ({len(stale) / elapsed:,.0f} listings/s), "
+          f"{len(changes)} modified, {len(rows) - len(stale)} unchanged and skipped.")
+    print(f"  [memo] {memo.summary()}")
 
 
 if __name__ == "__main__":
@@ -1,57 +1,117 @@
-from scout.fetch import fetch_all_listings as fetch_sunbelt
-from scout.fetch_calhoun import fetch_all_listings as fetch_calhoun
-from scout.parse import parse_listings
-from scout.score import score_listing, profile_score
-from scout.narrative import generate_narrative
-from scout.storage import load_state, save_state, upsert_rows, SUNBELT_CSV, CALHOUN_CSV
-from scout.report import write_report
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 
+from scout.fetch import iter_listings as iter_sunbelt
+from scout.fetch_calhoun import iter_listings as iter_calhoun
+from scout.parse import parse_listing, diff_inputs
+from scout.memo import MemoCache
+from scout.records import ListingBatch
+from scout.storage import (
+    SeenIndex, upsert_rows, refresh_scenarios, refresh_profile_scores, SUNBELT_CSV, CALHOUN_CSV,
+)
+from scout.report import write_report
+from scout.fetch_cache import FetchCache
+from scout.archive import Archive, ReplayArchive
+from scout import http_client
 
-def _run_source(fetch_fn, source_name, csv_path, seen):
-    raw, discovered_ids = fetch_fn()
-    listings = parse_listings(raw)
-    new_listings = [l for l in listings if l["id"] not in seen]
 
-    scored = []
-    for l in new_listings:
-        l.update(score_listing(l))
-        l.update(profile_score(l))
-        l["narrative"] = generate_narrative(l)
+def _process(raw_stream, source_name, seen, replay, stats, memo):
+    """
+    Stream each raw listing through parse → score → profile → narrative, one
+    at a time. Already-seen listings are only rescored when their parsed
+    inputs changed; the field-level diff is kept on l["changes"]. Derived
+    fields, including the score under every criteria profile
+    (l["profile_scores"]), come from the memo when it has them for the same
+    inputs and rules.
+    """
+    for item in raw_stream:
+        stats["fetched"] += 1
+        l = parse_listing(item)
+        if l is None:
+            continue
+        # Replay reprocesses the whole archived corpus, not just new/changed listings
+        if not replay and l["id"] in seen:
+            if seen.is_unchanged(l):
+                continue
+            prev = seen.last_fields(l["id"])
+            # Listings migrated without a stored snapshot are re-baselined, not diffed
+            l["changes"] = diff_inputs(prev, l) if prev else {}
+            stats["changed"] += 1
+        l.update(memo.derive(l))
         l["source"] = source_name
-        scored.append(l)
+        yield l
+
 
-    upsert_rows(scored, active_ids=discovered_ids, csv_path=csv_path)
+def _run_source(iter_fn, source_name, csv_path, seen, cache, memo, replay=False):
+    discovered = set()
+    stats = {"fetched": 0, "changed": 0}
+    # Kept column-wise until the report; the per-listing feature records are dropped
+    scored = ListingBatch()
+
+    def _collect(stream):
+        for l in stream:
+            scored.append(l)
+            yield l
+
+    # upsert_rows consumes the stream as results arrive; `discovered` is
+    # complete by the time it marks inactive rows after the last listing.
+    stream = _process(iter_fn(cache=cache, discovered=discovered), source_name, seen, replay, stats, memo)
+    upsert_rows(_collect(stream), active_ids=discovered, csv_path=csv_path, source=source_name)
 
     buckets = {}
-    for s in scored:
-        b = s.get("bucket", "?")
+    for b in scored.values("bucket"):
+        b = b or "?"
         buckets[b] = buckets.get(b, 0) + 1
     summary = ", ".join(f"{v} {k}" for k, v in sorted(buckets.items()))
-    print(f"  [{source_name}] {len(raw)} fetched, {len(new_listings)} new. {summary}")
+    new = len(scored) - stats["changed"]
+    print(f"  [{source_name}] {stats['fetched']} fetched, {new} new, {stats['changed']} changed. {summary}")
 
-    return {l["id"] for l in new_listings}, scored
+    return scored, discovered
 
 
 def main():
-    state = load_state()
-    seen = set(state.get("seen_ids", []))
+    parser = argparse.ArgumentParser(description="Scrape, score and store broker listings")
+    parser.add_argument("--replay", action="store_true",
+                        help="Run the pipeline from the raw HTML archive with no network I/O")
+    parser.add_argument("--as-of", help="With --replay, use pages archived at or before this ISO time")
+    args = parser.parse_args()
+
+    seen = SeenIndex()
+    memo = MemoCache()
+    client = http_client.client()
+    if args.replay:
+        client.replay = ReplayArchive(as_of=args.as_of)
+        print(f"Replaying {len(client.replay)} archived pages")
+        cache = None
+    else:
+        client.archive = Archive()
+        cache = FetchCache()
 
-    print("── Sunbelt Midwest ──")
-    sunbelt_new_ids, sunbelt_scored = _run_source(fetch_sunbelt, "sunbelt", SUNBELT_CSV, seen)
-    seen.update(sunbelt_new_ids)
+    # Brokers live on different hosts with independent rate limits, so crawl both at once
+    print("── Sunbelt Midwest + Calhoun Companies ──")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        sunbelt = pool.submit(_run_source, iter_sunbelt, "sunbelt", SUNBELT_CSV, seen, cache, memo, args.replay)
+        calhoun = pool.submit(_run_source, iter_calhoun, "calhoun", CALHOUN_CSV, seen, cache, memo, args.replay)
+        sunbelt_scored, sunbelt_discovered = sunbelt.result()
+        calhoun_scored, calhoun_discovered = calhoun.result()
 
-    print("── Calhoun Companies ──")
-    calhoun_new_ids, calhoun_scored = _run_source(fetch_calhoun, "calhoun", CALHOUN_CSV, seen)
-    seen.update(calhoun_new_ids)
+    if not args.replay:
+        seen.record(sunbelt_scored, "sunbelt")
+        seen.record(calhoun_scored, "calhoun")
+        seen.touch(sunbelt_discovered | calhoun_discovered)
+        # Saved only after the seen index so an interrupted run never hides unscored listings
+        cache.save()
+        http_client.print_stats()
 
-    state["seen_ids"] = list(seen)[-5000:]
-    save_state(state)
+    memo.save()
+    print(f"  [memo] {memo.summary()}")
+    refresh_scenarios(set(sunbelt_scored.values("id")) | set(calhoun_scored.values("id")))
+    refresh_profile_scores()
 
-    all_scored = sunbelt_scored + calhoun_scored
+    all_scored = list(sunbelt_scored) + list(calhoun_scored)
     write_report(all_scored)
 
-    total_new = len(sunbelt_new_ids) + len(calhoun_new_ids)
-    print(f"Done. {total_new} new listings total.")
+    print(f"Done. {len(all_scored)} new or changed listings total ({len(seen)} tracked).")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+"""
+Content-addressed raw HTML archive.
+
+Every page fetched through scout.http_client is stored gzip-compressed under
+data/archive/blobs/<sha256[:2]>/<sha256>.html.gz (identical pages are stored
+once), and data/archive/index.jsonl records one {url, fetched_at, sha256}
+line per fetch. ReplayArchive serves the archived pages back so the whole
+pipeline can run offline (`python3 run.py --replay`).
+"""
+import gzip
+import json
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+
+import requests
+
+_BASE = Path(__file__).resolve().parents[1]
+ARCHIVE_DIR = _BASE / "data" / "archive"
+
+
+def full_url(url, params=None) -> str:
+    """The exact URL requests would send for (url, params); used as the archive key."""
+    if not params:
+        return url
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+class Archive:
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = Path(root)
+        self.index_path = self.root / "index.jsonl"
+        self._lock = threading.Lock()
+
+    def _blob_path(self, digest):
+        return self.root / "blobs" / digest[:2] / f"{digest}.html.gz"
+
+    def record(self, url: str, body: bytes):
+        """Store a fetched page body and append an index line for it."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        entry = {"url": url, "fetched_at": datetime.utcnow().isoformat(), "sha256": digest}
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(gzip.compress(body))
+                tmp.replace(path)
+            with self.index_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def read(self, digest: str) -> bytes:
+        return gzip.decompress(self._blob_path(digest).read_bytes())
+
+    def entries(self):
+        if not self.index_path.exists():
+            return
+        with self.index_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class ArchivedResponse:
+    """Just enough of requests.Response for the scrapers."""
+    __slots__ = ("url", "content", "status_code", "headers", "encoding")
+
+    def __init__(self, url, content):
+        self.url = url
+        self.content = content
+        self.status_code = 200
+        self.headers = {}
+        self.encoding = "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+
+class ReplayArchive:
+    """Serves the latest archived copy of each URL fetched at or before `as_of` (ISO time)."""
+
+    def __init__(self, archive=None, as_of=None):
+        self.archive = archive or Archive()
+        self.latest = {}
+        for e in self.archive.entries():
+            if as_of and e["fetched_at"] > as_of:
+                continue
+            prev = self.latest.get(e["url"])
+            if prev is None or e["fetched_at"] >= prev["fetched_at"]:
+                self.latest[e["url"]] = e
+
+    def __len__(self):
+        return len(self.latest)
+
+    def response(self, url: str):
+        """ArchivedResponse for a URL, or None if it was never archived."""
+        e = self.latest.get(url)
+        if e is None:
+            return None
+        return ArchivedResponse(url, self.archive.read(e["sha256"]))
@@ -0,0 +1,165 @@
+"""
+Industry category keyword lists used by the dashboard's category filters and
+chips. Each list is registered with scout.keywords so categorizing a listing
+shares the same single scan as parsing and scoring.
+"""
+import numpy as np
+
+from scout import keywords
+from scout.features import features_of
+
+TRADES_KEYWORDS = [
+    "plumb", "electrician", "electrical", "electric",
+    "hvac", "heating", "cooling", "air condition",
+    "roofing", "roofer",
+    "landscaping", "landscape", "lawn care", "lawn service",
+    "excavat", "concrete", "masonry", "mason",
+    "flooring", "carpet", "tile install",
+    "siding", "insulation", "gutter",
+    "pest control", "exterminator",
+    "septic", "drain service", "drain clean",
+    "welding", "welder",
+    "mechanical contractor", "mechanical service",
+    "snow removal", "irrigation",
+    "painting contractor", "painting company", "commercial painting",
+    "handyman", "restoration contractor", "fire restoration", "water restoration",
+    "refrigeration contractor",
+]
+LAWN_SNOW_KEYWORDS = [
+    "lawn care", "lawn service", "lawn mowing", "lawn maintenance", "lawn cutting",
+    "landscaping", "landscape", "landscape maintenance",
+    "snow removal", "snow plowing", "snow plow", "snow management",
+    "grounds maintenance", "grounds care", "groundskeeping",
+    "turf", "mowing", "mow", "irrigation", "sprinkler",
+    "fertiliz", "weed control", "tree service", "tree trimming", "tree removal",
+    "arborist", "leaf removal", "mulch",
+]
+HEALTHCARE_KEYWORDS = [
+    "home health", "home care", "home healthcare",
+    "senior care", "elder care", "assisted living", "memory care",
+    "medical", "dental", "optometry", "optometrist", "ophthalmol",
+    "veterinary", "veterinarian", "vet clinic", "animal hospital",
+    "physical therapy", "occupational therapy", "speech therapy",
+    "chiropractic", "chiropractor", "pharmacy", "pharmacist",
+    "mental health", "behavioral health", "counseling practice",
+    "nursing", "nurse staffing", "healthcare staffing",
+    "urgent care", "clinic", "medical practice",
+    "hospice", "palliative", "medical billing", "medical coding",
+    "radiology", "laboratory", "lab service", "health care", "healthcare",
+]
+CONSTRUCTION_KEYWORDS = [
+    "general contractor", "general construction", "commercial construction",
+    "commercial contractor", "residential construction", "home builder",
+    "remodel", "remodeling", "renovation", "framing", "drywall",
+    "finish carpenter", "finish carpentry", "foundation", "earthwork",
+    "site work", "construction company", "construction firm",
+    "civil contractor", "civil construction",
+]
+AUTOMOTIVE_KEYWORDS = [
+    "auto repair", "auto service", "automotive repair", "automotive service",
+    "car repair", "vehicle repair", "mechanic", "auto mechanic",
+    "body shop", "collision", "auto body", "oil change", "lube",
+    "car wash", "auto detailing", "vehicle detailing",
+    "auto parts", "used car", "car dealership", "auto dealer",
+    "tire shop", "tire service", "wheel alignment",
+    "transmission", "brake shop", "towing", "roadside assistance",
+    "fleet service", "fleet maintenance",
+]
+RESTAURANT_KEYWORDS = [
+    "restaurant", "bar ", "tavern", "pub ", "brewery", "brewpub",
+    "cafe", "coffee shop", "diner", "fast food", "quick service", "qsr",
+    "catering", "food service", "food truck", "pizza", "sandwich shop",
+    "deli", "bakery", "pastry", "donut", "food and beverage", "f&b",
+    "dining", "eatery", "breakfast", "brunch", "sushi", "steakhouse", "grill",
+]
+RETAIL_KEYWORDS = [
+    "retail", "retail store", "retail shop", "gift shop", "specialty store",
+    "boutique", "clothing store", "apparel", "furniture store", "home goods",
+    "sporting goods", "outdoor gear", "hardware store", "pet store", "pet supply",
+    "toy store", "hobby shop", "book store", "convenience store", "c-store",
+    "jewelry store", "florist", "flower shop",
+]
+MANUFACTURING_KEYWORDS = [
+    "manufacturing", "manufacturer", "fabrication", "fabricator",
+    "machining", "machine shop", "cnc", "production", "assembly",
+    "metal fabrication", "sheet metal", "plastic injection", "injection molding",
+    "food manufacturing", "food processing", "food production",
+    "packaging", "printing", "print shop", "woodworking", "cabinet making",
+    "millwork", "industrial", "factory", "contract manufacturing",
+]
+DISTRIBUTION_KEYWORDS = [
+    "distribution", "distributor", "logistics", "supply chain",
+    "trucking", "trucking company", "freight", "warehouse", "warehousing",
+    "delivery service", "delivery company", "courier", "last mile",
+    "wholesale", "wholesaler", "import", "export", "fulfillment", "cold storage",
+]
+FINANCIAL_KEYWORDS = [
+    "accounting", "accountant", "cpa", "bookkeeping", "bookkeeper",
+    "tax preparation", "tax service", "tax firm",
+    "financial planning", "financial advisor", "financial services",
+    "insurance agency", "insurance broker", "payroll service", "payroll processing",
+    "wealth management", "mortgage", "lending",
+]
+HOSPITALITY_KEYWORDS = [
+    "hotel", "motel", "inn ", "bed and breakfast", "b&b",
+    "lodge", "lodging", "resort", "vacation rental", "extended stay",
+]
+TECHNOLOGY_KEYWORDS = [
+    "managed service", "msp", "it service", "it support", "it consulting",
+    "computer repair", "tech repair", "software", "technology company",
+    "web development", "web design", "cybersecurity", "cyber security",
+    "data", "cloud services", "telecom", "telecommunications",
+]
+EDUCATION_KEYWORDS = [
+    "daycare", "day care", "childcare", "child care", "preschool",
+    "tutoring", "tutor", "learning center", "after school", "early childhood",
+    "montessori", "dance studio", "music school", "music lesson",
+    "martial arts", "karate", "driving school", "vocational",
+]
+BEAUTY_KEYWORDS = [
+    "salon", "hair salon", "beauty salon", "barber", "barbershop",
+    "nail salon", "nail spa", "spa", "day spa", "med spa",
+    "massage", "massage therapy", "skincare", "skin care",
+    "tanning salon", "gym", "fitness", "fitness center",
+    "yoga", "pilates", "crossfit", "personal training", "wellness center",
+]
+
+# Flag column -> keywords; a listing is in the category if any keyword occurs in
+# its lowercased "title description industry" text. The order fixes each flag's
+# bit in the stored category_mask, so append new categories at the end.
+CATEGORY_KEYWORDS = {
+    "is_healthcare":    HEALTHCARE_KEYWORDS,
+    "is_lawn_snow":     LAWN_SNOW_KEYWORDS,
+    "is_trades":        TRADES_KEYWORDS,
+    "is_construction":  CONSTRUCTION_KEYWORDS,
+    "is_automotive":    AUTOMOTIVE_KEYWORDS,
+    "is_restaurant":    RESTAURANT_KEYWORDS,
+    "is_retail":        RETAIL_KEYWORDS,
+    "is_manufacturing": MANUFACTURING_KEYWORDS,
+    "is_distribution":  DISTRIBUTION_KEYWORDS,
+    "is_financial":     FINANCIAL_KEYWORDS,
+    "is_hospitality":   HOSPITALITY_KEYWORDS,
+    "is_technology":    TECHNOLOGY_KEYWORDS,
+    "is_education":     EDUCATION_KEYWORDS,
+    "is_beauty":        BEAUTY_KEYWORDS,
+}
+
+for _col, _keywords in CATEGORY_KEYWORDS.items():
+    keywords.register(f"category.{_col}", _keywords)
+
+
+def category_flags(l) -> dict:
+    """{flag column: bool} for every category, from the listing's single keyword scan."""
+    hits = features_of(l).hits
+    return {col: f"category.{col}" in hits for col in CATEGORY_KEYWORDS}
+
+
+def category_mask(l) -> int:
+    """Every category flag packed into one int (bit i = i-th CATEGORY_KEYWORDS entry), as stored."""
+    return sum(1 << i for i, on in enumerate(category_flags(l).values()) if on)
+
+
+def flags_from_masks(masks) -> dict:
+    """{flag column: bool array} unpacked from an array of category_mask values."""
+    masks = np.asarray(masks, dtype=np.int64)
+    return {col: (masks >> i) & 1 == 1 for i, col in enumerate(CATEGORY_KEYWORDS)}
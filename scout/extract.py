@@ -0,0 +1,86 @@
+"""
+lxml helpers for the Calhoun detail-page scraper.
+
+A Calhoun page is parsed into an lxml tree once and its "Label: value" pairs
+are read off in one walk (label_values), then picked out by label tables.
+Sunbelt pages don't come through here: their fields sit in a few small
+sections, which fetch.py cuts out in a single regex scan of the page.
+"""
+import re
+import lxml.html
+from lxml import etree
+
+_WS = re.compile(r"\s+")
+
+# Page chrome whose text can look like "Label: value" pairs (search forms, menus)
+_CHROME_TAGS = ("script", "style", "noscript", "form", "nav", "header", "footer")
+
+
+def parse_html(html):
+    """lxml document for a page with scripts/chrome stripped, or None if there is nothing to parse."""
+    if not html or not html.strip():
+        return None
+    try:
+        doc = lxml.html.document_fromstring(html)
+    except ValueError:
+        # str input carrying an XML encoding declaration
+        doc = lxml.html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        return None
+    etree.strip_elements(doc, *_CHROME_TAGS, with_tail=False)
+    return doc
+
+
+def clean_text(el) -> str:
+    """Element text with tags treated as word breaks and whitespace collapsed."""
+    return _WS.sub(" ", " ".join(el.itertext())).strip()
+
+
+def text_lines(el) -> list[str]:
+    """Non-empty stripped lines, split at every tag boundary and newline."""
+    return [line.strip() for t in el.itertext() for line in t.split("\n") if line.strip()]
+
+
+def class_has(el, token: str) -> bool:
+    return token in (el.get("class") or "")
+
+
+def label_values(doc, labels) -> dict:
+    """
+    Map each label (matched case-insensitively) to the first value that follows
+    it in a single pass over the page's text nodes — either the next text node
+    (<dt>Price:</dt><dd>$1</dd>) or the rest of the same node ("Price: $1").
+    """
+    wanted = {l.lower(): l for l in labels}
+    found = {}
+    pending = None
+    for raw in doc.itertext():
+        text = raw.strip()
+        if not text:
+            continue
+        if pending is not None:
+            found.setdefault(pending, _WS.sub(" ", text))
+            pending = None
+            if len(found) == len(wanted):
+                break
+            continue
+        key = text.rstrip(":-").strip().lower()
+        if key in wanted:
+            if wanted[key] not in found:
+                pending = wanted[key]
+            continue
+        if ":" in text:
+            label, _, value = text.partition(":")
+            label = label.strip().lower()
+            value = _WS.sub(" ", value).strip()
+            if label in wanted and value:
+                found.setdefault(wanted[label], value)
+    return found
+
+
+def pick(values: dict, labels) -> str:
+    """First non-empty value among `labels`, in priority order."""
+    for label in labels:
+        if values.get(label):
+            return values[label]
+    return ""
@@ -0,0 +1,91 @@
+"""
+Per-listing text and numeric features, built once and shared by every stage.
+
+parse_listing attaches a ListingFeatures record under the "features" key.
+score_listing, profile_score, generate_narrative and the category flags read
+the lowercased context text, keyword hits and parsed numbers from that record
+instead of rebuilding and re-scanning `title + description + industry` each
+time. Rows without a record, such as CSV or database rows, get one built on
+demand.
+"""
+from scout import keywords
+
+
+def _number(val, cast=float):
+    if val is None or val == "":
+        return None
+    try:
+        num = float(val)
+    except (TypeError, ValueError):
+        return None
+    if num != num:      # NaN from pandas rows
+        return None
+    return cast(num)
+
+
+class ListingFeatures:
+    __slots__ = ("text", "location", "asking", "cash_flow", "revenue", "employees",
+                 "_hits", "_location_hits", "_generation")
+
+    def __init__(self, title="", description="", industry="", location="",
+                 asking=None, cash_flow=None, revenue=None, employees=None):
+        self.text = f"{title or ''} {description or ''} {industry or ''}".lower()
+        self.location = (location or "").lower()
+        self.asking = asking
+        self.cash_flow = cash_flow
+        self.revenue = revenue
+        self.employees = employees
+        self._generation = None
+
+    def _scan(self):
+        # Rescan only if keyword sets were registered since (e.g. criteria.yml on first score)
+        generation = keywords.generation()
+        if self._generation != generation:
+            self._hits = keywords.scan(self.text)
+            self._location_hits = keywords.scan(self.location)
+            self._generation = generation
+
+    @property
+    def hits(self) -> dict:
+        """{keyword set: matched keywords} for the context text."""
+        self._scan()
+        return self._hits
+
+    @property
+    def location_hits(self) -> dict:
+        self._scan()
+        return self._location_hits
+
+    @classmethod
+    def from_listing(cls, l: dict) -> "ListingFeatures":
+        return cls(
+            title=_text(l.get("title")),
+            description=_text(l.get("description")),
+            industry=_text(l.get("industry")),
+            location=_text(l.get("location")),
+            asking=_number(l.get("asking_price")),
+            cash_flow=_number(l.get("annual_cash_flow")),
+            revenue=_number(l.get("annual_revenue")),
+            employees=_number(l.get("employees"), int),
+        )
+
+    def has(self, keyword_set: str) -> bool:
+        return keyword_set in self.hits
+
+    def matched(self, keyword_set: str) -> tuple:
+        """Keywords of `keyword_set` found in the text, in list order."""
+        return self.hits.get(keyword_set, ())
+
+
+def _text(val) -> str:
+    if val is None or (isinstance(val, float) and val != val):
+        return ""
+    return str(val)
+
+
+def features_of(l: dict) -> ListingFeatures:
+    """The listing's attached feature record, or a fresh one for rows that never went through parse."""
+    f = l.get("features")
+    if f is None:
+        f = ListingFeatures.from_listing(l)
+    return f
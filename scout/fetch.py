@@ -1,12 +1,11 @@
-import time
 import re
-import requests
 import yaml
+from html import unescape
 from pathlib import Path
-from urllib.parse import urlencode, urljoin
 
-HEADERS = {}
-MAX_RETRIES = 3
+from scout import http_client
+from scout.workers import imap_bounded
+
 BASE = Path(__file__).resolve().parents[1]
 
 
@@ -14,30 +13,11 @@ def _load_config():
     return yaml.safe_load((BASE / "sources.yml").read_text())["sunbelt"]
 
 
-def _get_with_retry(url, params=None, cfg=None):
-    delay = cfg.get("rate_limit_delay", 3.0) if cfg else 3.0
+def _get(url, params=None, cfg=None, extra_headers=None):
+    """GET through the shared client. Returns the Response (including 304s), or None."""
     ua = cfg.get("user_agent", "Mozilla/5.0") if cfg else "Mozilla/5.0"
-    headers = {"User-Agent": ua}
-
-    for attempt in range(MAX_RETRIES):
-        try:
-            r = requests.get(url, params=params, headers=headers, timeout=30)
-            if r.status_code == 429:
-                wait = 2 ** (attempt + 2)
-                print(f"  Rate limited, waiting {wait}s...")
-                time.sleep(wait)
-                continue
-            if r.status_code == 404:
-                return None
-            r.raise_for_status()
-            return r.text
-        except requests.RequestException as e:
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(2 ** (attempt + 1))
-            else:
-                print(f"  Failed after {MAX_RETRIES} retries: {e}")
-                return None
-    return None
+    headers = {"User-Agent": ua, **(extra_headers or {})}
+    return http_client.get(url, params=params, headers=headers, revalidate=bool(extra_headers))
 
 
 def _extract_ids_from_html(html):
@@ -53,8 +33,7 @@ def _has_next_page(html):
 
 
 def _paginate_geography(base_url, geography, cfg):
-    """Paginate through all search result pages for a given geography, return all IDs found."""
-    delay   = cfg.get("rate_limit_delay", 3.0)
+    """Paginate through all search result pages for a given geography, yielding IDs page by page."""
     all_ids = set()
     page    = 1
 
@@ -64,8 +43,8 @@ def _paginate_geography(base_url, geography, cfg):
             "shownum":      100,
             "results":      page,
         }
-        time.sleep(delay)
-        html = _get_with_retry(base_url, params=params, cfg=cfg)
+        r = _get(base_url, params=params, cfg=cfg)
+        html = r.text if r is not None else None
         if not html:
             print(f"    [{geography}] Page {page}: request failed, stopping.")
             break
@@ -78,153 +57,219 @@ def _paginate_geography(base_url, geography, cfg):
         new = ids - all_ids
         all_ids.update(ids)
         print(f"    [{geography}] Page {page}: {len(ids)} listings ({len(new)} new) — {len(all_ids)} total")
+        yield from sorted(new)
 
         if not _has_next_page(html):
             break
 
         page += 1
 
-    return all_ids
-
 
 def _discover_listing_ids(cfg):
     """
     Paginate through Minnesota AND Undisclosed location listings to capture
     all relevant IDs, including those where sellers hide their location.
+    Yields each unique ID as soon as its search page is parsed.
     """
     base_url = cfg["base_url"]
     all_ids  = set()
 
     print("  Paginating through search results...")
     for geography in ["Minnesota", "Undisclosed"]:
-        ids = _paginate_geography(base_url, geography, cfg)
-        all_ids.update(ids)
+        for id_number in _paginate_geography(base_url, geography, cfg):
+            if id_number not in all_ids:
+                all_ids.add(id_number)
+                yield id_number
 
     print(f"  Discovered {len(all_ids)} unique listing IDs")
-    return all_ids
+
+
+# dt label on the detail page → raw listing key
+DETAIL_FIELDS = {
+    "Industry":                "industry",
+    "Location":                "location",
+    "Revenue":                 "revenue_text",
+    "Business Price":          "asking_price_text",
+    "Down Payment":            "down_payment_text",
+    "SDE (Cash Flow)":         "cash_flow_text",
+    "Real Estate":             "real_estate",
+    "FF & E":                  "ffe_text",
+    "Years in Business":       "years_in_business",
+    "Is this a franchise":     "is_franchise",
+    "Employees (Full-Time)":   "employees_ft",
+    "Employees (Part-Time)":   "employees_pt",
+    "Reason for selling":      "reason_for_selling",
+    "SBA Financing Available": "sba_available",
+    "Relocatable":             "relocatable",
+    "Home-Based":              "home_based",
+    "Listing Agent":           "listing_agent",
+    "Absentee Owner":          "absentee_owner_field",
+}
+
+
+def _dl_fields(lines):
+    """Pair dt/dd text lines into {label: value}, skipping tooltip text."""
+    field_map = {}
+    i = 0
+    while i < len(lines) - 1:
+        key = lines[i].rstrip(':')
+        val = lines[i + 1] if i + 1 < len(lines) else ""
+        # Skip tooltip text
+        if val.startswith(('SDE', 'FF & E', 'is an abbreviation', ': Furniture')):
+            i += 1
+            while i < len(lines) and not lines[i].startswith('$') and ':' not in lines[i]:
+                i += 1
+            if i < len(lines) and lines[i].startswith('$'):
+                val = lines[i]
+                i += 1
+                field_map[key] = val
+            continue
+        field_map[key] = val
+        i += 2
+    return field_map
+
+
+# Detail pages are mostly scripts and menus; the fields sit in a few small
+# sections. One scan of the page picks out every section the parser reads.
+def _body(tag):
+    """Pattern for everything up to the element's </tag>, as one unrolled run of text and other tags."""
+    return rf"[^<]*(?:<(?!/{tag}>)[^<]*)*"
+
+
+_SECTIONS = re.compile(
+    rf'<dl\b[^>]*>(?P<dl>{_body("dl")})</dl>'
+    rf'|<h3\b[^>]*>(?P<h3>{_body("h3")})</h3>'
+    rf'|<h4\b[^>]*class="[^"]*sunbelt-red[^"]*"[^>]*>(?P<h4>{_body("h4")})</h4>'
+    rf'|<div\b[^>]*class="[^"]*web-desc[^"]*"[^>]*>(?P<desc>{_body("div")})</div>'
+    rf'|<p\b[^>]*>(?P<p>{_body("p")})</p>'
+)
+_TAG = re.compile(r"<[^>]+>")
+_WS = re.compile(r"\s+")
+
+
+def _text(fragment, sep=" ") -> str:
+    """Fragment text with tags replaced by `sep` and entities decoded."""
+    return unescape(_TAG.sub(sep, fragment))
 
 
 def _parse_detail_page(html, id_number):
-    """Parse a detail page HTML into a raw listing dict."""
+    """Parse a detail page HTML into a raw listing dict in one scan of the page."""
     result = {"id_number": id_number}
+    listing_dl = title = h4_title = web_desc = None
+    paragraphs = []
+    for m in _SECTIONS.finditer(html or ""):
+        kind = m.lastgroup
+        if kind == "dl":
+            # Anchor to the <dl> that holds the dt/dd pairs, not the stray
+            # "Listing ID:" that can appear in the description <p> tags
+            if listing_dl is None and "Listing ID:" in m.group("dl"):
+                listing_dl = m.group("dl")
+        elif kind == "h3":
+            # On detail pages the business name is an h3 (h1 is "Complete Search Listing")
+            if title is None:
+                clean = _text(m.group("h3"), "").strip()
+                if len(clean) > 10 and "contact" not in clean.lower() and "sunbelt" not in clean.lower():
+                    title = clean
+        elif kind == "h4":
+            if h4_title is None:
+                h4_title = _text(m.group("h4"), "").strip()
+        elif kind == "desc":
+            if web_desc is None:
+                web_desc = m.group("desc")
+        else:
+            paragraphs.append(m.group("p"))
+
+    if listing_dl is not None:
+        lines = [line.strip() for line in _text(listing_dl, "\n").split("\n") if line.strip()]
+        field_map = _dl_fields(lines)
+        for label, key in DETAIL_FIELDS.items():
+            result[key] = field_map.get(label, "")
 
-    # Extract structured data from the dl/dt/dd table
-    # Anchor to the <dl> tag that contains dt/dd pairs, not the stray
-    # "Listing ID:" that can appear in the description <p> tags
-    listing_section = re.search(r'<dl[^>]*>.*?Listing ID:.*?</dl>', html, re.DOTALL)
-    if listing_section:
-        section = listing_section.group()
-        text = re.sub(r'<[^>]+>', '\n', section)
-        lines = [l.strip() for l in text.split('\n') if l.strip()]
-
-        field_map = {}
-        i = 0
-        while i < len(lines) - 1:
-            key = lines[i].rstrip(':')
-            val = lines[i + 1] if i + 1 < len(lines) else ""
-            # Skip tooltip text
-            if val.startswith(('SDE', 'FF & E', 'is an abbreviation', ': Furniture')):
-                i += 1
-                while i < len(lines) and not lines[i].startswith('$') and ':' not in lines[i]:
-                    i += 1
-                if i < len(lines) and lines[i].startswith('$'):
-                    val = lines[i]
-                    i += 1
-                    field_map[key] = val
-                continue
-            field_map[key] = val
-            i += 2
-
-        result["industry"] = field_map.get("Industry", "")
-        result["location"] = field_map.get("Location", "")
-        result["revenue_text"] = field_map.get("Revenue", "")
-        result["asking_price_text"] = field_map.get("Business Price", "")
-        result["down_payment_text"] = field_map.get("Down Payment", "")
-        result["cash_flow_text"] = field_map.get("SDE (Cash Flow)", "")
-        result["real_estate"] = field_map.get("Real Estate", "")
-        result["ffe_text"] = field_map.get("FF & E", "")
-        result["years_in_business"] = field_map.get("Years in Business", "")
-        result["is_franchise"] = field_map.get("Is this a franchise", "")
-        result["employees_ft"] = field_map.get("Employees (Full-Time)", "")
-        result["employees_pt"] = field_map.get("Employees (Part-Time)", "")
-        result["reason_for_selling"] = field_map.get("Reason for selling", "")
-        result["sba_available"] = field_map.get("SBA Financing Available", "")
-        result["relocatable"] = field_map.get("Relocatable", "")
-        result["home_based"] = field_map.get("Home-Based", "")
-        result["listing_agent"] = field_map.get("Listing Agent", "")
-        result["absentee_owner_field"] = field_map.get("Absentee Owner", "")
-
-    # Extract title — on detail pages it's in h3 (not h1 which is "Complete Search Listing")
-    # Try h3 first (the real business name), skip generic headers
-    h3_matches = re.findall(r'<h3[^>]*>(.*?)</h3>', html, re.DOTALL)
-    for h3 in h3_matches:
-        clean = re.sub(r'<[^>]+>', '', h3).strip()
-        if clean and len(clean) > 10 and "contact" not in clean.lower() and "sunbelt" not in clean.lower():
-            result["title"] = clean
-            break
     # Fallback to h4 (search results page style)
-    if "title" not in result:
-        h4_match = re.search(r'<h4[^>]*class="[^"]*sunbelt-red[^"]*"[^>]*>(.*?)</h4>', html, re.DOTALL)
-        if h4_match:
-            result["title"] = re.sub(r'<[^>]+>', '', h4_match.group(1)).strip()
-
-    # Extract description text
-    desc_match = re.search(r'<div[^>]*class="[^"]*web-desc[^"]*"[^>]*>(.*?)</div>', html, re.DOTALL)
-    if desc_match:
-        desc = re.sub(r'<[^>]+>', ' ', desc_match.group(1))
-        desc = re.sub(r'\s+', ' ', desc).strip()
-        result["description"] = desc[:2000]
+    if title is not None:
+        result["title"] = title
+    elif h4_title is not None:
+        result["title"] = h4_title
+
+    if web_desc is not None:
+        result["description"] = _WS.sub(" ", _text(web_desc)).strip()[:2000]
     else:
-        # Fallback: find largest text block after the title
-        paragraphs = re.findall(r'<p[^>]*>(.*?)</p>', html, re.DOTALL)
-        texts = []
-        for p in paragraphs:
-            clean = re.sub(r'<[^>]+>', ' ', p)
-            clean = re.sub(r'\s+', ' ', clean).strip()
-            if len(clean) > 50:
-                texts.append(clean)
+        # Fallback: join the substantial text blocks
+        texts = [t for t in (_WS.sub(" ", _text(p)).strip() for p in paragraphs) if len(t) > 50]
         if texts:
             result["description"] = " ".join(texts)[:2000]
 
     return result
 
 
-def fetch_all_listings():
+def _fetch_detail(id_number, cfg, cache):
+    """Fetch + parse one detail page. Returns (id_number, status, raw) with status in ok/failed/not_modified/unchanged."""
+    detail_url = f"https://www.sunbeltmidwest.com/complete-search-listing/?id_number={id_number}"
+    conditional = cache.conditional_headers(detail_url) if cache else {}
+    r = _get(detail_url, cfg=cfg, extra_headers=conditional)
+    if r is None:
+        return id_number, "failed", None
+    if r.status_code == 304:
+        cache.touch(detail_url)
+        return id_number, "not_modified", None
+
+    raw = _parse_detail_page(r.text, id_number)
+    raw["detail_url"] = detail_url
+    if cache and not cache.update(detail_url, r.headers, raw):
+        return id_number, "unchanged", None
+    return id_number, "ok", raw
+
+
+def iter_listings(cache=None, discovered=None):
     """
-    Main entry point. Discovers listing IDs via search page filter
-    combinations, then fetches each detail page for full data.
-    Returns list of raw dicts.
+    Stream raw listing dicts. Detail pages are requested as soon as their IDs
+    come off a search page, on a small worker pool throttled by the per-host
+    token bucket, and yielded as they complete.
+    If a FetchCache is given, known pages are revalidated with conditional
+    requests and only new or changed listings are yielded.
+    Every discovered ID is added to `discovered` so the caller can mark
+    inactive listings once the stream is exhausted.
     """
     cfg = _load_config()
-    detail_delay = cfg.get("detail_rate_limit_delay", 2.0)
-
-    print("Discovering listing IDs...")
-    ids = _discover_listing_ids(cfg)
-
-    print(f"Fetching {len(ids)} detail pages...")
-    listings = []
-    for i, id_number in enumerate(sorted(ids)):
-        detail_url = f"https://www.sunbeltmidwest.com/complete-search-listing/?id_number={id_number}"
-        time.sleep(detail_delay)
-        html = _get_with_retry(detail_url, cfg=cfg)
-        if html is None:
-            print(f"  [{i+1}/{len(ids)}] Failed: {id_number}")
+    workers = cfg.get("detail_workers", 4)
+    discovered = set() if discovered is None else discovered
+
+    def _ids():
+        for id_number in _discover_listing_ids(cfg):
+            discovered.add(id_number)
+            yield id_number
+
+    print(f"Discovering listing IDs and fetching detail pages ({workers} workers)...")
+    fetched = 0
+    counts = {"not_modified": 0, "unchanged": 0}
+    for id_number, status, raw in imap_bounded(lambda i: _fetch_detail(i, cfg, cache), _ids(), workers):
+        if status == "failed":
+            print(f"  Failed: {id_number}")
+            continue
+        if status != "ok":
+            counts[status] += 1
             continue
-
-        raw = _parse_detail_page(html, id_number)
-        raw["detail_url"] = detail_url
 
         # Check if this is actually a Minnesota listing
         loc = raw.get("location", "").lower()
         if "minnesota" in loc or not loc:
-            listings.append(raw)
+            fetched += 1
+            if fetched % 10 == 0:
+                print(f"  [{fetched}] fetched...")
+            yield raw
         else:
             # Skip non-Minnesota (some filter combos leak other states)
             pass
 
-        if (i + 1) % 10 == 0:
-            print(f"  [{i+1}/{len(ids)}] fetched...")
+    print(f"  Fetched {fetched} new/changed Minnesota listings "
+          f"({counts['not_modified']} not modified, {counts['unchanged']} unchanged)")
 
-    print(f"  Fetched {len(listings)} Minnesota listings")
-    # Return listings + full discovered ID set so caller can mark inactive correctly
-    return listings, ids
+
+def fetch_all_listings(cache=None):
+    """
+    Main entry point. Collects iter_listings() into a list.
+    Returns (listings, discovered_ids) so caller can mark inactive correctly.
+    """
+    discovered = set()
+    listings = list(iter_listings(cache=cache, discovered=discovered))
+    return listings, discovered
@@ -0,0 +1,68 @@
+"""
+Persistent per-listing fetch cache.
+
+Remembers the ETag / Last-Modified validators and a hash of the parsed fields
+for every detail page, so later runs can send conditional requests and skip
+re-parsing/re-scoring pages whose content hasn't changed.
+"""
+import json
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+
+_BASE = Path(__file__).resolve().parents[1]
+CACHE_PATH = _BASE / "data" / "fetch_cache.json"
+
+
+def fields_hash(raw: dict) -> str:
+    """Stable hash of a parsed detail-page dict."""
+    blob = json.dumps(raw, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class FetchCache:
+    """{url: {etag, last_modified, hash, checked}} backed by data/fetch_cache.json."""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = Path(path)
+        self.entries = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text())
+
+    def conditional_headers(self, url: str) -> dict:
+        """If-None-Match / If-Modified-Since headers for a previously fetched URL."""
+        entry = self.entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def touch(self, url: str):
+        """Record a 304 Not Modified revalidation."""
+        with self._lock:
+            if url in self.entries:
+                self.entries[url]["checked"] = datetime.utcnow().isoformat()
+
+    def update(self, url: str, response_headers, raw: dict) -> bool:
+        """Store validators + content hash for a fetched page. Returns True if the content changed."""
+        digest = fields_hash(raw)
+        with self._lock:
+            changed = self.entries.get(url, {}).get("hash") != digest
+            self.entries[url] = {
+                "etag":          response_headers.get("ETag", ""),
+                "last_modified": response_headers.get("Last-Modified", ""),
+                "hash":          digest,
+                "checked":       datetime.utcnow().isoformat(),
+            }
+        return changed
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.path.write_text(json.dumps(self.entries, indent=2))
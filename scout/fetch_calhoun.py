@@ -2,40 +2,32 @@
 Calhoun Companies listing scraper.
 Returns raw dicts in parse_listings()-compatible format.
 """
-import time
 import re
-import requests
+import yaml
+from pathlib import Path
 
+from scout import http_client
+from scout.extract import parse_html, clean_text, class_has, label_values, pick
+from scout.workers import imap_bounded
+
+BASE = Path(__file__).resolve().parents[1]
 BASE_URL = "https://www.calhouncompanies.com"
 SEARCH_URL = f"{BASE_URL}/find-a-business"
 HEADERS = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"}
-RATE_LIMIT = 2.0
-MAX_RETRIES = 3
 
 
-def _get(url, params=None):
-    for attempt in range(MAX_RETRIES):
-        try:
-            r = requests.get(url, params=params, headers=HEADERS, timeout=30)
-            if r.status_code == 404:
-                return None
-            r.raise_for_status()
-            return r.text
-        except requests.RequestException as e:
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(2 ** (attempt + 1))
-            else:
-                print(f"  [Calhoun] Request failed: {e}")
-                return None
-    return None
+def _load_config():
+    return yaml.safe_load((BASE / "sources.yml").read_text()).get("calhoun", {})
 
 
-def _clean(text):
-    return re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', '', text)).strip()
+def _get(url, params=None, extra_headers=None):
+    """GET through the shared client. Returns the Response (including 304s), or None."""
+    headers = {**HEADERS, **(extra_headers or {})}
+    return http_client.get(url, params=params, headers=headers, revalidate=bool(extra_headers))
 
 
 def _discover_slugs():
-    """Paginate search results and return all /business/ slugs."""
+    """Paginate search results, yielding new /business/ slugs as each page is parsed."""
     slugs = set()
     page = 0
     while True:
@@ -47,8 +39,8 @@ def _discover_slugs():
             "keys": "",
             "page": page,
         }
-        time.sleep(RATE_LIMIT)
-        html = _get(SEARCH_URL, params=params)
+        r = _get(SEARCH_URL, params=params)
+        html = r.text if r is not None else None
         if not html:
             break
 
@@ -63,13 +55,28 @@ def _discover_slugs():
 
         slugs.update(found)
         print(f"  [Calhoun] Page {page}: {len(found)} listings ({len(new)} new) — {len(slugs)} total")
+        yield from new
         page += 1
 
-    return slugs
+
+# raw listing key → field labels on the detail page, in priority order
+DETAIL_FIELDS = {
+    "industry":          ["Industry"],
+    "location":          ["Location"],
+    "asking_price_text": ["Price", "Business Price", "Asking Price"],
+    "cash_flow_text":    ["Cash Flow", "SDE (Cash Flow)", "SDE"],
+    "revenue_text":      ["Gross Sales", "Revenue", "Annual Revenue"],
+    "years_in_business": ["Years Established", "Years in Business"],
+    "listing_agent":     ["Listing Agent", "Contact Agent"],
+}
+_LABELS = [label for labels in DETAIL_FIELDS.values() for label in labels]
+
+# Common Drupal body field class patterns, most specific first
+DESCRIPTION_CLASSES = ["field--name-body", "body", "description"]
 
 
 def _parse_detail(html, slug):
-    """Parse a Calhoun detail page into a parse_listings()-compatible dict."""
+    """Parse a Calhoun detail page into a parse_listings()-compatible dict in one walk of the DOM."""
     slug_name = slug.lstrip("/").split("/")[-1]
     result = {
         "id_number":          f"calhoun_{slug_name}",
@@ -82,80 +89,108 @@ def _parse_detail(html, slug):
         "employees_pt":       None,
         "real_estate":        "",
     }
+    doc = parse_html(html)
+    if doc is None:
+        for key in DETAIL_FIELDS:
+            result[key] = ""
+        result["location"] = "Minnesota"
+        return result
+
+    h1 = h3 = None
+    desc_divs = {}
+    paragraphs = []
+    for el in doc.iter("h1", "h3", "div", "p"):
+        tag = el.tag
+        if tag == "h1":
+            h1 = el if h1 is None else h1
+        elif tag == "h3":
+            h3 = el if h3 is None else h3
+        elif tag == "div":
+            for cls in DESCRIPTION_CLASSES:
+                if cls not in desc_divs and class_has(el, cls):
+                    desc_divs[cls] = el
+        else:
+            paragraphs.append(el)
 
     # Title
-    h1 = re.search(r'<h1[^>]*>(.*?)</h1>', html, re.DOTALL)
-    if h1:
-        result["title"] = _clean(h1.group(1))
-    if not result.get("title"):
-        h3 = re.search(r'<h3[^>]*>(.*?)</h3>', html, re.DOTALL)
-        if h3:
-            result["title"] = _clean(h3.group(1))
-
-    def _field(label):
-        # Pattern: Label text near a value in the next element
-        m = re.search(
-            rf'{re.escape(label)}\s*[:\-]?\s*</[^>]*>\s*<[^>]*>\s*([^<]+)',
-            html, re.IGNORECASE
-        )
-        if m:
-            return _clean(m.group(1))
-        # Plain text: "Label: value"
-        m = re.search(rf'{re.escape(label)}\s*:\s*([^\n<]+)', html, re.IGNORECASE)
-        if m:
-            return _clean(m.group(1))
-        return ""
-
-    result["industry"]          = _field("Industry")
-    result["location"]          = _field("Location") or "Minnesota"
-    result["asking_price_text"] = _field("Price") or _field("Business Price") or _field("Asking Price")
-    result["cash_flow_text"]    = _field("Cash Flow") or _field("SDE (Cash Flow)") or _field("SDE")
-    result["revenue_text"]      = _field("Gross Sales") or _field("Revenue") or _field("Annual Revenue")
-    result["years_in_business"] = _field("Years Established") or _field("Years in Business")
-    result["listing_agent"]     = _field("Listing Agent") or _field("Contact Agent")
-
-    # Description — try common Drupal body field class patterns first
-    for pattern in [
-        r'<div[^>]*class="[^"]*field--name-body[^"]*"[^>]*>(.*?)</div>\s*</div>',
-        r'<div[^>]*class="[^"]*body[^"]*"[^>]*>(.*?)</div>',
-        r'<div[^>]*class="[^"]*description[^"]*"[^>]*>(.*?)</div>',
-    ]:
-        m = re.search(pattern, html, re.DOTALL | re.IGNORECASE)
-        if m:
-            text = _clean(m.group(1))
+    if h1 is not None:
+        result["title"] = clean_text(h1)
+    if not result.get("title") and h3 is not None:
+        result["title"] = clean_text(h3)
+
+    values = label_values(doc, _LABELS)
+    for key, labels in DETAIL_FIELDS.items():
+        result[key] = pick(values, labels)
+    result["location"] = result["location"] or "Minnesota"
+
+    # Description
+    for cls in DESCRIPTION_CLASSES:
+        if cls in desc_divs:
+            text = clean_text(desc_divs[cls])
             if len(text) > 50:
                 result["description"] = text[:2000]
                 break
 
     if "description" not in result:
-        paragraphs = re.findall(r'<p[^>]*>(.*?)</p>', html, re.DOTALL)
-        texts = [_clean(p) for p in paragraphs if len(_clean(p)) > 50]
+        texts = [t for t in (clean_text(p) for p in paragraphs) if len(t) > 50]
         if texts:
             result["description"] = " ".join(texts[:5])[:2000]
 
     return result
 
 
-def fetch_all_listings():
+def _fetch_detail(slug, cache):
+    """Fetch + parse one detail page. Returns (status, raw) with status in ok/failed/not_modified/unchanged."""
+    url = f"{BASE_URL}{slug}"
+    conditional = cache.conditional_headers(url) if cache else {}
+    r = _get(url, extra_headers=conditional)
+    if r is None:
+        return "failed", None
+    if r.status_code == 304:
+        cache.touch(url)
+        return "not_modified", None
+    raw = _parse_detail(r.text, slug)
+    if cache and not cache.update(url, r.headers, raw):
+        return "unchanged", None
+    return "ok", raw
+
+
+def iter_listings(cache=None, discovered=None):
     """
-    Discover and fetch all Calhoun MN listings.
-    Returns (listings, discovered_ids) compatible with parse_listings().
+    Stream raw Calhoun MN listing dicts, fetching detail pages as soon as
+    their slugs come off a search page. Discovered IDs are added to
+    `discovered`. If a FetchCache is given, only new or changed listings
+    are yielded.
     """
-    print("  [Calhoun] Discovering listings...")
-    slugs = _discover_slugs()
-    discovered_ids = {f"calhoun_{s.lstrip('/').split('/')[-1]}" for s in slugs}
-
-    print(f"  [Calhoun] Fetching {len(slugs)} detail pages...")
-    listings = []
-    for i, slug in enumerate(sorted(slugs)):
-        time.sleep(RATE_LIMIT)
-        html = _get(f"{BASE_URL}{slug}")
-        if html is None:
+    workers = _load_config().get("detail_workers", 4)
+    discovered = set() if discovered is None else discovered
+
+    def _slugs():
+        for slug in _discover_slugs():
+            discovered.add(f"calhoun_{slug.lstrip('/').split('/')[-1]}")
+            yield slug
+
+    print(f"  [Calhoun] Discovering listings and fetching detail pages ({workers} workers)...")
+    fetched = 0
+    counts = {"failed": 0, "not_modified": 0, "unchanged": 0}
+    for status, raw in imap_bounded(lambda slug: _fetch_detail(slug, cache), _slugs(), workers):
+        if status != "ok":
+            counts[status] += 1
             continue
-        raw = _parse_detail(html, slug)
-        listings.append(raw)
-        if (i + 1) % 10 == 0:
-            print(f"  [Calhoun] [{i+1}/{len(slugs)}] fetched...")
+        fetched += 1
+        if fetched % 10 == 0:
+            print(f"  [Calhoun] [{fetched}] fetched...")
+        yield raw
 
-    print(f"  [Calhoun] Fetched {len(listings)} listings")
-    return listings, discovered_ids
+    print(f"  [Calhoun] Fetched {fetched} new/changed listings "
+          f"({counts['not_modified']} not modified, {counts['unchanged']} unchanged)")
+
+
+def fetch_all_listings(cache=None):
+    """
+    Discover and fetch all Calhoun MN listings.
+    Returns (listings, discovered_ids) compatible with parse_listings().
+    """
+    discovered = set()
+    listings = list(iter_listings(cache=cache, discovered=discovered))
+    return listings, discovered
@@ -0,0 +1,252 @@
+"""
+Vectorized SBA / seller-financing model.
+
+Every derived financial column is computed for a whole batch of listings in
+one NumPy pass, and the scenario grid (down payment x rate x term x seller
+note x standby) for every listing in another. Financing terms come from the
+`sba:` block in criteria.yml. Amortization factors depend only on rate and
+term, so they are cached per (rate, term) instead of raising (1 + r) ** n per
+listing. Missing inputs and undefined outputs are NaN.
+"""
+import itertools
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+_sba_cache = None
+
+_SBA_DEFAULTS = {
+    "interest_rate": 0.10,
+    "loan_term_years": 10,
+    "down_payment_pct_low": 0.10,
+    "down_payment_pct_high": 0.20,
+    "seller_note_pct": 0.10,
+    "seller_note_rate": 0.06,
+    "seller_note_years": 5,
+    "standby_months": 24,
+}
+
+FINANCIAL_FIELDS = [
+    "down_10", "down_20",
+    "sba_loan_90", "sba_loan_80",
+    "sba_monthly_10pct", "sba_monthly_20pct",
+    "annual_debt_service_10pct", "annual_debt_service_20pct",
+    "cf_after_debt_10pct", "cf_after_debt_20pct",
+    "coc_return_10pct", "coc_return_20pct",
+    "dscr_10pct", "dscr_20pct",
+    "payoff_years_10pct", "payoff_years_20pct",
+    # Seller financing scenario (seller carries a note, buyer puts $0 down)
+    "seller_note_amount",
+    "seller_note_monthly",
+    "seller_note_annual",
+    "cf_during_standby",          # Standby period: only SBA payment (seller note on standby)
+    "cf_after_seller_financing",  # After standby: SBA + seller note payments
+    "dscr_seller_financed",       # DSCR after both payments
+]
+
+SCENARIO_PARAMS = [
+    "down_payment_pct", "interest_rate", "loan_term_years",
+    "seller_note_pct", "seller_note_rate", "seller_note_years", "standby_months",
+]
+SCENARIO_FIELDS = [
+    "sba_monthly", "annual_debt_service", "seller_note_annual",
+    "cf_during_standby", "cf_after_debt", "dscr", "coc_return", "payoff_years",
+]
+
+
+def sba_config() -> dict:
+    """The `sba:` block of criteria.yml over built-in defaults."""
+    global _sba_cache
+    if _sba_cache is None:
+        base = Path(__file__).resolve().parents[1]
+        criteria = yaml.safe_load((base / "criteria.yml").read_text()) or {}
+        _sba_cache = {**_SBA_DEFAULTS, **(criteria.get("sba") or {})}
+    return _sba_cache
+
+
+def use_sba(sba: dict | None):
+    """Replace the financing terms for this process, e.g. with a candidate criteria file's `sba:` block."""
+    global _sba_cache
+    _sba_cache = {**_SBA_DEFAULTS, **(sba or {})}
+
+
+@lru_cache(maxsize=None)
+def annuity_factor(annual_rate, years):
+    """Monthly payment per dollar of principal for a fully amortizing loan."""
+    r = annual_rate / 12
+    if r == 0:
+        return 1 / (years * 12)
+    growth = (1 + r) ** (years * 12)
+    return r * growth / (growth - 1)
+
+
+def _as_array(values):
+    if isinstance(values, np.ndarray):
+        return values.astype(float, copy=False)
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def derive_financials_batch(asking, annual_cf) -> dict:
+    """
+    {field: float64 array} for every FINANCIAL_FIELDS column, given arrays (or
+    sequences with None) of asking price and annual cash flow. Intermediate
+    values are rounded at the same points as the per-listing model always was,
+    so results match it apart from the odd exact half-cent tie.
+    """
+    cfg = sba_config()
+    asking = _as_array(asking)
+    cf = _as_array(annual_cf)
+    nan = np.full(asking.shape, np.nan)
+    sba_factor = annuity_factor(cfg["interest_rate"], cfg["loan_term_years"])
+    seller_factor = annuity_factor(cfg["seller_note_rate"], cfg["seller_note_years"])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        priced = asking > 0
+        has_cf = priced & (cf > 0)
+        a = np.where(priced, asking, np.nan)
+        c = np.where(has_cf, cf, np.nan)
+
+        # Columns keep their historical 10/20 names for the low/high down payments
+        out = {}
+        for pct, tag, loan_tag in ((cfg["down_payment_pct_low"], "10", "90"),
+                                   (cfg["down_payment_pct_high"], "20", "80")):
+            down = np.round(a * pct, 2)
+            loan = np.round(a * (1 - pct), 2)
+            monthly = np.round(loan * sba_factor, 2)
+            debt = np.round(monthly * 12, 2)
+            cf_after = np.round(c - debt, 2)
+            out[f"down_{tag}"] = down
+            out[f"sba_loan_{loan_tag}"] = loan
+            out[f"sba_monthly_{tag}pct"] = monthly
+            out[f"annual_debt_service_{tag}pct"] = debt
+            out[f"cf_after_debt_{tag}pct"] = cf_after
+            out[f"dscr_{tag}pct"] = np.round(c / debt, 2)
+            out[f"coc_return_{tag}pct"] = np.round(cf_after / down, 4)
+            out[f"payoff_years_{tag}pct"] = np.where(cf_after > 0, np.round(down / cf_after, 2), nan)
+
+        # Seller-financed variant of the low-down deal: same SBA loan, with the
+        # seller carrying a note in place of the buyer's cash
+        seller_note = np.round(np.where(has_cf, a, np.nan) * cfg["seller_note_pct"], 2)
+        seller_monthly = np.round(seller_note * seller_factor, 2)
+        seller_annual = np.round(seller_monthly * 12, 2)
+        total_debt = out["annual_debt_service_10pct"] + seller_annual
+        out["seller_note_amount"] = seller_note
+        out["seller_note_monthly"] = seller_monthly
+        out["seller_note_annual"] = seller_annual
+        out["cf_during_standby"] = out["cf_after_debt_10pct"]
+        out["cf_after_seller_financing"] = np.round(c - total_debt, 2)
+        out["dscr_seller_financed"] = np.round(c / total_debt, 2)
+
+    return {k: out[k] for k in FINANCIAL_FIELDS}
+
+
+RATIO_FIELDS = ["revenue_multiple", "sde_margin", "revenue_per_employee"]
+
+
+def derive_ratios_batch(asking, annual_cf, revenue, employees) -> dict:
+    """
+    {field: float64 array} for the RATIO_FIELDS columns: asking / revenue,
+    cash flow / revenue and revenue per employee. NaN where an input is
+    missing or the divisor is not positive.
+    """
+    asking = _as_array(asking)
+    cf = _as_array(annual_cf)
+    revenue = _as_array(revenue)
+    employees = _as_array(employees)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        has_revenue = revenue > 0
+        return {
+            "revenue_multiple":     np.where(has_revenue, np.round(asking / revenue, 2), np.nan),
+            "sde_margin":           np.where(has_revenue, np.round(cf / revenue, 4), np.nan),
+            "revenue_per_employee": np.where(employees > 0, np.round(revenue / employees, 0), np.nan),
+        }
+
+
+def scenario_grid(grid: dict | None = None) -> list[dict]:
+    """
+    Every combination of the `sba.scenario_grid` lists (or `grid`), one dict of
+    SCENARIO_PARAMS per scenario. Parameters not in the grid take the base value.
+    """
+    cfg = sba_config()
+    grid = grid if grid is not None else (cfg.get("scenario_grid") or {})
+    base = {
+        "down_payment_pct":  cfg["down_payment_pct_low"],
+        "interest_rate":     cfg["interest_rate"],
+        "loan_term_years":   cfg["loan_term_years"],
+        "seller_note_pct":   cfg["seller_note_pct"],
+        "seller_note_rate":  cfg["seller_note_rate"],
+        "seller_note_years": cfg["seller_note_years"],
+        "standby_months":    cfg["standby_months"],
+    }
+    axes = [grid.get(k, [base[k]]) for k in SCENARIO_PARAMS]
+    return [dict(zip(SCENARIO_PARAMS, combo)) for combo in itertools.product(*axes)]
+
+
+def evaluate_scenarios(asking, annual_cf, scenarios: list[dict]) -> dict:
+    """
+    Evaluate every scenario for every listing in one broadcast (scenarios x
+    listings). Returns {field: array of shape (len(scenarios), len(asking))}
+    for SCENARIO_FIELDS plus "down_payment" and "seller_note". The SBA loan
+    covers whatever the down payment and seller note do not.
+    """
+    asking = _as_array(asking)[None, :]
+    cf = _as_array(annual_cf)[None, :]
+
+    def param(name):
+        return np.array([s[name] for s in scenarios], dtype=float)[:, None]
+
+    down_pct, seller_pct, standby = param("down_payment_pct"), param("seller_note_pct"), param("standby_months")
+    sba_factor = np.array([annuity_factor(s["interest_rate"], s["loan_term_years"]) for s in scenarios])[:, None]
+    seller_factor = np.array([annuity_factor(s["seller_note_rate"], s["seller_note_years"])
+                              for s in scenarios])[:, None]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        a = np.where(asking > 0, asking, np.nan)
+        c = np.where(cf > 0, cf, np.nan)
+        down = np.round(a * down_pct, 2)
+        seller_note = np.round(a * seller_pct, 2)
+        loan = np.round(a * (1 - down_pct - seller_pct), 2)
+        monthly = np.round(loan * sba_factor, 2)
+        debt = np.round(monthly * 12, 2)
+        seller_annual = np.round(np.round(seller_note * seller_factor, 2) * 12, 2)
+        cf_standby = np.round(c - debt, 2)
+        cf_after = np.round(c - debt - seller_annual, 2)
+
+        # Years to earn back the down payment: the standby period runs at the
+        # SBA-only cash flow, everything after it at the fully-levered one
+        standby_years = standby / 12
+        earned_in_standby = cf_standby * standby_years
+        payoff = np.where(
+            down <= earned_in_standby,
+            down / cf_standby,
+            standby_years + (down - earned_in_standby) / cf_after,
+        )
+        payoff = np.where((down > 0) & (cf_standby > 0) & ((down <= earned_in_standby) | (cf_after > 0)),
+                          np.round(payoff, 2), np.nan)
+
+        return {
+            "down_payment":        down,
+            "seller_note":         seller_note,
+            "sba_monthly":         monthly,
+            "annual_debt_service": debt,
+            "seller_note_annual":  seller_annual,
+            "cf_during_standby":   cf_standby,
+            "cf_after_debt":       cf_after,
+            "dscr":                np.round(c / (debt + seller_annual), 2),
+            "coc_return":          np.where(down > 0, np.round(cf_after / down, 4), np.nan),
+            "payoff_years":        payoff,
+        }
+
+
+def financial_rows(batch: dict) -> list[dict]:
+    """Per-listing dicts of plain Python floats (None for NaN) from a derive_financials_batch result."""
+    cols = []
+    for arr in batch.values():
+        col = arr.tolist()
+        for i in np.flatnonzero(np.isnan(arr)).tolist():
+            col[i] = None
+        cols.append(col)
+    keys = list(batch)
+    return [dict(zip(keys, vals)) for vals in zip(*cols)]
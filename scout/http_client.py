@@ -0,0 +1,203 @@
+"""
+Shared HTTP client for every scraper.
+
+One keep-alive requests.Session (pooled per host) with compressed transfer
+negotiation, Retry-After-aware exponential backoff with jitter, a per-host
+circuit breaker, and per-host latency/bytes counters. Every request is
+throttled by the host's token bucket from scout.ratelimit.
+
+With an Archive attached every successful page is persisted; with a
+ReplayArchive attached requests are served from disk with no network I/O.
+
+Named http_client rather than http so it can never shadow the stdlib module.
+"""
+import time
+import random
+import threading
+import requests
+import yaml
+from pathlib import Path
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+
+from scout.archive import full_url
+from scout.ratelimit import throttle
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes "br" when available)
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+_BASE = Path(__file__).resolve().parents[1]
+DEFAULT_UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _load_config():
+    return yaml.safe_load((_BASE / "sources.yml").read_text()).get("http", {}) or {}
+
+
+def _retry_after_seconds(value):
+    """Parse a Retry-After header (delta-seconds or HTTP date). None if absent/invalid."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _HostState:
+    __slots__ = ("requests", "errors", "not_modified", "bytes", "latency",
+                 "consecutive_failures", "open_until")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+        self.bytes = 0
+        self.latency = 0.0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+
+class HttpClient:
+    def __init__(self, max_retries=3, timeout=30, breaker_threshold=5, breaker_cooldown=300,
+                 pool_maxsize=8, user_agent=DEFAULT_UA):
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": user_agent, "Accept-Encoding": _ACCEPT_ENCODING})
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self.archive = None   # scout.archive.Archive — record fetched pages
+        self.replay = None    # scout.archive.ReplayArchive — serve pages offline
+
+    def _host(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState()
+            return state
+
+    def _record(self, state, ok):
+        with self._lock:
+            if ok:
+                state.consecutive_failures = 0
+                return
+            state.errors += 1
+            state.consecutive_failures += 1
+            if state.consecutive_failures >= self.breaker_threshold:
+                state.open_until = time.monotonic() + self.breaker_cooldown
+
+    def get(self, url, params=None, headers=None, revalidate=False):
+        """
+        GET with retries. Returns the Response (including 304s), or None on
+        404, exhausted retries, or an open circuit for the host.
+        """
+        if self.replay is not None:
+            return self.replay.response(full_url(url, params))
+
+        host = urlparse(url).netloc
+        state = self._host(host)
+
+        for attempt in range(self.max_retries):
+            if time.monotonic() < state.open_until:
+                print(f"  [{host}] Circuit open, skipping {url}")
+                return None
+
+            throttle(url, revalidate=revalidate)
+            start = time.monotonic()
+            try:
+                r = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                self._record(state, ok=False)
+                if attempt < self.max_retries - 1:
+                    time.sleep(self._backoff(attempt))
+                    continue
+                print(f"  [{host}] Failed after {self.max_retries} retries: {e}")
+                return None
+
+            with self._lock:
+                state.requests += 1
+                state.latency += time.monotonic() - start
+                state.bytes += len(r.content)
+                if r.status_code == 304:
+                    state.not_modified += 1
+
+            if r.status_code in RETRY_STATUSES:
+                self._record(state, ok=False)
+                if attempt < self.max_retries - 1:
+                    wait = _retry_after_seconds(r.headers.get("Retry-After"))
+                    wait = self._backoff(attempt) if wait is None else wait
+                    print(f"  [{host}] HTTP {r.status_code}, waiting {wait:.1f}s...")
+                    time.sleep(wait)
+                    continue
+                print(f"  [{host}] HTTP {r.status_code} after {self.max_retries} retries: {url}")
+                return None
+
+            self._record(state, ok=True)
+            if r.status_code == 404:
+                return None
+            if r.status_code >= 400:
+                print(f"  [{host}] HTTP {r.status_code}: {url}")
+                return None
+            if self.archive is not None and r.status_code == 200:
+                self.archive.record(full_url(url, params), r.content)
+            return r
+        return None
+
+    @staticmethod
+    def _backoff(attempt):
+        """Exponential backoff (2, 4, 8s...) with full jitter on top."""
+        base = 2 ** (attempt + 1)
+        return base + random.uniform(0, base)
+
+    def stats(self) -> dict:
+        """{host: {requests, errors, not_modified, bytes, avg_latency}} for the current process."""
+        with self._lock:
+            return {
+                host: {
+                    "requests":     s.requests,
+                    "errors":       s.errors,
+                    "not_modified": s.not_modified,
+                    "bytes":        s.bytes,
+                    "avg_latency":  round(s.latency / s.requests, 3) if s.requests else None,
+                }
+                for host, s in self._hosts.items()
+            }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def client() -> HttpClient:
+    """The process-wide client, configured from the `http:` block in sources.yml."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(**_load_config())
+        return _client
+
+
+def get(url, params=None, headers=None, revalidate=False):
+    return client().get(url, params=params, headers=headers, revalidate=revalidate)
+
+
+def print_stats():
+    for host, s in client().stats().items():
+        mb = s["bytes"] / 1_000_000
+        print(f"  [{host}] {s['requests']} requests ({s['not_modified']} not modified, "
+              f"{s['errors']} errors), {mb:.1f} MB, avg {s['avg_latency']}s")
@@ -0,0 +1,120 @@
+"""
+Compiled multi-set keyword matching.
+
+Every keyword list the parser, scorer and dashboard classify with is
+registered here under a set name, and all of them are compiled into one
+regex. The keywords form a trie and the trie becomes a nested alternation, so
+the work at each text position follows the trie's depth rather than the
+number of keywords. Wrapping the alternation in a lookahead reports a match at
+every position, overlapping ones included.
+
+At each position the regex yields only the longest keyword starting there.
+Every shorter keyword that also starts there is a prefix of that one, so it is
+added from a precomputed prefix closure. The result is exactly the set of
+keywords for which `kw in text` holds.
+
+Matching is case-sensitive on the text as given. Keyword lists are lowercase,
+and callers lowercase the listing text just as they always did.
+"""
+import re
+import threading
+from functools import lru_cache
+
+
+def _trie_pattern(keywords) -> str:
+    trie = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return _node_pattern(trie)
+
+
+def _node_pattern(node) -> str:
+    branches = [re.escape(ch) + _node_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # Greedy: try to extend to a longer keyword before stopping at this one
+    return f"(?:{body})?" if "" in node else body
+
+
+class KeywordMatcher:
+    """One compiled automaton over named keyword sets."""
+
+    __slots__ = ("_regex", "_closure", "_owners")
+
+    def __init__(self, sets: dict):
+        self._owners = {}   # keyword -> [(set name, position in set)]
+        for name, keywords in sets.items():
+            for i, kw in enumerate(keywords):
+                if kw:
+                    self._owners.setdefault(kw, []).append((name, i))
+        keywords = set(self._owners)
+        self._closure = {
+            kw: tuple(kw[:n] for n in range(1, len(kw) + 1) if kw[:n] in keywords)
+            for kw in keywords
+        }
+        self._regex = re.compile(f"(?=({_trie_pattern(keywords)}))") if keywords else None
+
+    def keywords(self, text: str) -> set:
+        """Every registered keyword occurring anywhere in `text`."""
+        found = set()
+        if self._regex is None or not text:
+            return found
+        for longest in set(self._regex.findall(text)):
+            found.update(self._closure[longest])
+        return found
+
+    def scan(self, text: str) -> dict:
+        """{set name: (matched keywords in set order)} for every set with a match."""
+        hits = {}
+        for kw in self.keywords(text):
+            for name, i in self._owners[kw]:
+                hits.setdefault(name, []).append((i, kw))
+        return {name: tuple(kw for _, kw in sorted(found)) for name, found in hits.items()}
+
+
+_sets = {}
+_matcher = None
+_generation = 0     # bumped by every register(), so cached scans never outlive a rebuild
+_lock = threading.Lock()
+
+
+def register(name: str, keywords):
+    """Add (or replace) a named keyword set; the automaton is rebuilt on next use."""
+    global _matcher, _generation
+    keywords = list(keywords)
+    with _lock:
+        if _sets.get(name) == keywords:
+            return
+        _sets[name] = keywords
+        _matcher = None
+        _generation += 1
+
+
+def matcher() -> KeywordMatcher:
+    global _matcher
+    with _lock:
+        if _matcher is None:
+            _matcher = KeywordMatcher(_sets)
+        return _matcher
+
+
+def generation() -> int:
+    return _generation
+
+
+def scan(text: str) -> dict:
+    """
+    Every registered set matching `text`, from a single pass. Cached by text,
+    so parse, score_listing and profile_score share one scan per listing.
+    Treat the result as read-only.
+    """
+    return _scan(text, _generation)
+
+
+@lru_cache(maxsize=1024)
+def _scan(text, generation):
+    return matcher().scan(text)
@@ -0,0 +1,154 @@
+"""
+Persistent, content-addressed memo of every derived listing field.
+
+Financials, ratios, score_listing, profile_score, the per-profile scores,
+category flags and generate_narrative depend only on a listing's parsed inputs
+(parse.INPUT_FIELDS) and the scoring rules (score.scorer_version). MemoCache
+stores their combined output in the `memo` table of data/scout.db, keyed by a
+hash of both. A listing that was already scored under the current rules is
+looked up instead of recomputed, whether it comes from a fresh scrape, the
+stored catalog or a PDF import.
+
+Inputs are normalized before hashing (numbers as floats, blanks as None), and
+the listings table stores every input field, so a parsed listing and its
+stored CSV-string row share a key. The table is kept to `max_entries` by
+evicting the least recently used entries. Lookups and writes are buffered in
+memory and applied on save().
+"""
+import hashlib
+import json
+import threading
+import time
+
+from scout.categories import category_mask
+from scout.features import _number
+from scout.finance import derive_financials_batch, derive_ratios_batch, financial_rows
+from scout.narrative import generate_narrative
+from scout.parse import INPUT_FIELDS
+from scout.score import score_listing, profile_score, profile_scores, scorer_version
+from scout.storage import connect
+
+MAX_ENTRIES = 100_000
+_NUMERIC_INPUTS = {"asking_price", "annual_cash_flow", "annual_revenue", "employees"}
+
+
+def _normalized(l: dict) -> dict:
+    out = {}
+    for k in INPUT_FIELDS:
+        v = l.get(k)
+        if k in _NUMERIC_INPUTS:
+            v = _number(v)
+        elif v == "":
+            v = None
+        out[k] = v
+    return out
+
+
+def listing_key(l: dict, version: str) -> str:
+    """Content hash of a listing's normalized inputs under scorer `version`."""
+    blob = json.dumps([version, _normalized(l)], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def compute_derived(l: dict) -> dict:
+    """
+    Every derived field for one listing: financials, ratios, score, profile
+    dimensions, the score under each criteria profile, categories, narrative.
+    """
+    asking, cf = [_number(l.get("asking_price"))], [_number(l.get("annual_cash_flow"))]
+    fin = financial_rows(derive_financials_batch(asking, cf))[0]
+    fin.update(financial_rows(derive_ratios_batch(
+        asking, cf, [_number(l.get("annual_revenue"))], [_number(l.get("employees"))]))[0])
+    work = {**l, **fin}
+    scored = score_listing(work)
+    work.update(scored)
+    profile = profile_score(work)
+    work.update(profile)
+    return {**fin, **scored, **profile, "profile_scores": profile_scores(work), "category_mask": category_mask(l),
+            "narrative": generate_narrative(work)}
+
+
+class MemoCache:
+    """LRU-bounded {key: derived fields} table with hit/miss counters."""
+
+    def __init__(self, path=None, max_entries=MAX_ENTRIES):
+        self.conn = connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS memo (
+                key       TEXT PRIMARY KEY,
+                value     TEXT NOT NULL,
+                last_used REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS memo_last_used ON memo(last_used)")
+        self.max_entries = max_entries
+        self.version = scorer_version()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._pending = {}      # key -> value written since the last save()
+        self._touched = {}      # key -> last_used for hits since the last save()
+        self._lock = threading.Lock()
+
+    def key(self, l: dict) -> str:
+        return listing_key(l, self.version)
+
+    def get_many(self, keys) -> dict:
+        """{key: value} for the keys present; counts a hit or miss per key."""
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        with self._lock:
+            found = {k: self._pending[k] for k in keys if k in self._pending}
+            rest = [k for k in keys if k not in found]
+            for i in range(0, len(rest), 500):
+                part = rest[i:i + 500]
+                cur = self.conn.execute(
+                    f"SELECT key, value FROM memo WHERE key IN ({', '.join('?' for _ in part)})", part)
+                found.update((r["key"], json.loads(r["value"])) for r in cur)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            self._touched.update(dict.fromkeys(found, now))
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: dict):
+        with self._lock:
+            self._pending.update(items)
+
+    def put(self, key, value: dict):
+        self.put_many({key: value})
+
+    def derive(self, l: dict) -> dict:
+        """The listing's derived fields, from the memo when present, otherwise computed and stored."""
+        key = self.key(l)
+        derived = self.get(key)
+        if derived is None:
+            derived = compute_derived(l)
+            self.put(key, derived)
+        return derived
+
+    def save(self):
+        """Write buffered entries and LRU touches, then evict down to max_entries."""
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO memo (key, value, last_used) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, last_used = excluded.last_used",
+                [(k, json.dumps(v, default=str), now) for k, v in self._pending.items()],
+            )
+            self.conn.executemany("UPDATE memo SET last_used = ? WHERE key = ?",
+                                  [(t, k) for k, t in self._touched.items() if k not in self._pending])
+            excess = self.conn.execute("SELECT COUNT(*) FROM memo").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.conn.execute("DELETE FROM memo WHERE key IN "
+                                  "(SELECT key FROM memo ORDER BY last_used LIMIT ?)", (excess,))
+                self.evicted += excess
+            self._pending.clear()
+            self._touched.clear()
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = f" ({self.hits / total:.0%} hit rate)" if total else ""
+        return f"{self.hits} hits, {self.misses} misses{rate}, {self.evicted} evicted"
@@ -1,3 +1,6 @@
+from scout.features import features_of
+
+
 def generate_narrative(listing: dict) -> str:
     """
     Generate a plain-English deal narrative from scored listing data.
@@ -6,13 +9,14 @@ def generate_narrative(listing: dict) -> str:
     title    = listing.get("title", "This business")
     industry = listing.get("industry", "")
     location = listing.get("location", "")
-    asking   = listing.get("asking_price")
-    cf       = listing.get("annual_cash_flow")
-    rev      = listing.get("annual_revenue")
+    f        = features_of(listing)
+    asking   = f.asking
+    cf       = f.cash_flow
+    rev      = f.revenue
     score    = listing.get("score", 0)
     bucket   = listing.get("bucket", "")
     absentee = listing.get("absentee", "No")
-    employees = listing.get("employees")
+    employees = f.employees
     dscr20   = listing.get("dscr_20pct")
     coc20    = listing.get("coc_return_20pct")
     cf20     = listing.get("cf_after_debt_20pct")
@@ -1,4 +1,11 @@
 import re
+import json
+import hashlib
+
+from scout import keywords
+from scout.features import ListingFeatures
+from scout.finance import derive_financials_batch, financial_rows
+from scout.records import Listing, ListingBatch
 
 TRADES_KEYWORDS = [
     "plumb", "electrician", "electrical", "electric",
@@ -35,170 +42,105 @@ HEALTHCARE_KEYWORDS = [
     "health care", "healthcare",
 ]
 
+keywords.register("parse.trades", TRADES_KEYWORDS)
+keywords.register("parse.healthcare", HEALTHCARE_KEYWORDS)
 
-def _detect_trades(ctx: str) -> bool:
-    lctx = ctx.lower()
-    return any(kw in lctx for kw in TRADES_KEYWORDS)
 
+# Parsed fields that feed scoring; financials are derived from these
+INPUT_FIELDS = [
+    "title", "url", "industry", "location",
+    "asking_price", "annual_cash_flow", "annual_revenue", "employees",
+    "description", "years_in_business", "is_franchise", "reason_for_selling",
+    "sba_available", "real_estate", "listing_agent", "absentee_owner_field",
+]
 
-def _detect_healthcare(ctx: str) -> bool:
-    lctx = ctx.lower()
-    return any(kw in lctx for kw in HEALTHCARE_KEYWORDS)
 
+def input_hash(listing: dict) -> str:
+    """Stable hash of a listing's normalized parse output."""
+    blob = json.dumps(input_fields(listing), sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
 
-def parse_listings(raw_listings: list[dict]) -> list[dict]:
-    """Normalize raw scraped dicts into scored-ready format with SBA financials."""
-    out = {}
 
-    for item in raw_listings:
-        lid = item.get("id_number", "")
-        if not lid:
-            continue
-
-        asking = _parse_dollar(item.get("asking_price_text"))
-        annual_cf = _parse_dollar(item.get("cash_flow_text"))
-        annual_rev = _parse_dollar(item.get("revenue_text"))
-        employees_ft = _to_int(item.get("employees_ft"))
-        employees_pt = _to_int(item.get("employees_pt"))
-        employees = None
-        if employees_ft is not None:
-            employees = employees_ft + (employees_pt or 0)
-
-        # Derive SBA financials for both 10% and 20% down scenarios
-        financials = _derive_financials(asking, annual_cf)
-
-        ctx = f"{item.get('title', '')} {item.get('description', '')} {item.get('industry', '')}"
-        is_trades = _detect_trades(ctx)
-        is_healthcare = _detect_healthcare(ctx)
-
-        out[lid] = {
-            "id": lid,
-            "title": (item.get("title") or "")[:200],
-            "url": item.get("detail_url", ""),
-            "industry": item.get("industry", ""),
-            "is_trades": is_trades,
-            "is_healthcare": is_healthcare,
-            "location": item.get("location", ""),
-            "asking_price": asking,
-            "asking_price_text": _format_price(asking),
-            "annual_cash_flow": annual_cf,
-            "annual_revenue": annual_rev,
-            "employees": employees,
-            "description": (item.get("description") or "")[:2000],
-            "years_in_business": item.get("years_in_business", ""),
-            "is_franchise": item.get("is_franchise", ""),
-            "reason_for_selling": item.get("reason_for_selling", ""),
-            "sba_available": item.get("sba_available", ""),
-            "real_estate": item.get("real_estate", ""),
-            "listing_agent": item.get("listing_agent", ""),
-            "absentee_owner_field": item.get("absentee_owner_field", ""),
-            **financials,
-        }
-
-    return list(out.values())
+def input_fields(listing: dict) -> dict:
+    return {k: listing.get(k) for k in INPUT_FIELDS}
 
 
-def _derive_financials(asking, annual_cf):
-    """Derive all SBA modeling fields for 10% and 20% down scenarios, plus seller financing."""
-    result = {
-        "down_10": None, "down_20": None,
-        "sba_loan_90": None, "sba_loan_80": None,
-        "sba_monthly_10pct": None, "sba_monthly_20pct": None,
-        "annual_debt_service_10pct": None, "annual_debt_service_20pct": None,
-        "cf_after_debt_10pct": None, "cf_after_debt_20pct": None,
-        "coc_return_10pct": None, "coc_return_20pct": None,
-        "dscr_10pct": None, "dscr_20pct": None,
-        "payoff_years_10pct": None, "payoff_years_20pct": None,
-        # Seller financing scenario (seller carries 10% note, buyer puts $0 down)
-        "seller_note_amount": None,
-        "seller_note_monthly": None,
-        "seller_note_annual": None,
-        "cf_during_standby": None,       # Years 1-2: only SBA payment (seller note on standby)
-        "cf_after_seller_financing": None, # Years 3+: SBA + seller note payments
-        "dscr_seller_financed": None,     # DSCR after both payments (years 3+)
-    }
-
-    if not asking or asking <= 0:
-        return result
-
-    down_10 = round(asking * 0.10, 2)
-    down_20 = round(asking * 0.20, 2)
-    loan_90 = round(asking * 0.90, 2)
-    loan_80 = round(asking * 0.80, 2)
-
-    monthly_10 = _sba_payment(loan_90)
-    monthly_20 = _sba_payment(loan_80)
-
-    result["down_10"] = down_10
-    result["down_20"] = down_20
-    result["sba_loan_90"] = loan_90
-    result["sba_loan_80"] = loan_80
-    result["sba_monthly_10pct"] = monthly_10
-    result["sba_monthly_20pct"] = monthly_20
-
-    if monthly_10:
-        result["annual_debt_service_10pct"] = round(monthly_10 * 12, 2)
-    if monthly_20:
-        result["annual_debt_service_20pct"] = round(monthly_20 * 12, 2)
-
-    if annual_cf is not None and annual_cf > 0:
-        if result["annual_debt_service_10pct"]:
-            cf_after_10 = round(annual_cf - result["annual_debt_service_10pct"], 2)
-            result["cf_after_debt_10pct"] = cf_after_10
-            result["dscr_10pct"] = round(annual_cf / result["annual_debt_service_10pct"], 2)
-            if down_10 > 0:
-                result["coc_return_10pct"] = round(cf_after_10 / down_10, 4)
-            if cf_after_10 > 0 and down_10 > 0:
-                result["payoff_years_10pct"] = round(down_10 / cf_after_10, 2)
-
-        if result["annual_debt_service_20pct"]:
-            cf_after_20 = round(annual_cf - result["annual_debt_service_20pct"], 2)
-            result["cf_after_debt_20pct"] = cf_after_20
-            result["dscr_20pct"] = round(annual_cf / result["annual_debt_service_20pct"], 2)
-            if down_20 > 0:
-                result["coc_return_20pct"] = round(cf_after_20 / down_20, 4)
-            if cf_after_20 > 0 and down_20 > 0:
-                result["payoff_years_20pct"] = round(down_20 / cf_after_20, 2)
-
-        # Seller financing scenario:
-        # SBA covers 90%, seller carries 10% note at 6% / 5 years, 24-month standby
-        seller_note = round(asking * 0.10, 2)
-        seller_monthly = _loan_payment(seller_note, annual_rate=0.06, years=5)
-        seller_annual = round(seller_monthly * 12, 2) if seller_monthly else None
-        result["seller_note_amount"] = seller_note
-        result["seller_note_monthly"] = seller_monthly
-        result["seller_note_annual"] = seller_annual
-
-        if result["annual_debt_service_10pct"]:
-            # Years 1-2: seller note on standby, only SBA payment
-            result["cf_during_standby"] = round(annual_cf - result["annual_debt_service_10pct"], 2)
-            # Years 3+: both SBA + seller note
-            if seller_annual:
-                total_debt = result["annual_debt_service_10pct"] + seller_annual
-                result["cf_after_seller_financing"] = round(annual_cf - total_debt, 2)
-                result["dscr_seller_financed"] = round(annual_cf / total_debt, 2)
-
-    return result
-
-
-def _loan_payment(principal, annual_rate=0.06, years=5):
-    """Monthly payment for any amortizing loan."""
-    if not principal or principal <= 0:
-        return None
-    r = annual_rate / 12
-    n = years * 12
-    payment = principal * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
-    return round(payment, 2)
+def diff_inputs(old: dict | None, new: dict) -> dict:
+    """{field: (old, new)} for every input field whose value changed."""
+    old = old or {}
+    return {k: (old.get(k), new.get(k)) for k in INPUT_FIELDS if old.get(k) != new.get(k)}
+
 
+def parse_listing(item: dict) -> Listing | None:
+    """Normalize one raw scraped dict into scored-ready format with SBA financials."""
+    parsed = _parse_fields(item)
+    if parsed is not None:
+        parsed.update(_derive_financials(parsed["asking_price"], parsed["annual_cash_flow"]))
+    return parsed
 
-def _sba_payment(principal, annual_rate=0.10, years=10):
-    """Monthly payment for SBA loan: 10% interest, 10-year amortization."""
-    if not principal or principal <= 0:
+
+def _parse_fields(item: dict) -> Listing | None:
+    lid = item.get("id_number", "")
+    if not lid:
         return None
-    r = annual_rate / 12
-    n = years * 12
-    payment = principal * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
-    return round(payment, 2)
+
+    asking = _parse_dollar(item.get("asking_price_text"))
+    annual_cf = _parse_dollar(item.get("cash_flow_text"))
+    annual_rev = _parse_dollar(item.get("revenue_text"))
+    employees_ft = _to_int(item.get("employees_ft"))
+    employees_pt = _to_int(item.get("employees_pt"))
+    employees = None
+    if employees_ft is not None:
+        employees = employees_ft + (employees_pt or 0)
+
+    listing = Listing(
+        id=lid,
+        title=(item.get("title") or "")[:200],
+        url=item.get("detail_url", ""),
+        industry=item.get("industry", ""),
+        location=item.get("location", ""),
+        asking_price=asking,
+        asking_price_text=_format_price(asking),
+        annual_cash_flow=annual_cf,
+        annual_revenue=annual_rev,
+        employees=employees,
+        description=(item.get("description") or "")[:2000],
+        years_in_business=item.get("years_in_business", ""),
+        is_franchise=item.get("is_franchise", ""),
+        reason_for_selling=item.get("reason_for_selling", ""),
+        sba_available=item.get("sba_available", ""),
+        real_estate=item.get("real_estate", ""),
+        listing_agent=item.get("listing_agent", ""),
+        absentee_owner_field=item.get("absentee_owner_field", ""),
+    )
+    # Built once here; scoring, profiling and the narrative all read from it
+    features = listing["features"] = ListingFeatures.from_listing(listing)
+    listing["is_trades"] = features.has("parse.trades")
+    listing["is_healthcare"] = features.has("parse.healthcare")
+    return listing
+
+
+def parse_listings(raw_listings: list[dict]) -> ListingBatch:
+    """
+    Normalize a batch of raw scraped dicts, de-duplicated by listing ID, into a
+    columnar ListingBatch, with the SBA financials for the whole batch derived
+    in one vectorized pass straight into its numeric columns.
+    """
+    out = {}
+    for item in raw_listings:
+        parsed = _parse_fields(item)
+        if parsed is not None:
+            out[parsed["id"]] = parsed
+    batch = ListingBatch(out.values())
+    financials = derive_financials_batch(batch.column("asking_price"), batch.column("annual_cash_flow"))
+    for field, values in financials.items():
+        batch.set_column(field, values)
+    return batch
+
+
+def _derive_financials(asking, annual_cf):
+    """Derive all SBA modeling fields for 10% and 20% down scenarios, plus seller financing."""
+    return financial_rows(derive_financials_batch([asking], [annual_cf]))[0]
 
 
 def _parse_dollar(text):
@@ -0,0 +1,74 @@
+"""
+Per-host token-bucket rate limiting shared by every scraper thread.
+
+Limits are configured per host under `rate_limits:` in sources.yml. All
+workers hitting the same host draw from one bucket, so adding workers
+overlaps network latency without raising the requests-per-second ceiling.
+"""
+import time
+import threading
+import yaml
+from pathlib import Path
+from urllib.parse import urlparse
+
+_BASE = Path(__file__).resolve().parents[1]
+DEFAULT_RATE = 0.5   # requests/second for hosts without an explicit entry
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+_config_cache = None
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens/second, holding at most `capacity`."""
+
+    def __init__(self, rate, capacity=1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost=1.0):
+        """Block until `cost` tokens are available, then take them."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return
+                wait = (cost - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _load_config():
+    global _config_cache
+    if _config_cache is None:
+        _config_cache = yaml.safe_load((_BASE / "sources.yml").read_text()).get("rate_limits", {})
+    return _config_cache
+
+
+def host_limits(url: str) -> dict:
+    """The sources.yml rate_limits entry for a URL's host (empty dict if none)."""
+    return _load_config().get(urlparse(url).netloc, {}) or {}
+
+
+def host_bucket(url: str) -> TokenBucket:
+    """Return the shared bucket for a URL's host, creating it on first use."""
+    host = urlparse(url).netloc
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            limits = host_limits(url)
+            bucket = TokenBucket(limits.get("requests_per_second", DEFAULT_RATE),
+                                 limits.get("burst", 1.0))
+            _buckets[host] = bucket
+    return bucket
+
+
+def throttle(url: str, revalidate=False):
+    """Wait for the host's bucket. Conditional revalidations cost `revalidate_cost` tokens."""
+    cost = host_limits(url).get("revalidate_cost", 1.0) if revalidate else 1.0
+    host_bucket(url).acquire(cost)
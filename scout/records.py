@@ -0,0 +1,218 @@
+"""
+Listing schema and compact in-memory representations.
+
+Listing is a slotted record with a dict-style interface (get/[]/update/in),
+so the pipeline code that treats listings as dicts keeps working. It stores
+the ~60 fields without a per-listing hash table.
+
+ListingBatch holds many listings column-wise. Numeric columns are array('d'),
+with NaN standing for missing. Low-cardinality strings (industry, location,
+agent, bucket, ...) are interned, so each distinct value exists once. Rows
+come back out as Listing records, and whole columns come back out as NumPy
+views.
+"""
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+import numpy as np
+
+# Stored / exported columns, in CSV order
+FIELDNAMES = [
+    "id", "title", "url", "industry", "location",
+    "asking_price", "asking_price_text",
+    "annual_cash_flow", "annual_revenue", "employees",
+    "down_10", "sba_monthly_10pct", "annual_debt_service_10pct",
+    "cf_after_debt_10pct", "coc_return_10pct", "dscr_10pct", "payoff_years_10pct",
+    "down_20", "sba_monthly_20pct", "annual_debt_service_20pct",
+    "cf_after_debt_20pct", "coc_return_20pct", "dscr_20pct", "payoff_years_20pct",
+    "seller_note_amount", "seller_note_monthly", "seller_note_annual",
+    "cf_during_standby", "cf_after_seller_financing", "dscr_seller_financed",
+    "revenue_multiple", "sde_margin", "revenue_per_employee",
+    "score", "bucket", "absentee", "reasons", "is_trades", "category_mask",
+    "years_in_business", "is_franchise", "reason_for_selling",
+    "sba_available", "real_estate", "absentee_owner_field", "listing_agent", "narrative", "description",
+    "dim_ai_proof", "dim_fun", "dim_weather", "dim_labor",
+    "dim_recurring", "dim_absentee", "dim_capital_light", "dim_scalable",
+    "score_financial", "score_operations", "score_tech",
+    "score_recurring", "score_durability", "score_geography",
+    "last_seen", "is_active", "source", "has_pdf",
+]
+
+REAL_FIELDS = {
+    "asking_price", "annual_cash_flow", "annual_revenue",
+    "down_10", "sba_monthly_10pct", "annual_debt_service_10pct",
+    "cf_after_debt_10pct", "coc_return_10pct", "dscr_10pct", "payoff_years_10pct",
+    "down_20", "sba_monthly_20pct", "annual_debt_service_20pct",
+    "cf_after_debt_20pct", "coc_return_20pct", "dscr_20pct", "payoff_years_20pct",
+    "seller_note_amount", "seller_note_monthly", "seller_note_annual",
+    "cf_during_standby", "cf_after_seller_financing", "dscr_seller_financed",
+    "sba_loan_90", "sba_loan_80",
+    "revenue_multiple", "sde_margin", "revenue_per_employee",
+}
+INT_FIELDS = {
+    "employees", "score", "category_mask",
+    "dim_ai_proof", "dim_fun", "dim_weather", "dim_labor",
+    "dim_recurring", "dim_absentee", "dim_capital_light", "dim_scalable",
+    "score_financial", "score_operations", "score_tech",
+    "score_recurring", "score_durability", "score_geography",
+}
+BOOL_FIELDS = {"is_trades", "is_healthcare"}
+# Repeated across many listings; interned so each distinct value is stored once
+CATEGORICAL_FIELDS = {
+    "industry", "location", "listing_agent", "bucket", "absentee", "source",
+    "is_franchise", "sba_available", "real_estate", "years_in_business",
+    "absentee_owner_field", "is_active", "has_pdf",
+}
+
+# Pipeline-only fields: parse extras, the change diff, per-profile scores and the feature record
+EXTRA_FIELDS = [
+    "is_healthcare", "sba_loan_90", "sba_loan_80", "changes", "profile_scores", "features",
+]
+LISTING_FIELDS = FIELDNAMES + EXTRA_FIELDS
+_FIELD_SET = frozenset(LISTING_FIELDS)
+
+
+class Listing(MutableMapping):
+    """One listing. Unset fields behave like missing dict keys."""
+
+    __slots__ = tuple(LISTING_FIELDS)
+
+    def __init__(self, fields=None, **kwargs):
+        if fields:
+            self.update(fields)
+        if kwargs:
+            self.update(kwargs)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in _FIELD_SET:
+            raise KeyError(f"Listing has no field {key!r}")
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        try:
+            delattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in _FIELD_SET and hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in _FIELD_SET else default
+
+    def __iter__(self):
+        return (k for k in LISTING_FIELDS if hasattr(self, k))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Listing(id={self.get('id')!r}, title={self.get('title')!r})"
+
+
+class ListingBatch:
+    """Column-oriented container for many listings (see module docstring)."""
+
+    __slots__ = ("_columns", "_size")
+
+    def __init__(self, listings=()):
+        self._columns = {}
+        self._size = 0
+        self.extend(listings)
+
+    def _column(self, field):
+        col = self._columns.get(field)
+        if col is None:
+            if field in REAL_FIELDS or field in INT_FIELDS:
+                col = array("d", [np.nan]) * self._size
+            elif field in BOOL_FIELDS:
+                col = array("b", [-1]) * self._size
+            else:
+                col = [None] * self._size
+            self._columns[field] = col
+        return col
+
+    def append(self, listing):
+        n = self._size
+        for field in LISTING_FIELDS:
+            if field == "features":
+                continue    # derived; rebuilt on demand by features_of()
+            value = listing.get(field)
+            if value is None and field not in self._columns:
+                continue
+            col = self._column(field)
+            if field in REAL_FIELDS or field in INT_FIELDS:
+                col.append(np.nan if value is None else float(value))
+            elif field in BOOL_FIELDS:
+                col.append(-1 if value is None else int(bool(value)))
+            elif field in CATEGORICAL_FIELDS and isinstance(value, str):
+                col.append(sys.intern(value))
+            else:
+                col.append(value)
+        # Columns this listing did not touch
+        for col in self._columns.values():
+            if len(col) == n:
+                col.append(np.nan if isinstance(col, array) and col.typecode == "d"
+                           else -1 if isinstance(col, array) else None)
+        self._size = n + 1
+
+    def extend(self, listings):
+        for l in listings:
+            self.append(l)
+
+    def __len__(self):
+        return self._size
+
+    def _value(self, field, i):
+        v = self._columns[field][i]
+        if field in REAL_FIELDS:
+            return None if v != v else v
+        if field in INT_FIELDS:
+            return None if v != v else int(v)
+        if field in BOOL_FIELDS:
+            return None if v < 0 else bool(v)
+        return v
+
+    def __getitem__(self, i) -> Listing:
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        row = Listing()
+        for field in self._columns:
+            value = self._value(field, i)
+            if value is not None:
+                setattr(row, field, value)
+        return row
+
+    def __iter__(self):
+        return (self[i] for i in range(self._size))
+
+    def column(self, field) -> np.ndarray:
+        """A numeric column as a float64 NumPy view (NaN = missing), or a list for other columns."""
+        col = self._column(field)
+        if isinstance(col, array) and col.typecode == "d":
+            return np.frombuffer(col, dtype=float) if self._size else np.empty(0)
+        return col
+
+    def set_column(self, field, values):
+        """Replace a whole column, e.g. with a derive_financials_batch result."""
+        if len(values) != self._size:
+            raise ValueError(f"{field}: expected {self._size} values, got {len(values)}")
+        if field in REAL_FIELDS or field in INT_FIELDS:
+            self._columns[field] = array("d", np.asarray(values, dtype=float).tobytes())
+        else:
+            self._columns[field] = list(values)
+
+    def values(self, field) -> list:
+        """Column as Python values (None for missing), the way a Listing would return them."""
+        if field not in self._columns:
+            return [None] * self._size
+        return [self._value(field, i) for i in range(self._size)]
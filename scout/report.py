@@ -14,11 +14,12 @@ def write_report(rows: list[dict]):
     review = sorted([r for r in rows if r.get("bucket") == "REVIEW"],
                     key=lambda x: x.get("score", 0), reverse=True)
     rejected = [r for r in rows if r.get("bucket") == "AUTO-REJECT"]
+    changed = [r for r in rows if "changes" in r]
 
     lines = [
         f"# Sunbelt Scout — {day}",
         "",
-        f"New listings processed: **{len(rows)}**",
+        f"New listings processed: **{len(rows) - len(changed)}** | Changed listings rescored: **{len(changed)}**",
         f"Shortlisted: **{len(shortlist)}** | Review: **{len(review)}** | Auto-Rejected: **{len(rejected)}**",
         "",
     ]
@@ -54,6 +55,26 @@ def write_report(rows: list[dict]):
             "",
         ]
 
+    lines.append("## CHANGES")
+    if not changed:
+        lines.append("_None today._")
+    for r in changed:
+        diffs = []
+        for field, (old, new) in r["changes"].items():
+            if field in ("asking_price", "annual_cash_flow", "annual_revenue") and old is not None and new is not None:
+                pct = f" ({(new - old) / old:+.0%})" if old else ""
+                diffs.append(f"{field} ${old:,.0f} → ${new:,.0f}{pct}")
+            elif field != "description":
+                diffs.append(f"{field}: {old or '—'} → {new or '—'}")
+            else:
+                diffs.append("description updated")
+        lines += [
+            f"- **{r.get('title', 'Untitled')}** (score {r.get('score', 0)}, {r.get('bucket', '')})",
+            f"  {'; '.join(diffs) or 're-baselined'}",
+            f"  {r.get('url', '')}",
+            "",
+        ]
+
     lines.append(f"## AUTO-REJECTED ({len(rejected)})")
     for r in rejected[:10]:
         lines += [
@@ -1,42 +1,176 @@
-import yaml
+import hashlib
 from pathlib import Path
 
+import numpy as np
+import yaml
+
+from scout import finance, keywords
+from scout.features import features_of, _number
+from scout.records import ListingBatch
+
 _criteria_cache = None
 
+HEAVY_WORDS = ["heavy inventory", "warehouse", "large inventory", "extensive inventory"]
+SIMPLE_WORDS = ["simple", "straightforward", "easy to run", "turnkey", "well-established"]
+
+keywords.register("score.heavy", HEAVY_WORDS)
+keywords.register("score.simple", SIMPLE_WORDS)
+
+# Stored component column -> its `weights:` key in criteria.yml; score is their sum
+SCORE_COMPONENTS = {
+    "score_financial":  "financial_strength",
+    "score_operations": "operational_simplicity",
+    "score_tech":       "tech_deficiency",
+    "score_recurring":  "recurring_revenue",
+    "score_durability": "industry_durability",
+    "score_geography":  "geographic_fit",
+}
+
+
+# Criteria keyword lists: set key -> path in the criteria file
+_CRITERIA_SETS = {
+    "regulated":         ("no_go", "regulated_keywords"),
+    "digital":           ("no_go", "digital_keywords"),
+    "absentee_likely":   ("absentee_signals", "likely"),
+    "absentee_possible": ("absentee_signals", "possible"),
+    "tech":              ("tech_deficiency_signals",),
+    "recurring":         ("recurring_revenue_signals",),
+    "durable":           ("durable_industries",),
+    "twin_cities":       ("twin_cities_signals",),
+}
+
+PROFILES_DIR = Path(__file__).resolve().parents[1] / "profiles"
+_profile_cache = {}
+_profile_names = None
+
+
+def _sets(profile=None) -> dict:
+    """{set key: registered keyword set name} for criteria.yml (None) or a named profile."""
+    prefix = "criteria" if profile is None else f"criteria.{profile}"
+    return {key: f"{prefix}.{key}" for key in _CRITERIA_SETS}
+
+
+def _register_criteria(c: dict, profile=None):
+    for key, name in _sets(profile).items():
+        lists = c
+        for part in _CRITERIA_SETS[key]:
+            lists = lists[part]
+        keywords.register(name, lists)
+
 
 def _load_criteria():
-    global _criteria_cache
     if _criteria_cache is None:
         base = Path(__file__).resolve().parents[1]
-        _criteria_cache = yaml.safe_load((base / "criteria.yml").read_text())
+        use_criteria(base / "criteria.yml")
+        # Registered up front so a listing's single keyword scan covers every profile
+        _load_profiles()
     return _criteria_cache
 
 
-def _detect_absentee(ctx: str, c: dict) -> str:
-    """Scan text for absentee ownership signals."""
-    for signal in c["absentee_signals"]["likely"]:
-        if signal in ctx:
-            return "Likely"
-    for signal in c["absentee_signals"]["possible"]:
-        if signal in ctx:
-            return "Possible"
+def use_criteria(path) -> dict:
+    """
+    Score with the criteria file at `path` from now on (this process only),
+    registering its keyword lists and SBA terms in place of criteria.yml's.
+    Used to evaluate candidate criteria; scorer_version() still describes
+    criteria.yml, so don't mix this with the memo.
+    """
+    global _criteria_cache
+    c = yaml.safe_load(Path(path).read_text())
+    _register_criteria(c)
+    finance.use_sba(c.get("sba"))
+    _criteria_cache = c
+    _profile_cache.clear()
+    return c
+
+
+def criteria_profiles() -> list[str]:
+    """Names of the extra criteria profiles in profiles/*.yml, scored alongside criteria.yml (listed once per process)."""
+    global _profile_names
+    if _profile_names is None:
+        _profile_names = sorted(p.stem for p in PROFILES_DIR.glob("*.yml")) if PROFILES_DIR.is_dir() else []
+    return _profile_names
+
+
+def _merged(base: dict, override: dict) -> dict:
+    out = dict(base)
+    for k, v in override.items():
+        out[k] = _merged(base[k], v) if isinstance(v, dict) and isinstance(base.get(k), dict) else v
+    return out
+
+
+def _criteria(profile=None) -> dict:
+    """criteria.yml, or a named profile: profiles/<name>.yml merged over criteria.yml."""
+    if profile is None:
+        return _load_criteria()
+    c = _profile_cache.get(profile)
+    if c is None:
+        override = yaml.safe_load((PROFILES_DIR / f"{profile}.yml").read_text()) or {}
+        c = _merged(_load_criteria(), override)
+        _register_criteria(c, profile)
+        _profile_cache[profile] = c
+    return c
+
+
+def _load_profiles():
+    """Register every profile's keyword sets, so one scan per listing serves them all."""
+    _load_criteria()
+    for name in criteria_profiles():
+        _criteria(name)
+
+
+# Everything the stored scores are a function of, besides the listing itself
+_SCORER_FILES = [
+    "criteria.yml", "scout/score.py", "scout/finance.py", "scout/features.py",
+    "scout/keywords.py", "scout/narrative.py", "scout/categories.py", "scout/memo.py", "scout/parse.py",
+]
+
+
+def scorer_version() -> str:
+    """
+    Fingerprint of the scoring rules: criteria.yml, profiles/*.yml and the
+    scorer, financial model, keyword and narrative code (which holds the
+    in-code keyword lists).
+    Any edit changes it, so stored rows scored under other rules can be told
+    apart.
+    """
+    base = Path(__file__).resolve().parents[1]
+    h = hashlib.sha256()
+    profiles = [f"profiles/{name}.yml" for name in criteria_profiles()]
+    for name in _SCORER_FILES + profiles:
+        h.update(name.encode())
+        h.update((base / name).read_bytes())
+    return h.hexdigest()[:16]
+
+
+def _detect_absentee(hits: dict, sets: dict) -> str:
+    """Absentee ownership signals from a keyword scan of the listing text."""
+    if sets["absentee_likely"] in hits:
+        return "Likely"
+    if sets["absentee_possible"] in hits:
+        return "Possible"
     return "No"
 
 
-def score_listing(l: dict) -> dict:
+def _reject(reason, absentee) -> dict:
+    return {"score": 0, "bucket": "AUTO-REJECT", "reasons": [reason], "absentee": absentee,
+            **dict.fromkeys(SCORE_COMPONENTS, 0)}
+
+
+def score_listing(l: dict, profile=None) -> dict:
     """
-    Score a listing 0-100. Returns dict with score, bucket, reasons, absentee.
+    Score a listing 0-100 under criteria.yml, or under the named profile from
+    profiles/. Returns dict with score, bucket, reasons, absentee and the
+    points behind the score, one SCORE_COMPONENTS column per category.
     """
-    c = _load_criteria()
+    c = _criteria(profile)
+    ks = _sets(profile)
 
-    title = (l.get("title") or "").lower()
-    description = (l.get("description") or "").lower()
-    industry = (l.get("industry") or "").lower()
-    location = (l.get("location") or "").lower()
-    ctx = f"{title} {description} {industry}"
+    f = features_of(l)
+    hits = f.hits
+    location = f.location
 
-    asking = l.get("asking_price")
-    annual_cf = l.get("annual_cash_flow")
+    asking = f.asking
+    annual_cf = f.cash_flow
     dscr_20 = l.get("dscr_20pct")
     cf_after_20 = l.get("cf_after_debt_20pct")
 
@@ -45,49 +179,48 @@ def score_listing(l: dict) -> dict:
     if absentee_field == "yes":
         absentee = "Likely"
     else:
-        absentee = _detect_absentee(ctx, c)
+        absentee = _detect_absentee(hits, ks)
 
     # --- AUTO-REJECT checks ---
 
     # Missing financials
     if asking is None and annual_cf is None:
-        return {"score": 0, "bucket": "AUTO-REJECT", "reasons": ["missing financials"], "absentee": absentee}
+        return _reject("missing financials", absentee)
 
     # Out of price range
     if asking is not None:
         if asking < c["budget"]["min_asking_price"]:
-            return {"score": 0, "bucket": "AUTO-REJECT", "reasons": [f"under min price ${asking:,.0f}"], "absentee": absentee}
+            return _reject(f"under min price ${asking:,.0f}", absentee)
         if asking > c["budget"]["max_asking_price"]:
-            return {"score": 0, "bucket": "AUTO-REJECT", "reasons": [f"over max price ${asking:,.0f}"], "absentee": absentee}
+            return _reject(f"over max price ${asking:,.0f}", absentee)
 
     # No cash flow data
     if annual_cf is None:
-        return {"score": 0, "bucket": "AUTO-REJECT", "reasons": ["no cash flow data"], "absentee": absentee}
+        return _reject("no cash flow data", absentee)
 
     # DSCR too low
     if dscr_20 is not None and dscr_20 < c["targets"]["min_dscr"]:
-        return {"score": 0, "bucket": "AUTO-REJECT", "reasons": [f"DSCR {dscr_20:.2f} below {c['targets']['min_dscr']}"], "absentee": absentee}
+        return _reject(f"DSCR {dscr_20:.2f} below {c['targets']['min_dscr']}", absentee)
 
     # Negative cash flow after debt
     if cf_after_20 is not None and cf_after_20 < 0:
-        return {"score": 0, "bucket": "AUTO-REJECT", "reasons": [f"negative CF after debt ${cf_after_20:,.0f}"], "absentee": absentee}
+        return _reject(f"negative CF after debt ${cf_after_20:,.0f}", absentee)
 
     # Not Minnesota
     if location and "minnesota" not in location:
-        return {"score": 0, "bucket": "AUTO-REJECT", "reasons": [f"not Minnesota: {l.get('location', '')}"], "absentee": absentee}
+        return _reject(f"not Minnesota: {l.get('location', '')}", absentee)
 
-    # Regulated keywords
-    for kw in c["no_go"]["regulated_keywords"]:
-        if kw in ctx:
-            return {"score": 0, "bucket": "AUTO-REJECT", "reasons": [f"regulated: {kw}"], "absentee": absentee}
+    # Regulated keywords (first in list order)
+    if ks["regulated"] in hits:
+        kw = hits[ks["regulated"]][0]
+        return _reject(f"regulated: {kw}", absentee)
 
     # Digital keywords
-    for kw in c["no_go"]["digital_keywords"]:
-        if kw in ctx:
-            return {"score": 0, "bucket": "AUTO-REJECT", "reasons": [f"digital/online: {kw}"], "absentee": absentee}
+    if ks["digital"] in hits:
+        kw = hits[ks["digital"]][0]
+        return _reject(f"digital/online: {kw}", absentee)
 
     # --- SCORING ---
-    score = 0
     reasons = []
     w = c["weights"]
 
@@ -131,11 +264,11 @@ def score_listing(l: dict) -> dict:
             fin_score += 2
             reasons.append(f"CoC {coc_20:.0%}")
 
-    score += min(fin_score, w["financial_strength"])
+    points = {"score_financial": min(fin_score, w["financial_strength"])}
 
     # B. Operational Simplicity (15 pts max)
     ops_score = 0
-    employees = l.get("employees")
+    employees = f.employees
     if employees is not None:
         if employees < 20:
             ops_score += 8
@@ -146,56 +279,49 @@ def score_listing(l: dict) -> dict:
         else:
             reasons.append(f"large team: {employees}")
 
-    heavy_words = ["heavy inventory", "warehouse", "large inventory", "extensive inventory"]
-    if not any(hw in ctx for hw in heavy_words):
+    if "score.heavy" not in hits:
         ops_score += 4
         reasons.append("no heavy inventory")
 
-    simple_words = ["simple", "straightforward", "easy to run", "turnkey", "well-established"]
-    if any(sw in ctx for sw in simple_words):
+    if "score.simple" in hits:
         ops_score += 3
         reasons.append("operationally simple")
 
-    score += min(ops_score, w["operational_simplicity"])
+    points["score_operations"] = min(ops_score, w["operational_simplicity"])
 
     # C. Tech Deficiency Opportunity (15 pts max)
-    tech_score = 0
-    for signal in c["tech_deficiency_signals"]:
-        if signal in ctx:
-            tech_score += 3
+    tech_score = 3 * len(hits.get(ks["tech"], ()))
     if tech_score > 0:
         reasons.append(f"tech opportunity ({min(tech_score, w['tech_deficiency'])} pts)")
-    score += min(tech_score, w["tech_deficiency"])
+    points["score_tech"] = min(tech_score, w["tech_deficiency"])
 
     # D. Recurring/Contract Revenue (10 pts max)
-    recurring_count = sum(1 for s in c["recurring_revenue_signals"] if s in ctx)
+    recurring_count = len(hits.get(ks["recurring"], ()))
+    points["score_recurring"] = 0
     if recurring_count >= 2:
-        score += w["recurring_revenue"]
+        points["score_recurring"] = w["recurring_revenue"]
         reasons.append("recurring revenue (strong)")
     elif recurring_count == 1:
-        score += 6
+        points["score_recurring"] = 6
         reasons.append("recurring revenue signal")
 
     # E. Industry Durability (10 pts max)
-    industry_match = False
-    for ind in c["durable_industries"]:
-        if ind in ctx:
-            industry_match = True
-            break
-    if industry_match:
-        score += w["industry_durability"]
+    points["score_durability"] = 0
+    if ks["durable"] in hits:
+        points["score_durability"] = w["industry_durability"]
         reasons.append("durable industry")
 
     # F. Geographic Fit (10 pts max)
-    tc_signals = c["twin_cities_signals"]
-    loc_lower = location
-    if any(tc in loc_lower or tc in ctx for tc in tc_signals):
-        score += w["geographic_fit"]
+    points["score_geography"] = 0
+    if ks["twin_cities"] in hits or ks["twin_cities"] in f.location_hits:
+        points["score_geography"] = w["geographic_fit"]
         reasons.append("Twin Cities area")
-    elif "minnesota" in loc_lower:
-        score += 5
+    elif "minnesota" in location:
+        points["score_geography"] = 5
         reasons.append("Minnesota (not TC)")
 
+    score = sum(points.values())
+
     # --- BUCKET ASSIGNMENT ---
     t = c["thresholds"]
     if score >= t["shortlist"]:
@@ -205,20 +331,397 @@ def score_listing(l: dict) -> dict:
     else:
         bucket = "SKIP"
 
-    return {"score": score, "bucket": bucket, "reasons": reasons, "absentee": absentee}
+    return {"score": score, "bucket": bucket, "reasons": reasons, "absentee": absentee, **points}
+
+
+# ── Vectorized scoring ─────────────────────────────────────────────────────────
+# Same rules as score_listing, applied to whole columns. Keyword matching still
+# runs once per listing (features_of); every threshold, tier and bucket is an
+# array operation.
+
+_FRAME_NUMERIC = {
+    "asking": "asking_price",
+    "cash_flow": "annual_cash_flow",
+    "employees": "employees",
+    "dscr_20": "dscr_20pct",
+    "cf_after_20": "cf_after_debt_20pct",
+    "coc_20": "coc_return_20pct",
+}
+
+# score_listing's auto-reject checks, in the order it applies them
+_REJECTS = ["missing", "under_min", "over_max", "no_cf", "low_dscr", "negative_cf",
+            "not_mn", "regulated", "digital"]
+
+
+def score_frame(listings, profile=None) -> dict:
+    """
+    The columns score_many reads, from listing dicts, Listing records or a
+    ListingBatch: NumPy arrays (NaN = missing) plus keyword-hit flags and counts.
+    """
+    _criteria(profile)      # registers the criteria keyword sets before the scans below
+    ks = _sets(profile)
+    rows = listings if isinstance(listings, ListingBatch) else list(listings)
+    n = len(rows)
+    frame = {}
+    for key, field in _FRAME_NUMERIC.items():
+        if isinstance(rows, ListingBatch):
+            frame[key] = np.array(rows.column(field), dtype=float)
+        else:
+            frame[key] = np.array([np.nan if (v := _number(r.get(field))) is None else v for r in rows],
+                                  dtype=float)
+    frame["employees"] = np.trunc(frame["employees"])     # whole headcount, as ListingFeatures reads it
+
+    flags = {k: np.zeros(n, dtype=bool) for k in (
+        "has_location", "in_mn", "absentee_yes", "absentee_likely", "absentee_possible",
+        "heavy", "simple", "durable", "twin_cities")}
+    counts = {k: np.zeros(n, dtype=np.int64) for k in ("tech", "recurring")}
+    location = [""] * n
+    regulated = [""] * n
+    digital = [""] * n
+    for i, l in enumerate(rows):
+        f = features_of(l)
+        hits = f.hits
+        location[i] = l.get("location", "")
+        flags["has_location"][i] = bool(f.location)
+        flags["in_mn"][i] = "minnesota" in f.location
+        flags["absentee_yes"][i] = (l.get("absentee_owner_field") or "").lower().strip() == "yes"
+        flags["absentee_likely"][i] = ks["absentee_likely"] in hits
+        flags["absentee_possible"][i] = ks["absentee_possible"] in hits
+        flags["heavy"][i] = "score.heavy" in hits
+        flags["simple"][i] = "score.simple" in hits
+        flags["durable"][i] = ks["durable"] in hits
+        flags["twin_cities"][i] = ks["twin_cities"] in hits or ks["twin_cities"] in f.location_hits
+        counts["tech"][i] = len(hits.get(ks["tech"], ()))
+        counts["recurring"][i] = len(hits.get(ks["recurring"], ()))
+        if ks["regulated"] in hits:
+            regulated[i] = hits[ks["regulated"]][0]
+        if ks["digital"] in hits:
+            digital[i] = hits[ks["digital"]][0]
+
+    frame.update(flags)
+    frame.update(counts)
+    frame["location"] = location
+    frame["regulated"] = np.array(regulated, dtype=object)
+    frame["digital"] = np.array(digital, dtype=object)
+    return frame
+
+
+def _tier(values, tiers, default=0):
+    """Points for the first (threshold, points) tier `values` reaches; NaN reaches none."""
+    return np.select([values >= t for t, _ in tiers], [p for _, p in tiers], default)
+
+
+def score_many(frame, reasons: bool = True, profile=None) -> dict:
+    """
+    Score a whole catalog at once. `frame` is a score_frame() result, or
+    anything score_frame accepts. Returns columns: score, bucket, absentee,
+    the SCORE_COMPONENTS points and, unless reasons=False, the reasons list
+    per listing — identical to what score_listing returns for each row.
+    """
+    if not isinstance(frame, dict):
+        frame = score_frame(frame, profile)
+    c = _criteria(profile)
+    w = c["weights"]
+    t = c["thresholds"]
+
+    asking, cf = frame["asking"], frame["cash_flow"]
+    dscr, cf_after, coc, employees = frame["dscr_20"], frame["cf_after_20"], frame["coc_20"], frame["employees"]
+
+    absentee = np.select([frame["absentee_yes"] | frame["absentee_likely"], frame["absentee_possible"]],
+                         ["Likely", "Possible"], "No").astype(object)
+
+    with np.errstate(invalid="ignore"):
+        checks = [
+            np.isnan(asking) & np.isnan(cf),
+            asking < c["budget"]["min_asking_price"],
+            asking > c["budget"]["max_asking_price"],
+            np.isnan(cf),
+            dscr < c["targets"]["min_dscr"],
+            cf_after < 0,
+            frame["has_location"] & ~frame["in_mn"],
+            frame["regulated"] != "",
+            frame["digital"] != "",
+        ]
+        # Index of the first failing check, -1 where none fails
+        reject = np.select(checks, np.arange(len(checks)), -1)
+        ok = reject < 0
+
+        cf_pts = _tier(cf, [(300000, 20), (150000, 10), (75000, 5)])
+        dscr_pts = _tier(dscr, [(1.5, 12), (1.35, 7), (1.25, 3)])
+        coc_pts = _tier(coc, [(0.30, 8), (0.20, 5), (0.15, 2)])
+        emp_pts = np.select([employees < 20, employees < 50], [8, 4], 0)
+        recurring = frame["recurring"]
+
+        components = {
+            "score_financial": np.minimum(cf_pts + dscr_pts + coc_pts, w["financial_strength"]),
+            "score_operations": np.minimum(emp_pts + 4 * ~frame["heavy"] + 3 * frame["simple"],
+                                           w["operational_simplicity"]),
+            "score_tech": np.minimum(3 * frame["tech"], w["tech_deficiency"]),
+            "score_recurring": np.select([recurring >= 2, recurring == 1], [w["recurring_revenue"], 6], 0),
+            "score_durability": np.where(frame["durable"], w["industry_durability"], 0),
+            "score_geography": np.select([frame["twin_cities"], frame["in_mn"]], [w["geographic_fit"], 5], 0),
+        }
+    components = {k: np.where(ok, v, 0).astype(np.int64) for k, v in components.items()}
+    score = sum(components.values())
+    bucket = np.select([~ok, score >= t["shortlist"], score >= t["review"]],
+                       ["AUTO-REJECT", "SHORTLIST", "REVIEW"], "SKIP").astype(object)
+
+    out = {"score": score, "bucket": bucket, "absentee": absentee, **components}
+    if reasons:
+        out["reasons"] = _reasons_many(frame, c, reject, components)
+    return out
+
+
+def score_profiles(listings, reasons: bool = False) -> dict:
+    """
+    {profile: score_many result} for every profile in profiles/. Listings are
+    parsed and keyword-scanned once: each gets one feature record, whose
+    single scan covers every profile's keyword sets, and each profile's
+    rules are then applied to those shared features.
+    """
+    _load_criteria()
+    rows = list(listings)
+    for l in rows:
+        if l.get("features") is None:
+            l["features"] = features_of(l)
+    return {name: score_many(rows, reasons=reasons, profile=name) for name in criteria_profiles()}
+
+
+def profile_scores(l: dict) -> dict:
+    """{profile: {"score", "bucket"}} for one listing under every profile in profiles/."""
+    _load_criteria()
+    return {name: {k: v for k, v in score_listing(l, name).items() if k in ("score", "bucket")}
+            for name in criteria_profiles()}
+
+
+def score_weights() -> dict:
+    """The `weights:` block of criteria.yml, keyed as SCORE_COMPONENTS maps to."""
+    return dict(_load_criteria()["weights"])
+
+
+def reweight(components: dict, weights: dict, rejected) -> tuple:
+    """
+    (score, bucket) arrays under new `weights`, straight from stored
+    SCORE_COMPONENTS points: each category's points are scaled by its new
+    weight over the criteria.yml one and summed, so re-ranking needs no
+    rescoring pass. The criteria.yml weights reproduce the stored scores.
+    """
+    c = _load_criteria()
+    base = c["weights"]
+    t = c["thresholds"]
+    points = np.column_stack([np.asarray(components[col], dtype=float) for col in SCORE_COMPONENTS])
+    scale = np.array([weights[key] / base[key] if base[key] else 0.0 for key in SCORE_COMPONENTS.values()])
+    rejected = np.asarray(rejected, dtype=bool)
+    score = np.where(rejected, 0, np.rint(np.nan_to_num(points) @ scale)).astype(np.int64)
+    bucket = np.select([rejected, score >= t["shortlist"], score >= t["review"]],
+                       ["AUTO-REJECT", "SHORTLIST", "REVIEW"], "SKIP").astype(object)
+    return score, bucket
+
+
+def _reasons_many(frame, c, reject, components) -> list:
+    """score_listing's reasons text, built per row from the already-computed tiers."""
+    cols = {k: frame[k].tolist() for k in ("asking", "cash_flow", "employees", "dscr_20", "cf_after_20", "coc_20")}
+    out = []
+    for i, code in enumerate(reject.tolist()):
+        asking, cf = cols["asking"][i], cols["cash_flow"][i]
+        dscr, coc, employees = cols["dscr_20"][i], cols["coc_20"][i], cols["employees"][i]
+        if code >= 0:
+            kind = _REJECTS[code]
+            if kind == "missing":
+                out.append(["missing financials"])
+            elif kind == "under_min":
+                out.append([f"under min price ${asking:,.0f}"])
+            elif kind == "over_max":
+                out.append([f"over max price ${asking:,.0f}"])
+            elif kind == "no_cf":
+                out.append(["no cash flow data"])
+            elif kind == "low_dscr":
+                out.append([f"DSCR {dscr:.2f} below {c['targets']['min_dscr']}"])
+            elif kind == "negative_cf":
+                out.append([f"negative CF after debt ${cols['cf_after_20'][i]:,.0f}"])
+            elif kind == "not_mn":
+                out.append([f"not Minnesota: {frame['location'][i]}"])
+            elif kind == "regulated":
+                out.append([f"regulated: {frame['regulated'][i]}"])
+            else:
+                out.append([f"digital/online: {frame['digital'][i]}"])
+            continue
+
+        reasons = []
+        if cf >= 300000:
+            reasons.append(f"strong CF ${cf:,.0f}")
+        elif cf >= 150000:
+            reasons.append(f"decent CF ${cf:,.0f}")
+        elif cf >= 75000:
+            reasons.append(f"modest CF ${cf:,.0f}")
+        else:
+            reasons.append(f"low CF ${cf:,.0f}")
+        if dscr >= 1.25:
+            reasons.append(f"DSCR {dscr:.2f}")
+        if coc >= 0.15:
+            reasons.append(f"CoC {coc:.0%}")
+        if employees == employees:
+            employees = int(employees)
+            reasons.append(f"{employees} employees" if employees < 50 else f"large team: {employees}")
+        if not frame["heavy"][i]:
+            reasons.append("no heavy inventory")
+        if frame["simple"][i]:
+            reasons.append("operationally simple")
+        tech = components["score_tech"][i]
+        if tech > 0:
+            reasons.append(f"tech opportunity ({tech} pts)")
+        recurring = frame["recurring"][i]
+        if recurring >= 2:
+            reasons.append("recurring revenue (strong)")
+        elif recurring == 1:
+            reasons.append("recurring revenue signal")
+        if frame["durable"][i]:
+            reasons.append("durable industry")
+        if frame["twin_cities"][i]:
+            reasons.append("Twin Cities area")
+        elif frame["in_mn"][i]:
+            reasons.append("Minnesota (not TC)")
+        out.append(reasons)
+    return out
 
 
 # ── Profile scoring (8 operator-fit dimensions, 1–3 scale) ─────────────────────
 
+_AI_PROOF_HIGH = [
+    "plumb", "electrical", "electrician", "hvac", "heating", "cooling",
+    "roofing", "roofer", "concrete", "masonry", "welding", "welder",
+    "auto repair", "auto body", "collision", "mechanic", "tire",
+    "landscaping", "lawn care", "snow removal", "excavat",
+    "pest control", "restoration", "physical therapy", "chiropractic",
+    "dental", "veterinar", "home health", "senior care", "elder care",
+    "construction", "flooring", "painting contractor", "insulation",
+    "septic", "drain", "refrigeration", "towing",
+]
+
+_AI_PROOF_LOW = [
+    "accounting", "bookkeeping", "tax preparation", "financial planning",
+    "insurance agency", "staffing", "consulting", "digital", "software",
+    "it service", "managed service", "web design", "marketing agency",
+    "payroll", "mortgage", "lending",
+]
+
+_FUN_HIGH = [
+    "restaurant", "bar ", "brewery", "brewpub", "cafe", "coffee",
+    "retail", "boutique", "gift shop", "clothing", "pet store",
+    "salon", "spa", "fitness", "gym", "yoga", "crossfit",
+    "hotel", "motel", "resort", "lodge", "bed and breakfast",
+    "entertainment", "recreation", "arcade", "bowling",
+    "bakery", "donut", "food truck", "catering",
+    "florist", "flower", "toy store", "book store",
+    "childcare", "daycare", "dance studio", "martial arts",
+    "veterinar", "animal hospital",
+]
+
+_FUN_LOW = [
+    "manufacturing", "fabrication", "machining", "industrial",
+    "distribution", "warehouse", "trucking", "freight", "wholesale",
+    "staffing", "payroll", "accounting", "bookkeeping", "tax",
+    "b2b", "commercial only", "government contract",
+]
+
+_WEATHER_HIGH = [
+    "lawn care", "lawn service", "landscaping", "landscape",
+    "snow removal", "snow plow", "irrigation", "sprinkler",
+    "outdoor construction", "excavat", "outdoor",
+    "tree service", "tree removal", "leaf removal",
+    "pressure wash", "deck", "fence install",
+    "swimming pool", "seasonal",
+]
+
+_WEATHER_LOW = [
+    "hvac", "plumbing", "electrical", "healthcare", "medical",
+    "dental", "retail", "restaurant", "cleaning", "janitorial",
+    "accounting", "manufacturing", "distribution", "trucking",
+    "auto repair", "home health", "senior care",
+]
+
+_LABOR_HIGH = [
+    "plumb", "electrical", "hvac", "roofing", "concrete", "masonry",
+    "landscaping", "excavat", "construction", "manufacturing",
+    "fabrication", "welding", "moving", "trucking", "distribution",
+    "warehouse", "janitorial", "cleaning service", "pest control",
+    "auto repair", "auto body", "towing", "insulation", "painting contractor",
+]
+
+_LABOR_LOW = [
+    "accounting", "bookkeeping", "financial", "insurance", "consulting",
+    "staffing", "software", "it service", "managed service",
+    "real estate", "mortgage", "tax preparation",
+]
+
+_RECURRING_STRONG = [
+    "service contract", "maintenance agreement", "recurring revenue",
+    "annual contract", "subscription", "retainer", "route based",
+    "route-based", "service route", "maintenance plan",
+    "managed service", "membership",
+]
+
+_RECURRING_SOME = [
+    "repeat customer", "loyal customer", "repeat business",
+    "established clientele", "long-term client", "regular customer",
+]
+
+_CAPITAL_HEAVY = [
+    "manufacturing", "fabrication", "machining", "equipment intensive",
+    "heavy equipment", "fleet", "trucking", "warehouse", "distribution",
+    "real estate included", "building included", "inventory",
+    "restaurant", "food service",  # high equipment + leasehold
+]
+
+_CAPITAL_LIGHT = [
+    "service-based", "no inventory", "home-based", "home based",
+    "cleaning", "janitorial", "staffing", "consulting", "accounting",
+    "bookkeeping", "lawn care", "pest control", "home health",
+    "elder care", "senior care", "tutoring", "coaching",
+]
+
+_SCALABLE_HIGH = [
+    "multiple location", "multi-location", "additional location",
+    "scalable", "franchise", "route", "territory",
+    "cleaning", "janitorial", "lawn care", "pest control",
+    "staffing", "home health", "elder care", "tutoring",
+    "systems in place", "process driven", "documented process",
+    "turnkey", "replicable",
+]
+
+_SCALABLE_LOW = [
+    "owner operator", "sole proprietor", "owner-operated",
+    "boutique", "bespoke", "custom", "artisan",
+    "single location", "one location",
+]
+
+PROFILE_KEYWORDS = {
+    "ai_proof_high": _AI_PROOF_HIGH,
+    "ai_proof_low": _AI_PROOF_LOW,
+    "fun_high": _FUN_HIGH,
+    "fun_low": _FUN_LOW,
+    "weather_high": _WEATHER_HIGH,
+    "weather_low": _WEATHER_LOW,
+    "labor_high": _LABOR_HIGH,
+    "labor_low": _LABOR_LOW,
+    "recurring_strong": _RECURRING_STRONG,
+    "recurring_some": _RECURRING_SOME,
+    "capital_heavy": _CAPITAL_HEAVY,
+    "capital_light": _CAPITAL_LIGHT,
+    "scalable_high": _SCALABLE_HIGH,
+    "scalable_low": _SCALABLE_LOW,
+}
+
+for _name, _keywords in PROFILE_KEYWORDS.items():
+    keywords.register(f"profile.{_name}", _keywords)
+
+
 def profile_score(l: dict) -> dict:
     """
     Score a listing on 8 operator-fit dimensions, each 1–3.
     1 = low / unfavorable, 2 = moderate, 3 = high / favorable.
     """
-    title    = (l.get("title")       or "").lower()
-    desc     = (l.get("description") or "").lower()
-    industry = (l.get("industry")    or "").lower()
-    ctx = f"{title} {desc} {industry}"
+    hits = features_of(l).hits
 
     absentee = l.get("absentee", "No")
 
@@ -226,25 +729,9 @@ def profile_score(l: dict) -> dict:
     # 3 = physical/hands-on (very hard to automate)
     # 2 = mixed
     # 1 = knowledge/digital (automatable)
-    _ai_proof_high = [
-        "plumb", "electrical", "electrician", "hvac", "heating", "cooling",
-        "roofing", "roofer", "concrete", "masonry", "welding", "welder",
-        "auto repair", "auto body", "collision", "mechanic", "tire",
-        "landscaping", "lawn care", "snow removal", "excavat",
-        "pest control", "restoration", "physical therapy", "chiropractic",
-        "dental", "veterinar", "home health", "senior care", "elder care",
-        "construction", "flooring", "painting contractor", "insulation",
-        "septic", "drain", "refrigeration", "towing",
-    ]
-    _ai_proof_low = [
-        "accounting", "bookkeeping", "tax preparation", "financial planning",
-        "insurance agency", "staffing", "consulting", "digital", "software",
-        "it service", "managed service", "web design", "marketing agency",
-        "payroll", "mortgage", "lending",
-    ]
-    if any(kw in ctx for kw in _ai_proof_high):
+    if "profile.ai_proof_high" in hits:
         dim_ai_proof = 3
-    elif any(kw in ctx for kw in _ai_proof_low):
+    elif "profile.ai_proof_low" in hits:
         dim_ai_proof = 1
     else:
         dim_ai_proof = 2
@@ -253,88 +740,35 @@ def profile_score(l: dict) -> dict:
     # 3 = consumer-facing, entertaining, hospitality, retail
     # 2 = some customer interaction
     # 1 = back-office, industrial, B2B only
-    _fun_high = [
-        "restaurant", "bar ", "brewery", "brewpub", "cafe", "coffee",
-        "retail", "boutique", "gift shop", "clothing", "pet store",
-        "salon", "spa", "fitness", "gym", "yoga", "crossfit",
-        "hotel", "motel", "resort", "lodge", "bed and breakfast",
-        "entertainment", "recreation", "arcade", "bowling",
-        "bakery", "donut", "food truck", "catering",
-        "florist", "flower", "toy store", "book store",
-        "childcare", "daycare", "dance studio", "martial arts",
-        "veterinar", "animal hospital",
-    ]
-    _fun_low = [
-        "manufacturing", "fabrication", "machining", "industrial",
-        "distribution", "warehouse", "trucking", "freight", "wholesale",
-        "staffing", "payroll", "accounting", "bookkeeping", "tax",
-        "b2b", "commercial only", "government contract",
-    ]
-    if any(kw in ctx for kw in _fun_high):
+    if "profile.fun_high" in hits:
         dim_fun = 3
-    elif any(kw in ctx for kw in _fun_low):
+    elif "profile.fun_low" in hits:
         dim_fun = 1
     else:
         dim_fun = 2
 
     # ── Weather Dependent ──────────────────────────────────────────────────────
     # 3 = year-round (good), 2 = some seasonality, 1 = highly seasonal (risky)
-    _weather_high = [
-        "lawn care", "lawn service", "landscaping", "landscape",
-        "snow removal", "snow plow", "irrigation", "sprinkler",
-        "outdoor construction", "excavat", "outdoor",
-        "tree service", "tree removal", "leaf removal",
-        "pressure wash", "deck", "fence install",
-        "swimming pool", "seasonal",
-    ]
-    _weather_low = [
-        "hvac", "plumbing", "electrical", "healthcare", "medical",
-        "dental", "retail", "restaurant", "cleaning", "janitorial",
-        "accounting", "manufacturing", "distribution", "trucking",
-        "auto repair", "home health", "senior care",
-    ]
-    if any(kw in ctx for kw in _weather_high):
+    if "profile.weather_high" in hits:
         dim_weather = 1
-    elif any(kw in ctx for kw in _weather_low):
+    elif "profile.weather_low" in hits:
         dim_weather = 3
     else:
         dim_weather = 2
 
     # ── Manual Labor ───────────────────────────────────────────────────────────
     # 3 = heavy physical workforce, 2 = mixed, 1 = knowledge/light
-    _labor_high = [
-        "plumb", "electrical", "hvac", "roofing", "concrete", "masonry",
-        "landscaping", "excavat", "construction", "manufacturing",
-        "fabrication", "welding", "moving", "trucking", "distribution",
-        "warehouse", "janitorial", "cleaning service", "pest control",
-        "auto repair", "auto body", "towing", "insulation", "painting contractor",
-    ]
-    _labor_low = [
-        "accounting", "bookkeeping", "financial", "insurance", "consulting",
-        "staffing", "software", "it service", "managed service",
-        "real estate", "mortgage", "tax preparation",
-    ]
-    if any(kw in ctx for kw in _labor_high):
+    if "profile.labor_high" in hits:
         dim_labor = 3
-    elif any(kw in ctx for kw in _labor_low):
+    elif "profile.labor_low" in hits:
         dim_labor = 1
     else:
         dim_labor = 2
 
     # ── Recurring Revenue ──────────────────────────────────────────────────────
     # 3 = strong recurring, 2 = some, 1 = transactional
-    _recurring_strong = [
-        "service contract", "maintenance agreement", "recurring revenue",
-        "annual contract", "subscription", "retainer", "route based",
-        "route-based", "service route", "maintenance plan",
-        "managed service", "membership",
-    ]
-    _recurring_some = [
-        "repeat customer", "loyal customer", "repeat business",
-        "established clientele", "long-term client", "regular customer",
-    ]
-    count_strong = sum(1 for kw in _recurring_strong if kw in ctx)
-    count_some   = sum(1 for kw in _recurring_some   if kw in ctx)
+    count_strong = len(hits.get("profile.recurring_strong", ()))
+    count_some   = len(hits.get("profile.recurring_some", ()))
     if count_strong >= 1:
         dim_recurring = 3
     elif count_some >= 1:
@@ -353,43 +787,18 @@ def profile_score(l: dict) -> dict:
 
     # ── Capital Light ──────────────────────────────────────────────────────────
     # 3 = minimal assets/inventory, 2 = moderate, 1 = heavy assets
-    _capital_heavy = [
-        "manufacturing", "fabrication", "machining", "equipment intensive",
-        "heavy equipment", "fleet", "trucking", "warehouse", "distribution",
-        "real estate included", "building included", "inventory",
-        "restaurant", "food service",  # high equipment + leasehold
-    ]
-    _capital_light = [
-        "service-based", "no inventory", "home-based", "home based",
-        "cleaning", "janitorial", "staffing", "consulting", "accounting",
-        "bookkeeping", "lawn care", "pest control", "home health",
-        "elder care", "senior care", "tutoring", "coaching",
-    ]
-    if any(kw in ctx for kw in _capital_light):
+    if "profile.capital_light" in hits:
         dim_capital_light = 3
-    elif any(kw in ctx for kw in _capital_heavy):
+    elif "profile.capital_heavy" in hits:
         dim_capital_light = 1
     else:
         dim_capital_light = 2
 
     # ── Scalable ───────────────────────────────────────────────────────────────
     # 3 = easy to add locations/routes/units, 2 = some potential, 1 = owner-capped
-    _scalable_high = [
-        "multiple location", "multi-location", "additional location",
-        "scalable", "franchise", "route", "territory",
-        "cleaning", "janitorial", "lawn care", "pest control",
-        "staffing", "home health", "elder care", "tutoring",
-        "systems in place", "process driven", "documented process",
-        "turnkey", "replicable",
-    ]
-    _scalable_low = [
-        "owner operator", "sole proprietor", "owner-operated",
-        "boutique", "bespoke", "custom", "artisan",
-        "single location", "one location",
-    ]
-    if any(kw in ctx for kw in _scalable_high):
+    if "profile.scalable_high" in hits:
         dim_scalable = 3
-    elif any(kw in ctx for kw in _scalable_low):
+    elif "profile.scalable_low" in hits:
         dim_scalable = 1
     else:
         dim_scalable = 2
@@ -0,0 +1,87 @@
+"""
+Typed columnar snapshot of each source's listings, written next to its CSV
+(output/sunbelt.csv -> output/sunbelt.feather) so the dashboard can load
+typed columns instead of parsing text.
+
+Numeric columns are stored as float64 / int64 and the repeated strings
+(bucket, source, absentee, industry) as dictionary-encoded categoricals, in
+uncompressed Arrow IPC (Feather v2). Each snapshot records the size and
+mtime of the CSV it was written with, plus its SHA-256; a reader ignores a
+snapshot whose CSV has since changed, so the CSV stays the source of truth.
+The CSV is only hashed when its size matches but its mtime does not, as after
+a fresh git checkout.
+
+pyarrow is optional: without it no snapshot is written and readers fall back
+to the CSV.
+"""
+import hashlib
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
+from scout.records import FIELDNAMES, REAL_FIELDS, INT_FIELDS
+
+SNAPSHOT_CATEGORICAL = {"bucket", "source", "absentee", "industry"}
+_SIZE_KEY = b"csv_size"
+_MTIME_KEY = b"csv_mtime_ns"
+_DIGEST_KEY = b"csv_sha256"
+
+
+def snapshot_path(csv_path) -> Path:
+    return Path(csv_path).with_suffix(".feather")
+
+
+def csv_digest(csv_path) -> str:
+    return hashlib.sha256(Path(csv_path).read_bytes()).hexdigest()
+
+
+def _csv_stat(csv_path) -> dict:
+    st = Path(csv_path).stat()
+    return {_SIZE_KEY: str(st.st_size).encode(), _MTIME_KEY: str(st.st_mtime_ns).encode()}
+
+
+def _column(field, values):
+    if field in REAL_FIELDS:
+        return pa.array(values, pa.float64())
+    if field in INT_FIELDS:
+        return pa.array(values, pa.int64())
+    col = pa.array(values, pa.string())
+    return col.dictionary_encode() if field in SNAPSHOT_CATEGORICAL else col
+
+
+def write_snapshot(rows, csv_path) -> bool:
+    """
+    Write the snapshot for `csv_path` from its rows as stored (sqlite3.Row or
+    dict, typed as in the listings table). False when pyarrow isn't installed.
+    """
+    if pa is None:
+        return False
+    table = pa.table(
+        {f: _column(f, [r[f] for r in rows]) for f in FIELDNAMES},
+        metadata={**_csv_stat(csv_path), _DIGEST_KEY: csv_digest(csv_path).encode()},
+    )
+    p = snapshot_path(csv_path)
+    tmp = p.with_suffix(".feather.tmp")
+    feather.write_feather(table, tmp, compression="uncompressed")
+    tmp.replace(p)
+    return True
+
+
+def read_snapshot(csv_path):
+    """The snapshot for `csv_path` as a DataFrame, or None if missing, stale or pyarrow isn't installed."""
+    p = snapshot_path(csv_path)
+    if pa is None or not p.exists():
+        return None
+    with pa.ipc.open_file(p) as reader:
+        meta = reader.schema.metadata or {}
+    stat = _csv_stat(csv_path)
+    if meta.get(_SIZE_KEY) != stat[_SIZE_KEY]:
+        return None
+    # Same size but a different mtime (e.g. a fresh checkout): compare contents
+    if meta.get(_MTIME_KEY) != stat[_MTIME_KEY] and meta.get(_DIGEST_KEY) != csv_digest(csv_path).encode():
+        return None
+    return feather.read_table(p, memory_map=True).to_pandas()
@@ -1,30 +1,22 @@
 import json
 import csv
+import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime
 
+from scout.finance import SCENARIO_PARAMS, SCENARIO_FIELDS, evaluate_scenarios, scenario_grid
+from scout.parse import INPUT_FIELDS, input_hash, input_fields
+from scout.records import FIELDNAMES, REAL_FIELDS, INT_FIELDS, ListingBatch
+from scout.score import criteria_profiles, score_profiles
+from scout.snapshot import write_snapshot
+
 _BASE = Path(__file__).resolve().parents[1]
 SUNBELT_CSV = _BASE / "output" / "sunbelt.csv"
 CALHOUN_CSV = _BASE / "output" / "calhoun.csv"
-
-FIELDNAMES = [
-    "id", "title", "url", "industry", "location",
-    "asking_price", "asking_price_text",
-    "annual_cash_flow", "annual_revenue", "employees",
-    "down_10", "sba_monthly_10pct", "annual_debt_service_10pct",
-    "cf_after_debt_10pct", "coc_return_10pct", "dscr_10pct", "payoff_years_10pct",
-    "down_20", "sba_monthly_20pct", "annual_debt_service_20pct",
-    "cf_after_debt_20pct", "coc_return_20pct", "dscr_20pct", "payoff_years_20pct",
-    "seller_note_amount", "seller_note_monthly", "seller_note_annual",
-    "cf_during_standby", "cf_after_seller_financing", "dscr_seller_financed",
-    "score", "bucket", "absentee", "reasons", "is_trades",
-    "years_in_business", "is_franchise", "reason_for_selling",
-    "sba_available", "listing_agent", "narrative", "description",
-    "dim_ai_proof", "dim_fun", "dim_weather", "dim_labor",
-    "dim_recurring", "dim_absentee", "dim_capital_light", "dim_scalable",
-    "last_seen", "is_active", "source", "has_pdf",
-]
-
+SCENARIOS_CSV = _BASE / "output" / "scenarios.csv"
+PROFILE_SCORES_CSV = _BASE / "output" / "profile_scores.csv"
+DB_PATH = _BASE / "data" / "scout.db"
 
 def _base():
     return _BASE
@@ -44,90 +36,618 @@ def save_state(state: dict):
     p.write_text(json.dumps(state, indent=2))
 
 
+def connect(path=None) -> sqlite3.Connection:
+    """Open the scout database (WAL mode) and make sure every table exists."""
+    p = Path(path or DB_PATH)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(p, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS seen (
+            id          TEXT PRIMARY KEY,
+            source      TEXT NOT NULL,
+            first_seen  TEXT NOT NULL,
+            last_seen   TEXT NOT NULL,
+            last_hash   TEXT,
+            last_fields TEXT
+        );
+        CREATE INDEX IF NOT EXISTS seen_source ON seen(source);
+        CREATE TABLE IF NOT EXISTS changes (
+            id          TEXT NOT NULL,
+            source      TEXT NOT NULL,
+            changed_at  TEXT NOT NULL,
+            field       TEXT NOT NULL,
+            old_value   TEXT,
+            new_value   TEXT
+        );
+        CREATE INDEX IF NOT EXISTS changes_id ON changes(id);
+        CREATE INDEX IF NOT EXISTS changes_at ON changes(changed_at);
+    """)
+    columns = {r["name"] for r in conn.execute("PRAGMA table_info(seen)")}
+    if "last_fields" not in columns:
+        conn.execute("ALTER TABLE seen ADD COLUMN last_fields TEXT")
+    return conn
+
+
+def _source_for(listing_id: str) -> str:
+    return "calhoun" if listing_id.startswith("calhoun_") else "sunbelt"
+
+
+class SeenIndex:
+    """
+    Every listing ID the scout has ever processed, with first/last seen
+    times and the hash + values of its last parsed inputs. IDs and hashes
+    are held in memory for O(1) membership and change checks; writes are
+    batched into one transaction.
+    """
+
+    def __init__(self, path=None):
+        self.conn = connect(path)
+        self._lock = threading.Lock()
+        if not self.conn.execute("SELECT 1 FROM seen LIMIT 1").fetchone():
+            self._migrate_state_json()
+        self._hashes = {r["id"]: r["last_hash"] for r in self.conn.execute("SELECT id, last_hash FROM seen")}
+
+    def _migrate_state_json(self):
+        """One-time import of the legacy data/state.json seen_ids list."""
+        ids = load_state().get("seen_ids", [])
+        if not ids:
+            return
+        now = datetime.utcnow().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen (id, source, first_seen, last_seen) VALUES (?, ?, ?, ?)",
+                [(i, _source_for(i), now, now) for i in ids],
+            )
+        print(f"  Migrated {len(ids)} seen IDs from state.json")
+
+    def __contains__(self, listing_id):
+        return listing_id in self._hashes
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def is_unchanged(self, listing: dict) -> bool:
+        """True if this listing was seen before with identical parsed inputs."""
+        prev = self._hashes.get(listing["id"])
+        return prev is not None and prev == input_hash(listing)
+
+    def last_fields(self, listing_id):
+        """The parsed inputs stored for a listing on its last processing, or None."""
+        with self._lock:
+            row = self.conn.execute("SELECT last_fields FROM seen WHERE id = ?", (listing_id,)).fetchone()
+        return json.loads(row["last_fields"]) if row and row["last_fields"] else None
+
+    def record(self, listings, source):
+        """
+        Upsert processed listings (keeping first_seen, refreshing last_seen,
+        last_hash and last_fields) and append any field-level diffs found on
+        the listings' "changes" key to the changes table.
+        """
+        now = datetime.utcnow().isoformat()
+        rows, diffs = [], []
+        for l in listings:
+            rows.append((l["id"], source, now, now, input_hash(l), json.dumps(input_fields(l), default=str)))
+            for field, (old, new) in (l.get("changes") or {}).items():
+                diffs.append((l["id"], source, now, field, _num(old), _num(new)))
+        with self._lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO seen (id, source, first_seen, last_seen, last_hash, last_fields)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    last_seen   = excluded.last_seen,
+                    last_hash   = excluded.last_hash,
+                    last_fields = excluded.last_fields
+            """, rows)
+            self.conn.executemany("""
+                INSERT INTO changes (id, source, changed_at, field, old_value, new_value)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, diffs)
+        self._hashes.update((r[0], r[4]) for r in rows)
+
+    def touch(self, listing_ids):
+        """Refresh last_seen for listings still present in the latest crawl."""
+        now = datetime.utcnow().isoformat()
+        with self._lock, self.conn:
+            self.conn.executemany("UPDATE seen SET last_seen = ? WHERE id = ?",
+                                  [(now, i) for i in listing_ids])
+
+
+CSV_PATHS = {"sunbelt": SUNBELT_CSV, "calhoun": CALHOUN_CSV}
+_UPSERT_BATCH = 500
+
+
 def _num(val):
     if val is None:
         return ""
     return str(val)
 
 
-def upsert_rows(rows: list[dict], active_ids=None, csv_path=None):
+def _column_type(field):
+    if field in REAL_FIELDS:
+        return "REAL"
+    if field in INT_FIELDS:
+        return "INTEGER"
+    return "TEXT"
+
+
+def _to_db(field, val):
+    """Coerce a CSV string or Python value to the column's storage type (None for blanks)."""
+    if val is None or val == "":
+        return None
+    try:
+        if field in REAL_FIELDS:
+            return float(val)
+        if field in INT_FIELDS:
+            return int(float(val))
+    except (ValueError, TypeError):
+        return None
+    return str(val)
+
+
+def _source_of(csv_path):
+    for source, path in CSV_PATHS.items():
+        if Path(csv_path).resolve() == Path(path).resolve():
+            return source
+    return Path(csv_path).stem
+
+
+_listings_ready = set()
+_listings_lock = threading.Lock()
+
+
+def listings_db(path=None) -> sqlite3.Connection:
+    """
+    Connection with the listings table ready. On first use an empty table is
+    bootstrapped from the exported CSVs, so a fresh checkout (or a CI run
+    without a restored data/ cache) starts from the committed data.
+    """
+    conn = connect(path)
+    key = str(path or DB_PATH)
+    with _listings_lock:
+        if key in _listings_ready:
+            return conn
+        columns = ",\n".join(
+            f"{f} TEXT PRIMARY KEY" if f == "id" else f"{f} {_column_type(f)}" for f in FIELDNAMES
+        )
+        conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS listings (
+                {columns}
+            );
+            CREATE INDEX IF NOT EXISTS listings_source    ON listings(source);
+            CREATE INDEX IF NOT EXISTS listings_bucket    ON listings(bucket);
+            CREATE INDEX IF NOT EXISTS listings_is_active ON listings(is_active);
+            CREATE INDEX IF NOT EXISTS listings_score     ON listings(score);
+
+            CREATE TABLE IF NOT EXISTS scenarios (
+                scenario_id       INTEGER PRIMARY KEY,
+                down_payment_pct  REAL,
+                interest_rate     REAL,
+                loan_term_years   INTEGER,
+                seller_note_pct   REAL,
+                seller_note_rate  REAL,
+                seller_note_years INTEGER,
+                standby_months    INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS scenario_results (
+                id                  TEXT    NOT NULL,
+                scenario_id         INTEGER NOT NULL,
+                sba_monthly         REAL,
+                annual_debt_service REAL,
+                seller_note_annual  REAL,
+                cf_during_standby   REAL,
+                cf_after_debt       REAL,
+                dscr                REAL,
+                coc_return          REAL,
+                payoff_years        REAL,
+                PRIMARY KEY (id, scenario_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS scenario_results_scenario ON scenario_results(scenario_id);
+
+            CREATE TABLE IF NOT EXISTS profile_scores (
+                id      TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                score   INTEGER,
+                bucket  TEXT,
+                PRIMARY KEY (id, profile)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS rescored (
+                id             TEXT PRIMARY KEY,
+                input_hash     TEXT NOT NULL,
+                scorer_version TEXT NOT NULL
+            );
+
+            -- Listings stored before every parsed input had a column
+            CREATE TABLE IF NOT EXISTS partial_inputs (
+                id TEXT PRIMARY KEY
+            );
+        """)
+        # Columns added to FIELDNAMES since the table was created
+        existing = {r["name"] for r in conn.execute("PRAGMA table_info(listings)")}
+        added = [f for f in FIELDNAMES if f not in existing]
+        for f in added:
+            conn.execute(f"ALTER TABLE listings ADD COLUMN {f} {_column_type(f)}")
+        inputs = [f for f in added if f in INPUT_FIELDS]
+        if inputs:
+            _backfill_inputs(conn, inputs)
+        if not conn.execute("SELECT 1 FROM listings LIMIT 1").fetchone():
+            _import_csvs(conn)
+        _listings_ready.add(key)
+    return conn
+
+
+def _backfill_inputs(conn, fields):
+    """
+    Fill parsed-input columns just added to the listings table from each
+    listing's last parsed fields in the seen index. Listings without them are
+    marked in partial_inputs until they are stored again.
+    """
+    sets = ", ".join(
+        f"{f} = (SELECT NULLIF(json_extract(last_fields, '$.{f}'), '') FROM seen WHERE seen.id = listings.id)"
+        for f in fields
+    )
+    with conn:
+        conn.execute(f"UPDATE listings SET {sets}")
+        conn.execute("""
+            INSERT OR IGNORE INTO partial_inputs (id)
+            SELECT id FROM listings WHERE id NOT IN (SELECT id FROM seen WHERE last_fields IS NOT NULL)
+        """)
+
+
+def _import_csvs(conn):
+    placeholders = ", ".join("?" for _ in FIELDNAMES)
+    for source, path in CSV_PATHS.items():
+        if not path.exists():
+            continue
+        with path.open("r", newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            rows = [
+                tuple(_to_db(k, (r.get("source") or source) if k == "source" else r.get(k)) for k in FIELDNAMES)
+                for r in reader
+            ]
+            # Exported before some parsed inputs were stored
+            partial = any(k in INPUT_FIELDS and k not in (reader.fieldnames or ()) for k in FIELDNAMES)
+        with conn:
+            conn.executemany(f"INSERT OR REPLACE INTO listings ({', '.join(FIELDNAMES)}) VALUES ({placeholders})", rows)
+            if partial:
+                conn.executemany("INSERT OR IGNORE INTO partial_inputs (id) VALUES (?)", [(r[0],) for r in rows])
+        print(f"  Imported {len(rows)} listings from {path.name}")
+
+
+def _listing_row(r, now, source):
+    """Storage row (column order = FIELDNAMES) for a scored listing (Listing or dict)."""
+    reasons = r.get("reasons", [])
+    overrides = {
+        "reasons":   reasons if isinstance(reasons, str) else "; ".join(reasons),
+        "is_trades": str(r.get("is_trades", False)),
+        "last_seen": now,
+        "is_active": "True",
+        "source":    r.get("source") or source,
+        "has_pdf":   "False",   # existing rows keep theirs (excluded from the upsert SET)
+    }
+    return tuple(_to_db(f, overrides[f] if f in overrides else r.get(f)) for f in FIELDNAMES)
+
+
+def _profile_rows(listing_id, scores):
+    """(id, profile, score, bucket) rows for a listing's {profile: {"score", "bucket"}}."""
+    return [(listing_id, name, s["score"], s["bucket"]) for name, s in (scores or {}).items()]
+
+
+def _batch_rows(batch: ListingBatch, now, source):
+    """Storage rows for a whole ListingBatch, converted column by column."""
+    columns = []
+    for f in FIELDNAMES:
+        if f in REAL_FIELDS or f in INT_FIELDS:
+            values = batch.values(f)
+            cast = float if f in REAL_FIELDS else int
+            columns.append([None if v is None else cast(v) for v in values])
+        elif f == "reasons":
+            columns.append([v if v is None or isinstance(v, str) else "; ".join(v) for v in batch.values(f)])
+        elif f == "is_trades":
+            columns.append([str(bool(v)) for v in batch.values(f)])
+        elif f == "last_seen":
+            columns.append([now] * len(batch))
+        elif f == "is_active":
+            columns.append(["True"] * len(batch))
+        elif f == "has_pdf":
+            columns.append(["False"] * len(batch))
+        elif f == "source":
+            columns.append([v or source for v in batch.values(f)])
+        else:
+            columns.append([None if v is None or v == "" else str(v) for v in batch.values(f)])
+    return list(zip(*columns))
+
+
+def upsert_rows(rows, active_ids=None, csv_path=None, source=None):
+    """
+    Upsert scored listings into the listings table, mark this source's
+    listings missing from `active_ids` inactive, then re-export the source's
+    CSV. Per-profile scores (l["profile_scores"]) go to profile_scores. A
+    plain iterable is consumed lazily and written in executemany batches,
+    each its own short transaction so the write lock is never held while the
+    stream is waiting on the network; a ListingBatch is converted column by
+    column and written in one go.
+    """
     if csv_path is None:
         csv_path = SUNBELT_CSV
-    p = Path(csv_path)
+    source = source or _source_of(csv_path)
+    now = datetime.utcnow().isoformat()
+
+    placeholders = ", ".join("?" for _ in FIELDNAMES)
+    updates = ", ".join(f"{f} = excluded.{f}" for f in FIELDNAMES if f not in ("id", "has_pdf"))
+    sql = f"""
+        INSERT INTO listings ({', '.join(FIELDNAMES)}) VALUES ({placeholders})
+        ON CONFLICT(id) DO UPDATE SET {updates}
+    """
+
+    conn = listings_db()
+    complete = "DELETE FROM partial_inputs WHERE id = ?"
+    batch, profile_batch = [], []
+    if isinstance(rows, ListingBatch):
+        batch = _batch_rows(rows, now, source)
+        for listing_id, scores in zip(rows.values("id"), rows.values("profile_scores")):
+            profile_batch.extend(_profile_rows(listing_id, scores))
+    else:
+        for r in rows:
+            batch.append(_listing_row(r, now, source))
+            profile_batch.extend(_profile_rows(r["id"], r.get("profile_scores")))
+            if len(batch) >= _UPSERT_BATCH:
+                with conn:
+                    conn.executemany(sql, batch)
+                    conn.executemany(complete, [(row[0],) for row in batch])
+                    conn.executemany(_PROFILE_UPSERT, profile_batch)
+                batch, profile_batch = [], []
+
+    with conn:
+        if batch:
+            conn.executemany(sql, batch)
+            conn.executemany(complete, [(row[0],) for row in batch])
+        if profile_batch:
+            conn.executemany(_PROFILE_UPSERT, profile_batch)
+        # Mark rows no longer in the current scrape as inactive
+        if active_ids is not None:
+            active = set(active_ids)
+            stale = [(r["id"],) for r in conn.execute("SELECT id FROM listings WHERE source = ?", (source,))
+                     if r["id"] not in active]
+            conn.executemany("UPDATE listings SET is_active = 'False' WHERE id = ?", stale)
+
+    export_csv(source, csv_path)
+
+
+def update_listings(changes: dict):
+    """Apply {id: {field: value}} column updates in one transaction and re-export the touched CSVs."""
+    # Group rows updating the same columns so each group is one executemany
+    groups = {}
+    for listing_id, fields in changes.items():
+        keys = tuple(k for k in fields if k in FIELDNAMES and k != "id")
+        if keys:
+            groups.setdefault(keys, []).append([_to_db(k, fields[k]) for k in keys] + [listing_id])
+
+    conn = listings_db()
+    with conn:
+        for keys, params in groups.items():
+            conn.executemany(f"UPDATE listings SET {', '.join(f'{k} = ?' for k in keys)} WHERE id = ?", params)
+    sources = {r["source"] for r in conn.execute("SELECT id, source FROM listings") if r["id"] in changes}
+    for source in sources:
+        export_csv(source)
+
+
+def update_listing(listing_id, fields: dict):
+    update_listings({listing_id: fields})
+
+
+def as_stored(field, value) -> str:
+    """`value` as load_rows would return it once written to `field`."""
+    return _num(_to_db(field, value))
+
+
+def partial_input_ids() -> set:
+    """Listings stored before every parsed input had a column (see partial_inputs)."""
+    return {r["id"] for r in listings_db().execute("SELECT id FROM partial_inputs")}
+
+
+def with_stored_inputs(rows, partial=None) -> list:
+    """
+    Rows ready to rescore. Listings in partial_inputs have no absentee owner
+    field, so their stored absentee verdict stands in for it: "Likely" scores
+    as a "Yes" field, anything else is left to the description scan.
+    """
+    partial = partial_input_ids() if partial is None else partial
+    return [
+        {**r, "absentee_owner_field": "Yes"}
+        if r["id"] in partial and not r.get("absentee_owner_field") and r.get("absentee") == "Likely" else r
+        for r in rows
+    ]
+
+
+def rescore_state() -> dict:
+    """{id: (input_hash, scorer_version)} as of each listing's last rescore."""
+    conn = listings_db()
+    return {r["id"]: (r["input_hash"], r["scorer_version"])
+            for r in conn.execute("SELECT id, input_hash, scorer_version FROM rescored")}
+
+
+def record_rescore(entries):
+    """Remember the (id, input_hash, scorer_version) each listing was last rescored with."""
+    conn = listings_db()
+    with conn:
+        conn.executemany(
+            "INSERT INTO rescored (id, input_hash, scorer_version) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET input_hash = excluded.input_hash, "
+            "scorer_version = excluded.scorer_version",
+            list(entries),
+        )
+
+
+_PROFILE_UPSERT = """
+    INSERT INTO profile_scores (id, profile, score, bucket) VALUES (?, ?, ?, ?)
+    ON CONFLICT(id, profile) DO UPDATE SET score = excluded.score, bucket = excluded.bucket
+"""
+
+
+def _drop_removed_profiles(conn):
+    profiles = criteria_profiles()
+    conn.execute(f"DELETE FROM profile_scores WHERE profile NOT IN ({', '.join('?' for _ in profiles)})", profiles)
+
+
+def write_profile_scores(ids, results: dict):
+    """Store score_profiles `results` for listings `ids`, dropping profiles no longer in profiles/."""
+    conn = listings_db()
+    with conn:
+        for name, scored in results.items():
+            conn.executemany(_PROFILE_UPSERT, [
+                (listing_id, name, s, b)
+                for listing_id, s, b in zip(ids, scored["score"].tolist(), scored["bucket"])
+            ])
+        _drop_removed_profiles(conn)
+
+
+def store_profile_scores(scores: dict):
+    """
+    Store {id: l["profile_scores"]} as derived with the rest of each listing's
+    fields, drop profiles no longer in profiles/ and re-export
+    output/profile_scores.csv.
+    """
+    conn = listings_db()
+    with conn:
+        conn.executemany(_PROFILE_UPSERT, [row for i, s in scores.items() for row in _profile_rows(i, s)])
+        _drop_removed_profiles(conn)
+    export_profile_scores()
+
+
+def refresh_profile_scores(rows=None):
+    """
+    Score `rows` (default: stored listings missing a score for some profile,
+    i.e. a new profile or a listing stored before it) under every profile in
+    one pass, store them and re-export output/profile_scores.csv.
+    """
+    profiles = criteria_profiles()
+    if rows is None:
+        have = {(r["id"], r["profile"]) for r in listings_db().execute("SELECT id, profile FROM profile_scores")}
+        rows = [r for r in load_rows() if any((r["id"], name) not in have for name in profiles)]
+    rows = list(rows)
+    write_profile_scores([r["id"] for r in rows], score_profiles(rows) if rows else {})
+    if rows:
+        print(f"  {len(profiles)} criteria profiles x {len(rows)} listings scored")
+    export_profile_scores()
+
+
+def export_profile_scores(csv_path=None):
+    """Write every listing's score and bucket under each criteria profile (long format) for the dashboard."""
+    p = Path(csv_path or PROFILE_SCORES_CSV)
     p.parent.mkdir(parents=True, exist_ok=True)
+    fields = ["id", "profile", "score", "bucket"]
+    cur = listings_db().execute(f"SELECT {', '.join(fields)} FROM profile_scores ORDER BY profile, id")
+    tmp = p.with_suffix(".csv.tmp")
+    with tmp.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(fields)
+        w.writerows(cur)
+    tmp.replace(p)
 
-    existing = {}
-    if p.exists():
-        with p.open("r", newline="", encoding="utf-8") as f:
-            for r in csv.DictReader(f):
-                existing[r["id"]] = r
-
-    for r in rows:
-        existing[r["id"]] = {
-            "id": r.get("id", ""),
-            "title": r.get("title", ""),
-            "url": r.get("url", ""),
-            "industry": r.get("industry", ""),
-            "location": r.get("location", ""),
-            "asking_price": _num(r.get("asking_price")),
-            "asking_price_text": r.get("asking_price_text", ""),
-            "annual_cash_flow": _num(r.get("annual_cash_flow")),
-            "annual_revenue": _num(r.get("annual_revenue")),
-            "employees": _num(r.get("employees")),
-            "down_10": _num(r.get("down_10")),
-            "sba_monthly_10pct": _num(r.get("sba_monthly_10pct")),
-            "annual_debt_service_10pct": _num(r.get("annual_debt_service_10pct")),
-            "cf_after_debt_10pct": _num(r.get("cf_after_debt_10pct")),
-            "coc_return_10pct": _num(r.get("coc_return_10pct")),
-            "dscr_10pct": _num(r.get("dscr_10pct")),
-            "payoff_years_10pct": _num(r.get("payoff_years_10pct")),
-            "down_20": _num(r.get("down_20")),
-            "sba_monthly_20pct": _num(r.get("sba_monthly_20pct")),
-            "annual_debt_service_20pct": _num(r.get("annual_debt_service_20pct")),
-            "cf_after_debt_20pct": _num(r.get("cf_after_debt_20pct")),
-            "coc_return_20pct": _num(r.get("coc_return_20pct")),
-            "dscr_20pct": _num(r.get("dscr_20pct")),
-            "payoff_years_20pct": _num(r.get("payoff_years_20pct")),
-            "seller_note_amount": _num(r.get("seller_note_amount")),
-            "seller_note_monthly": _num(r.get("seller_note_monthly")),
-            "seller_note_annual": _num(r.get("seller_note_annual")),
-            "cf_during_standby": _num(r.get("cf_during_standby")),
-            "cf_after_seller_financing": _num(r.get("cf_after_seller_financing")),
-            "dscr_seller_financed": _num(r.get("dscr_seller_financed")),
-            "score": str(r.get("score", "")),
-            "bucket": r.get("bucket", ""),
-            "absentee": r.get("absentee", ""),
-            "reasons": "; ".join(r.get("reasons", [])),
-            "is_trades": str(r.get("is_trades", False)),
-            "years_in_business": r.get("years_in_business", ""),
-            "is_franchise": r.get("is_franchise", ""),
-            "reason_for_selling": r.get("reason_for_selling", ""),
-            "sba_available": r.get("sba_available", ""),
-            "listing_agent": r.get("listing_agent", ""),
-            "narrative": r.get("narrative", ""),
-            "description": r.get("description", ""),
-            "dim_ai_proof":      _num(r.get("dim_ai_proof")),
-            "dim_fun":           _num(r.get("dim_fun")),
-            "dim_weather":       _num(r.get("dim_weather")),
-            "dim_labor":         _num(r.get("dim_labor")),
-            "dim_recurring":     _num(r.get("dim_recurring")),
-            "dim_absentee":      _num(r.get("dim_absentee")),
-            "dim_capital_light": _num(r.get("dim_capital_light")),
-            "dim_scalable":      _num(r.get("dim_scalable")),
-            "last_seen": datetime.utcnow().isoformat(),
-            "is_active": "True",
-            "source":    r.get("source", ""),
-            "has_pdf":   existing.get(r.get("id", ""), {}).get("has_pdf", "False"),
-        }
-
-    # Mark rows no longer in the current scrape as inactive
-    if active_ids is not None:
-        for rid, row in existing.items():
-            if rid not in active_ids:
-                row["is_active"] = "False"
-
-    with p.open("w", newline="", encoding="utf-8") as f:
+
+def load_rows(source=None) -> list[dict]:
+    """Stored listings as CSV-style string dicts (blank for missing), in insertion order."""
+    conn = listings_db()
+    if source:
+        cur = conn.execute("SELECT * FROM listings WHERE source = ? ORDER BY rowid", (source,))
+    else:
+        cur = conn.execute("SELECT * FROM listings ORDER BY rowid")
+    return [{k: _num(r[k]) for k in FIELDNAMES} for r in cur]
+
+
+def export_csv(source, csv_path=None):
+    """
+    Write one source's listings to its CSV (the format the workflow commits
+    and the dashboard reads), plus the typed snapshot next to it when pyarrow
+    is installed (scout.snapshot).
+    """
+    p = Path(csv_path or CSV_PATHS[source])
+    p.parent.mkdir(parents=True, exist_ok=True)
+    rows = listings_db().execute("SELECT * FROM listings WHERE source = ? ORDER BY rowid", (source,)).fetchall()
+    tmp = p.with_suffix(".csv.tmp")
+    with tmp.open("w", newline="", encoding="utf-8") as f:
         w = csv.DictWriter(f, fieldnames=FIELDNAMES)
         w.writeheader()
-        for row in existing.values():
-            w.writerow(row)
+        w.writerows({k: _num(r[k]) for k in FIELDNAMES} for r in rows)
+    tmp.replace(p)
+    write_snapshot(rows, p)
+
+
+def refresh_scenarios(ids=None, grid=None):
+    """
+    Evaluate the financing scenario grid in one vectorized pass for the
+    listings in `ids` (those whose price or cash flow were just written) plus
+    any priced listing without scenario rows, and replace their rows in the
+    long-format scenario table (one row per listing x scenario). Every listing
+    is re-evaluated when `ids` is None or the grid itself changed. The tables
+    are then exported to output/scenarios.csv.
+    """
+    scenarios = scenario_grid(grid)
+    conn = listings_db()
+    stored = [tuple(r) for r in conn.execute(
+        f"SELECT {', '.join(SCENARIO_PARAMS)} FROM scenarios ORDER BY scenario_id"
+    )]
+    if stored != [tuple(s[k] for k in SCENARIO_PARAMS) for s in scenarios]:
+        ids = None
+    rows = conn.execute(
+        "SELECT id, asking_price, annual_cash_flow FROM listings WHERE asking_price > 0 ORDER BY rowid"
+    ).fetchall()
+    if ids is not None:
+        ids = set(ids) | {r["id"] for r in conn.execute(
+            "SELECT id FROM listings WHERE asking_price > 0 "
+            "AND id NOT IN (SELECT DISTINCT id FROM scenario_results)"
+        )}
+        if not ids:
+            if not SCENARIOS_CSV.exists():
+                export_scenarios()
+            return
+        rows = [r for r in rows if r["id"] in ids]
+    results = evaluate_scenarios([r["asking_price"] for r in rows], [r["annual_cash_flow"] for r in rows], scenarios)
+
+    columns = [results[f].tolist() for f in SCENARIO_FIELDS]
+    params = [
+        (r["id"], sid, *(None if v != v else v for v in (col[sid][i] for col in columns)))
+        for sid in range(len(scenarios))
+        for i, r in enumerate(rows)
+    ]
+    with conn:
+        if ids is None:
+            conn.execute("DELETE FROM scenarios")
+            conn.execute("DELETE FROM scenario_results")
+            conn.executemany(
+                f"INSERT INTO scenarios (scenario_id, {', '.join(SCENARIO_PARAMS)}) "
+                f"VALUES ({', '.join('?' for _ in range(len(SCENARIO_PARAMS) + 1))})",
+                [(sid, *(s[k] for k in SCENARIO_PARAMS)) for sid, s in enumerate(scenarios)],
+            )
+        else:
+            # Includes listings whose price was removed, which keep no rows
+            conn.executemany("DELETE FROM scenario_results WHERE id = ?", [(i,) for i in ids])
+        conn.executemany(
+            f"INSERT INTO scenario_results (id, scenario_id, {', '.join(SCENARIO_FIELDS)}) "
+            f"VALUES ({', '.join('?' for _ in range(len(SCENARIO_FIELDS) + 2))})",
+            params,
+        )
+    print(f"  {len(scenarios)} financing scenarios x {len(rows)} listings")
+    export_scenarios()
+
+
+def export_scenarios(csv_path=None):
+    """Write the scenario results joined to their parameters (long format) for the dashboard."""
+    p = Path(csv_path or SCENARIOS_CSV)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    fields = ["id", "scenario_id", *SCENARIO_PARAMS, *SCENARIO_FIELDS]
+    cur = listings_db().execute(f"""
+        SELECT {', '.join(fields)}
+        FROM scenario_results JOIN scenarios USING (scenario_id)
+        ORDER BY scenario_id, id
+    """)
+    tmp = p.with_suffix(".csv.tmp")
+    with tmp.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(fields)
+        w.writerows([_num(v) for v in r] for r in cur)
+    tmp.replace(p)
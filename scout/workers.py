@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+def imap_bounded(fn, items, workers=4, window=None):
+    """
+    Stream fn(item) over a (possibly lazy) iterable on a thread pool.
+    At most `window` calls are in flight, so items are pulled from the source
+    only as fast as results drain. Yields results in completion order.
+    """
+    window = window or workers * 2
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for item in items:
+            pending.add(pool.submit(fn, item))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    yield f.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                yield f.result()
@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from dashboard.query import BaseFilters, FilterIndex, SearchIndex
+
+
+@pytest.fixture
+def listings():
+    return pd.DataFrame({
+        "id":               ["101", "102", "103"],
+        "title":            ["HVAC service company", "Dental practice", "Lawn & snow route"],
+        "industry":         ["HVAC", "Healthcare", "Landscaping"],
+        "location":         ["Eagan, MN", "Duluth, MN", "Edina, MN"],
+        "description":      ["Recurring maintenance agreements", "Two chairs", "Residential accounts"],
+        "asking_price":     [500_000, 900_000, 250_000],
+        "annual_cash_flow": [200_000, 300_000, 90_000],
+        "coc_return_20pct": [0.5, 0.3, 0.25],
+        "score":            [70, 60, 50],
+        "bucket":           ["SHORTLIST", "REVIEW", "REVIEW"],
+        "absentee":         ["No", "Likely", "No"],
+        "source":           ["sunbelt", "sunbelt", "calhoun"],
+    })
+
+
+@pytest.mark.parametrize("query", ["-", "&", "  ", "-- && --"])
+def test_query_without_words_does_not_hide_rows(listings, query):
+    index, search = FilterIndex(listings), SearchIndex(listings)
+    assert search.search(query) is None
+    rows = index.select(BaseFilters(), search=query, search_index=search)
+    assert rows.tolist() == index.select(BaseFilters()).tolist() == [0, 1, 2]
+
+
+def test_search_matches_word_prefixes(listings):
+    index, search = FilterIndex(listings), SearchIndex(listings)
+    assert index.select(BaseFilters(), search="lawn", search_index=search).tolist() == [2]
+    assert index.select(BaseFilters(), search="dent", search_index=search).tolist() == [1]
+    assert index.select(BaseFilters(), search="dental hvac", search_index=search).tolist() == []
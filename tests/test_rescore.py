@@ -0,0 +1,49 @@
+import csv
+import shutil
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+# What a fresh checkout holds for a rescore: no data/ directory, just the committed exports
+CHECKOUT = ["scout", "profiles", "criteria.yml", "sources.yml", "rescore_profiles.py",
+            "output/sunbelt.csv", "output/calhoun.csv"]
+
+
+@pytest.fixture
+def checkout(tmp_path):
+    for name in CHECKOUT:
+        src, dst = ROOT / name, tmp_path / name
+        if src.is_dir():
+            shutil.copytree(src, dst, ignore=shutil.ignore_patterns("__pycache__"))
+        else:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, dst)
+    return tmp_path
+
+
+def _rescore(cwd):
+    done = subprocess.run([sys.executable, "rescore_profiles.py", "--workers", "1"],
+                          cwd=cwd, capture_output=True, text=True, timeout=300)
+    assert done.returncode == 0, done.stderr
+    return done.stdout
+
+
+def test_rescore_committed_catalog_then_nothing(checkout):
+    sources = Counter()
+    for name in ("sunbelt", "calhoun"):
+        with (checkout / "output" / f"{name}.csv").open(newline="", encoding="utf-8") as f:
+            sources.update(r.get("source") or name for r in csv.DictReader(f))
+    total = sum(sources.values())
+
+    out = _rescore(checkout)
+    assert f"Rescoring {total} of {total} listings" in out
+    assert f"{sources['sunbelt']} sunbelt" in out and f"{sources['calhoun']} calhoun" in out
+
+    exports = {p.name: p.read_bytes() for p in (checkout / "output").glob("*.csv")}
+    out = _rescore(checkout)
+    assert f"All {total} listings are up to date" in out
+    assert {p.name: p.read_bytes() for p in (checkout / "output").glob("*.csv")} == exports
@@ -0,0 +1,30 @@
+import csv
+
+import pytest
+
+from scout.finance import derive_financials_batch, financial_rows
+from scout.score import score_listing, score_many
+from scout.storage import CSV_PATHS
+
+NUMERIC = ("asking_price", "annual_cash_flow", "annual_revenue", "employees")
+
+
+def _catalog(path):
+    """Exported rows with numeric fields and recomputed financials, as score_listing sees them."""
+    with path.open(newline="", encoding="utf-8") as f:
+        rows = [{**r, **{k: float(r[k]) if r.get(k) else None for k in NUMERIC}} for r in csv.DictReader(f)]
+    financials = financial_rows(derive_financials_batch(
+        [r["asking_price"] for r in rows], [r["annual_cash_flow"] for r in rows]))
+    return [{**r, **fin} for r, fin in zip(rows, financials)]
+
+
+@pytest.mark.parametrize("source", sorted(CSV_PATHS))
+def test_score_many_matches_score_listing(source):
+    listings = _catalog(CSV_PATHS[source])
+    assert listings
+    got = score_many(listings)
+    for i, l in enumerate(listings):
+        expected = score_listing(l)
+        row = {"score": int(got["score"][i]), "bucket": got["bucket"][i],
+               "absentee": got["absentee"][i], "reasons": got["reasons"][i]}
+        assert row == {k: expected[k] for k in row}, l["id"]